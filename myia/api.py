@@ -1,6 +1,8 @@
 """User-friendly interfaces to Myia machinery."""
 
+import importlib
 import inspect
+from concurrent.futures import ProcessPoolExecutor
 
 from .infer import MyiaTypeError
 from .pipeline import standard_pipeline
@@ -23,24 +25,20 @@ class MyiaFunction:
         fn: The root function to compile.
         specialize_values: Set of arguments for which we should specialize the
             function based on their values (list of argument names).
+        lean: If True, only keep the compiled callable for each
+            specialization. The graphs, the manager and the inference
+            engine used to compile it are released.
 
     """
 
-    def __init__(self, fn, specialize_values=[]):
+    def __init__(self, fn, specialize_values=[], lean=False):
         """Initialize a MyiaFunction."""
         self.fn = fn
         self.specialize_values = set(specialize_values)
+        self.lean = lean
         self._cache = {}
 
-    def specialize(self, args):
-        """Specialize on the types of the given arguments.
-
-        Returns a Pipeline. If the argument types were seen before, returns a
-        cached version.
-        """
-        pip = standard_pipeline.make()
-        inf = pip.resources.inferrer
-
+    def _argspec(self, inf, args):
         argnames = inspect.getfullargspec(self.fn).args
         n1 = len(argnames)
         n2 = len(args)
@@ -53,14 +51,63 @@ class MyiaFunction:
                          '_erase_value': name not in self.specialize_values}
                         for arg, name in zip(args, argnames))
         inf.fill_in(argspec)
-        key = as_frozen(argspec)
+        return argspec, as_frozen(argspec)
+
+    def specialize(self, args):
+        """Specialize on the types of the given arguments.
+
+        Returns the results of the pipeline. If the argument types were seen
+        before, returns a cached version. If `lean` is True, the only key in
+        the results is 'output'.
+        """
+        pip = standard_pipeline.make()
+        argspec, key = self._argspec(pip.resources.inferrer, args)
         if key not in self._cache:
-            self._cache[key] = pip(
+            res = pip(
                 input=self.fn,
                 argspec=argspec
             )
+            if self.lean:
+                # The wrapped output converts the arguments and the result
+                # by itself, so nothing else is needed to call it.
+                res = {'output': res['output']}
+            self._cache[key] = res
         return self._cache[key]
 
+    def precompile(self, signatures, workers=None):
+        """Specialize on several lists of arguments ahead of time.
+
+        Signatures that were seen before are skipped.
+
+        Arguments:
+            signatures: A list of argument tuples, as given to `compile`.
+            workers: If None, compile each signature in turn in this
+                process. Otherwise, compile them in a pool of this many
+                processes, each running `standard_pipeline`. Only the
+                compiled function is sent back, so the function must be
+                defined at the top level of a module, and the cache
+                entries only contain 'output', as in lean mode.
+        """
+        if workers is None:
+            for args in signatures:
+                self.specialize(args)
+            return
+
+        inf = standard_pipeline.make().resources.inferrer
+        todo = {}
+        for args in signatures:
+            _, key = self._argspec(inf, args)
+            if key not in self._cache and key not in todo:
+                todo[key] = args
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            ref = _function_reference(self.fn)
+            futures = {key: pool.submit(_precompile, ref,
+                                        self.specialize_values, args)
+                       for key, args in todo.items()}
+            for key, future in futures.items():
+                self._cache[key] = {'output': future.result()}
+
     def compile(self, args):
         """Returns a function specialized for the given args."""
         return self.specialize(args)['output']
@@ -70,7 +117,32 @@ class MyiaFunction:
         return self.compile(args)(*args)
 
 
-def myia(fn=None, *, specialize_values=[]):
+def _function_reference(fn):
+    """Return the (module, qualname) that designate fn in another process.
+
+    Functions decorated with `@myia` cannot be pickled directly, since their
+    name refers to the MyiaFunction rather than to the function itself.
+    """
+    return fn.__module__, fn.__qualname__
+
+
+def _resolve_function(module, qualname):
+    """Return the function that a _function_reference designates."""
+    fn = importlib.import_module(module)
+    for name in qualname.split('.'):
+        fn = getattr(fn, name)
+    if isinstance(fn, MyiaFunction):
+        fn = fn.fn
+    return fn
+
+
+def _precompile(ref, specialize_values, args):
+    # Runs in a worker process of MyiaFunction.precompile
+    fn = _resolve_function(*ref)
+    return MyiaFunction(fn, specialize_values, lean=True).compile(args)
+
+
+def myia(fn=None, *, specialize_values=[], lean=False):
     """Create a function using Myia's runtime.
 
     `@myia` can be used as a simple decorator. If custom options are needed,
@@ -88,10 +160,12 @@ def myia(fn=None, *, specialize_values=[]):
         fn: The Python function to convert.
         specialize_values: Set of arguments for which we should specialize the
             function based on their values (list of argument names).
+        lean: Only keep the compiled callable for each specialization, and
+            release the intermediate representation.
     """
     if fn is None:
         def deco(fn):
-            return MyiaFunction(fn, specialize_values)
+            return MyiaFunction(fn, specialize_values, lean)
         return deco
     else:
-        return MyiaFunction(fn, specialize_values)
+        return MyiaFunction(fn, specialize_values, lean)
@@ -1,6 +1,12 @@
 """Compilation of graphs into optimized code."""
 
+# myia.pipeline uses the steps in .transform, which itself uses myia.pipeline,
+# so myia.pipeline must be imported first.
+from .. import pipeline  # noqa: F401
+
 from .vm import FinalVM  # noqa
+from .pycode import PythonProgram, step_python_export  # noqa
+from .serialize import save_program, load_program  # noqa
 from .transform import ( # noqa
     step_wrap_primitives, step_compile, step_link, step_export
 )
@@ -0,0 +1,6 @@
+"""Compile a function ahead of time (see `myia.compile.aot`)."""
+
+from .aot import main
+
+
+main()
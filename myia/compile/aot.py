@@ -0,0 +1,202 @@
+"""Ahead-of-time compilation of Python functions.
+
+This is the implementation of `python -m myia.compile`, which compiles a
+function for a list of signatures and saves the results with `save_program`:
+
+    python -m myia.compile mymodule myfunction -o build/myfunction
+        -s 'f64, f64' -s 'f32[10, 3], (i64, bool)'
+
+Each argument in a signature is a scalar type, an array of a scalar type
+with its shape in brackets, or a tuple of arguments in parentheses. Scalar
+types are either NumPy dtype names (`float32`, `int64`, `bool`, ...) or
+their short forms (`f32`, `i64`, `u8`, ...).
+
+The output directory contains a subdirectory for each signature, and a
+`signatures.json` file that maps each signature to its subdirectory.
+"""
+
+import argparse
+import importlib
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+
+from ..dshape import NOSHAPE, TupleShape
+from ..dtype import Array, Tuple, DTYPE_MAP
+from .serialize import save_program
+
+
+_short_names = {
+    f'{short}{bits}': f'{long}{bits}'
+    for short, long in (('i', 'int'), ('u', 'uint'), ('f', 'float'))
+    for bits in (8, 16, 32, 64)
+}
+
+_token = re.compile(r'\s*(?:(\w+)|(.))')
+
+
+def _tokenize(signature):
+    for m in _token.finditer(signature):
+        word, punct = m.groups()
+        yield word or punct
+    yield None
+
+
+class _SignatureParser:
+
+    def __init__(self, signature):
+        self.signature = signature
+        self.tokens = _tokenize(signature)
+        self.advance()
+
+    def advance(self):
+        self.current = next(self.tokens)
+
+    def error(self, msg):
+        return ValueError(f'Invalid signature {self.signature!r}: {msg}')
+
+    def expect(self, tok):
+        if self.current != tok:
+            raise self.error(f'expected {tok!r}, got {self.current!r}')
+        self.advance()
+
+    def separator(self, end):
+        # Skip the comma between two elements of a list that ends with end
+        if self.current == ',':
+            self.advance()
+            if self.current == end:
+                raise self.error('trailing separator')
+        elif self.current is None:
+            raise self.error('unexpected end')
+        else:
+            raise self.error(f'unexpected {self.current!r}')
+
+    def parse_list(self, end):
+        args = []
+        while self.current != end:
+            args.append(self.parse_arg())
+            if self.current != end:
+                self.separator(end)
+        return args
+
+    def parse_arg(self):
+        tok = self.current
+        if tok == '(':
+            self.advance()
+            elems = self.parse_list(')')
+            self.expect(')')
+            return {'type': Tuple[[e['type'] for e in elems]],
+                    'shape': TupleShape(e['shape'] for e in elems)}
+        dtype = _short_names.get(tok, tok)
+        if dtype not in DTYPE_MAP:
+            raise self.error(f'unknown type {tok!r}')
+        self.advance()
+        t = DTYPE_MAP[dtype]
+        if self.current != '[':
+            return {'type': t, 'shape': NOSHAPE}
+        self.advance()
+        dims = []
+        while self.current != ']':
+            if not (self.current or '').isdigit():
+                raise self.error(f'invalid dimension {self.current!r}')
+            dims.append(int(self.current))
+            self.advance()
+            if self.current != ']':
+                self.separator(']')
+        self.advance()
+        return {'type': Array[t], 'shape': tuple(dims)}
+
+
+def parse_signature(signature):
+    """Convert a signature string to an argspec."""
+    parser = _SignatureParser(signature)
+    argspec = parser.parse_list(None)
+    return tuple(argspec)
+
+
+def load_function(module, name):
+    """Import a function from a module name or a path to a Python file."""
+    if module.endswith('.py') or os.sep in module:
+        modname = os.path.splitext(os.path.basename(module))[0]
+        spec = importlib.util.spec_from_file_location(modname, module)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[modname] = mod
+        spec.loader.exec_module(mod)
+    else:
+        mod = importlib.import_module(module)
+    return getattr(mod, name)
+
+
+def compile_signature(pipeline, fn, argspec):
+    """Run each step of pipeline on fn, timing them.
+
+    Returns:
+        (output, timings): The compiled function and a list of
+        (step_name, seconds) pairs.
+
+    """
+    pip = pipeline.make()
+    args = dict(input=fn, argspec=argspec)
+    timings = []
+    for name in pipeline.step_names:
+        start = time.perf_counter()
+        args = pip[name:name](**args)
+        timings.append((name, time.perf_counter() - start))
+    return args['output'], timings
+
+
+def compile_ahead_of_time(fn, signatures, output, pipeline=None,
+                          out=None):
+    """Compile fn for each signature and save the results in output.
+
+    Arguments:
+        fn: The function to compile.
+        signatures: A list of signature strings.
+        output: The directory to write the programs in.
+        pipeline: The PipelineDefinition to use (default: the
+            standard_pipeline).
+        out: Where to write the timing report (default: stdout).
+
+    """
+    if out is None:
+        out = sys.stdout
+    if pipeline is None:
+        from ..pipeline import standard_pipeline as pipeline
+
+    index = []
+    for i, sig in enumerate(signatures):
+        argspec = parse_signature(sig)
+        program, timings = compile_signature(pipeline, fn, argspec)
+        path = f'sig{i}'
+        save_program(program, os.path.join(output, path))
+        index.append({'signature': sig, 'path': path})
+
+        total = sum(t for _, t in timings)
+        print(f'{fn.__name__}({sig}): {total * 1000:.1f}ms', file=out)
+        for name, t in timings:
+            print(f'    {name:20}{t * 1000:10.1f}ms', file=out)
+
+    with open(os.path.join(output, 'signatures.json'), 'w') as f:
+        json.dump(index, f, indent=4)
+
+
+def main(argv=None):
+    """Entry point for `python -m myia.compile`."""
+    parser = argparse.ArgumentParser(
+        prog='python -m myia.compile',
+        description='Compile a function ahead of time.'
+    )
+    parser.add_argument('module',
+                        help='Module name or path to a Python file')
+    parser.add_argument('function', help='Name of the function to compile')
+    parser.add_argument('--signature', '-s', action='append', required=True,
+                        help='Argument types, e.g. "f64, f32[3, 4]"')
+    parser.add_argument('--output', '-o', required=True,
+                        help='Directory to write the compiled programs to')
+    opts = parser.parse_args(argv)
+
+    fn = load_function(opts.module, opts.function)
+    compile_ahead_of_time(fn, opts.signature, opts.output)
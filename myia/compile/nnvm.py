@@ -1,7 +1,9 @@
 """Linear implementation using NNVM."""
 
 import numpy as np
+import os
 from itertools import count
+from tempfile import TemporaryDirectory
 
 import nnvm.compiler
 import nnvm.symbol as sym
@@ -23,12 +25,11 @@ SIMPLE_MAP = {
     P.scalar_mod: sym.elemwise_mod,
     P.scalar_pow: sym.elemwise_pow,
     P.scalar_floor: sym.floor,
+    P.scalar_trunc: sym.trunc,
     P.scalar_uadd: lambda x: x,
     P.scalar_usub: sym.negative,
     P.scalar_exp: sym.exp,
     P.scalar_log: sym.log,
-    # This is not right tangent vs hyperbolic tangent
-    # P.scalar_tan: sym.tanh,
 
     P.scalar_eq: sym.broadcast_equal,
     P.scalar_lt: sym.broadcast_less,
@@ -36,11 +37,34 @@ SIMPLE_MAP = {
     P.scalar_ne: sym.broadcast_not_equal,
     P.scalar_le: sym.broadcast_less_equal,
     P.scalar_ge: sym.broadcast_greater_equal,
-    # P.bool_and: sym.logical_and,
-    # P.bool_or: sym.logical_or
+    P.bool_and: sym.logical_and,
+    P.bool_or: sym.logical_or,
     P.bool_eq: sym.broadcast_equal,
 
-    P.scalar_to_array: lambda x: x
+    P.switch: sym.where,
+
+    P.scalar_to_array: lambda x: x,
+    P.array_to_scalar: lambda x: x,
+}
+
+
+# Trigonometric operators are not part of every NNVM release, so they are
+# only mapped when the installed version provides them (sym.tanh is the
+# hyperbolic tangent, which is not what we want).
+if hasattr(sym, 'sin') and hasattr(sym, 'cos'):
+    SIMPLE_MAP.update({
+        P.scalar_sin: sym.sin,
+        P.scalar_cos: sym.cos,
+        P.scalar_tan: lambda x: sym.elemwise_div(sym.sin(x), sym.cos(x)),
+    })
+
+
+# Reductions over the primitives that array_reduce can be given.
+REDUCE_MAP = {
+    P.scalar_add: sym.sum,
+    P.scalar_mul: sym.prod,
+    P.bool_and: sym.min,
+    P.bool_or: sym.max,
 }
 
 
@@ -84,23 +108,39 @@ def nnvm_array_reduce(c, fn, array, shape):
     assert fn.is_constant(Primitive)
     assert shape.is_constant(tuple)
     fn = fn.value
+    if fn not in REDUCE_MAP:
+        raise NotImplementedError(f"reduce with {fn}")
     tshp = shape.value
     ary = c.ref(array)
-    if fn == P.scalar_add:
-        ashp = ashape(array)
-        if len(tshp) < len(ashp):
-            ts = (1,) * (len(ashp) - len(tshp)) + tshp
-        else:
-            ts = tshp
-        axis = list(i for i, t in enumerate(ts) if t == 1)
-        if len(axis) == 1:
-            axis = axis[0]
-        res = sym.sum(ary, axis=axis, keepdims=1)
-        if len(tshp) < len(ashp):
-            res = sym.reshape(res, shape=tshp)
-        return res
+    ashp = ashape(array)
+    if len(tshp) < len(ashp):
+        ts = (1,) * (len(ashp) - len(tshp)) + tshp
     else:
-        raise NotImplementedError(f"reduce with {fn}")
+        ts = tshp
+    axis = list(i for i, t in enumerate(ts) if t == 1)
+    if len(axis) == 1:
+        axis = axis[0]
+    res = REDUCE_MAP[fn](ary, axis=axis, keepdims=1)
+    if len(tshp) < len(ashp):
+        res = sym.reshape(res, shape=tshp or (1,))
+    return res
+
+
+def nnvm_reshape(c, v, shp):
+    """Implementation of reshape."""
+    nv = c.ref(v)
+    assert shp.is_constant(tuple)
+    shp = shp.value
+    if shp == ():
+        shp = (1,)
+    return sym.reshape(nv, shape=shp)
+
+
+def nnvm_scalar_cast(c, v, t):
+    """Implementation of scalar_cast."""
+    nv = c.ref(v)
+    assert t.is_constant()
+    return sym.cast(nv, dtype=nnvm_type_map(t.value))
 
 
 def nnvm_transpose(c, a, ax):
@@ -117,6 +157,8 @@ COMPLEX_MAP = {
     P.array_map: nnvm_array_map,
     P.array_reduce: nnvm_array_reduce,
     P.transpose: nnvm_transpose,
+    P.reshape: nnvm_reshape,
+    P.scalar_cast: nnvm_scalar_cast,
 }
 
 
@@ -129,23 +171,38 @@ def nnvm_type_map(type):
 
 
 class NNVMRunner:
-    """Adapter to run an NNVM module."""
+    """Adapter to run an NNVM module.
+
+    Runners can be pickled, and exported to files with `export_segment`.
+    Both keep the compiled library, graph and parameters, so that the
+    module can be recreated without compiling it again.
+    """
 
-    def __init__(self, mod, input_names, input_types, output_specs, context):
+    def __init__(self, graph_json, lib, params, input_names, input_types,
+                 output_specs, context):
         """Intialize the runner.
 
         Arguments:
-            mod: NNVM compiled module
+            graph_json: JSON representation of the compiled NNVM graph
+            lib: compiled TVM module
+            params: dict of the parameters of the graph (constants)
             input_names: list of the names of inputs (in order)
+            input_types: list of the dtypes of inputs (in order)
             output_specs: list of shape and dtype for outputs
                           [(shp0, dtype0), ...]
             context: TVMContext for the runtime and arrays
 
         """
-        self.mod = mod
+        self.graph_json = graph_json
+        self.lib = lib
+        self.params = params
         self.input_names = input_names
         self.input_types = input_types
         self.output_specs = output_specs
+        self.context = context
+        self.mod = graph_runtime.create(graph_json, lib, context)
+        for n, p in params.items():
+            self.mod.set_input(n, p)
         self._outs = [tvm.nd.empty(spec[0], dtype=spec[1], ctx=context)
                       for spec in self.output_specs]
 
@@ -161,6 +218,61 @@ class NNVMRunner:
             out = self.mod.get_output(i, out)
         return [o.asnumpy() for o in self._outs]
 
+    def export_segment(self, directory, name):
+        """Write the library, graph and parameters in directory.
+
+        The files are named `<name>.so`, `<name>.json` and `<name>.params`.
+
+        Returns:
+            The metadata to give to `load_segment`, which must be saved
+            separately.
+
+        """
+        base = os.path.join(directory, name)
+        self.lib.export_library(f'{base}.so')
+        with open(f'{base}.json', 'w') as f:
+            f.write(self.graph_json)
+        with open(f'{base}.params', 'wb') as f:
+            f.write(nnvm.compiler.save_param_dict(self.params))
+        return dict(
+            input_names=self.input_names,
+            input_types=self.input_types,
+            output_specs=self.output_specs,
+            device=(self.context.device_type, self.context.device_id),
+        )
+
+    @classmethod
+    def load_segment(cls, directory, name, metadata):
+        """Load a runner written by `export_segment`."""
+        base = os.path.join(directory, name)
+        lib = tvm.module.load(f'{base}.so')
+        with open(f'{base}.json') as f:
+            graph_json = f.read()
+        with open(f'{base}.params', 'rb') as f:
+            params = nnvm.compiler.load_param_dict(bytearray(f.read()))
+        return cls(graph_json, lib, params,
+                   metadata['input_names'],
+                   metadata['input_types'],
+                   metadata['output_specs'],
+                   tvm.context(*metadata['device']))
+
+    def __reduce__(self):
+        with TemporaryDirectory() as d:
+            metadata = self.export_segment(d, 'segment')
+            files = {}
+            for fname in os.listdir(d):
+                with open(os.path.join(d, fname), 'rb') as f:
+                    files[fname] = f.read()
+        return (_load_runner, (files, metadata))
+
+
+def _load_runner(files, metadata):
+    with TemporaryDirectory() as d:
+        for fname, data in files.items():
+            with open(os.path.join(d, fname), 'wb') as f:
+                f.write(data)
+        return NNVMRunner.load_segment(d, 'segment', metadata)
+
 
 def ashape(a):
     """Get an array shape.
@@ -202,9 +314,9 @@ class NNVMConverter:
 
     def make_constant(self, val, nnvm_type):
         """Make a utility constant that is not part of the graph."""
-        key = (val, type)
+        key = (val, nnvm_type)
         if key not in self.constant_vars:
-            name = f"_cst{val}{type}"
+            name = f"_cst{val}{nnvm_type}"
             self.constants[name] = np.array([val], dtype=nnvm_type,
                                             copy=False, ndmin=1)
             self.constant_vars[key] = sym.Variable(name)
@@ -314,13 +426,8 @@ class NNVMConverter:
         else:  # pragma: no cover
             raise Exception(f"Unsupported target: {target}")
 
-        module = graph_runtime.create(dg, lib, context)
-
-        for n, p in params.items():
-            module.set_input(n, p)
-
         input_types = [self.types[i] for i in self.input_names]
-        return (NNVMRunner(module, self.input_names,
+        return (NNVMRunner(dg.json(), lib, params, self.input_names,
                            input_types, output_specs, context),
                 self.inputs, outputs)
 
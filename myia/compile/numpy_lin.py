@@ -0,0 +1,250 @@
+"""Linear implementation that generates straight-line NumPy code.
+
+Each segment is converted to the source of a Python function that calls the
+implementations of its primitives one after the other, e.g.
+
+    def segment(i0, i1):
+        v0 = k0(i0, i1)
+        v1 = k1(v0, k2)
+        return (v1,)
+
+The implementations and the constants are bound in the function's namespace
+(`k0`, `k1`, `k2` above), so there is no interpretation overhead when the
+segment runs, and compiling the source costs far less than building an NNVM
+module. `array_map` and `array_reduce` over a primitive that has a NumPy
+ufunc use that ufunc, rather than calling the primitive on each element.
+"""
+
+from itertools import count
+
+import numpy as np
+
+from .utils import get_outputs
+
+from ..dtype import Float, ismyiatype
+from ..prim import Primitive, ops as P, py_implementations
+
+
+UFUNC_MAP = {
+    P.scalar_add: np.add,
+    P.scalar_sub: np.subtract,
+    P.scalar_mul: np.multiply,
+    P.scalar_mod: np.mod,
+    P.scalar_pow: np.power,
+    P.scalar_floor: np.floor,
+    P.scalar_trunc: np.trunc,
+    P.scalar_uadd: np.positive,
+    P.scalar_usub: np.negative,
+    P.scalar_exp: np.exp,
+    P.scalar_log: np.log,
+    P.scalar_sin: np.sin,
+    P.scalar_cos: np.cos,
+    P.scalar_tan: np.tan,
+    P.scalar_eq: np.equal,
+    P.scalar_lt: np.less,
+    P.scalar_gt: np.greater,
+    P.scalar_ne: np.not_equal,
+    P.scalar_le: np.less_equal,
+    P.scalar_ge: np.greater_equal,
+    P.bool_not: np.logical_not,
+    P.bool_and: np.logical_and,
+    P.bool_or: np.logical_or,
+    P.bool_eq: np.equal,
+    P.switch: np.where,
+}
+
+
+def numpy_bool_not(x):
+    """Implement bool_not, on a bool or an int."""
+    return not x
+
+
+def numpy_bool_and(x, y):
+    """Implement bool_and, on bools or ints."""
+    return bool(x) and bool(y)
+
+
+def numpy_bool_or(x, y):
+    """Implement bool_or, on bools or ints."""
+    return bool(x) or bool(y)
+
+
+def numpy_bool_eq(x, y):
+    """Implement bool_eq, on bools or ints."""
+    return bool(x) == bool(y)
+
+
+# FinalVM passes boolean arguments as ints, which the implementations in
+# py_implementations reject for these primitives.
+BOOL_IMPLEMENTATIONS = {
+    P.bool_not: numpy_bool_not,
+    P.bool_and: numpy_bool_and,
+    P.bool_or: numpy_bool_or,
+    P.bool_eq: numpy_bool_eq,
+}
+
+
+def implementation(prim):
+    """Return the implementation of prim used in segments."""
+    impl = BOOL_IMPLEMENTATIONS.get(prim, None)
+    if impl is None:
+        impl = py_implementations[prim]
+    return impl
+
+
+def _ufunc(fn, node):
+    """Return the ufunc for array_map or array_reduce over fn, or None."""
+    if not fn.is_constant(Primitive):
+        return None
+    if fn.value is P.scalar_div:
+        # scalar_div truncates integers, which np.true_divide does not do.
+        elements = getattr(node.type, 'elements', None)
+        return np.true_divide if ismyiatype(elements, Float) else None
+    return UFUNC_MAP.get(fn.value, None)
+
+
+def numpy_array_map0(ufunc, *arrays):
+    """Implement array_map with a ufunc, for 0-d arrays.
+
+    Ufuncs return a scalar rather than an array when given 0-d arrays.
+    """
+    return np.asarray(ufunc(*arrays))
+
+
+def numpy_array_reduce(ufunc, array, shp):
+    """Implement array_reduce with a ufunc."""
+    delta = len(array.shape) - len(shp)
+    axis = tuple(range(delta)) + tuple(
+        delta + i for i, (ishp, tshp) in enumerate(zip(array.shape[delta:],
+                                                       shp))
+        if tshp == 1 and ishp > 1
+    )
+    res = ufunc.reduce(array, axis=axis, keepdims=True)
+    return res.reshape(shp).astype(array.dtype, copy=False)
+
+
+def ufunc_implementation(node):
+    """Return how to compute an array_map or array_reduce node with a ufunc.
+
+    Returns:
+        None if there is no ufunc for the function that is mapped or
+        reduced. Otherwise, a pair `(impl, ufunc)`: the node's value is
+        `impl(ufunc, *arrays)`, or `impl(*arrays)` if ufunc is None.
+
+    """
+    fn = node.inputs[0].value
+    ufunc = _ufunc(node.inputs[1], node)
+    if ufunc is None:
+        return None
+    elif fn is P.array_reduce:
+        return numpy_array_reduce, ufunc
+    elif node.inferred.get('shape', None):
+        return ufunc, None
+    else:
+        return numpy_array_map0, ufunc
+
+
+class NumPyRunner:
+    """Run a segment converted to a Python function.
+
+    Runners can be pickled. The function is compiled again from its source
+    when they are loaded.
+    """
+
+    def __init__(self, source, namespace):
+        """Compile the function.
+
+        Arguments:
+            source: Source of the function, which must be named `segment`.
+            namespace: dict of the global names used by the function.
+
+        """
+        self.source = source
+        self.namespace = namespace
+        glob = dict(namespace)
+        exec(compile(source, '<segment>', 'exec'), glob)
+        self.fn = glob['segment']
+
+    def __call__(self, *args):
+        """Run the segment on the arguments."""
+        return self.fn(*args)
+
+    def __reduce__(self):
+        return (NumPyRunner, (self.source, self.namespace))
+
+
+def numpy_convert(lst, *, target='cpu', dev_id=0):
+    """Converts the list of nodes to a runnable form.
+
+    All the nodes in the list must represent linear flow (no calls,
+    branches, ...)
+
+    Returns:
+       (fn, inputs, outputs):
+
+       - fn: A callable function
+       - inputs: the list of inputs nodes whose values should be
+                  provided to the function
+       - outputs: the list of output nodes corresponding to the
+                  outputs of the function
+
+    Notes:
+        This implementation generates a Python function that calls the
+        implementation of each primitive in turn.
+
+    """
+    eqv = {}
+    inputs = []
+    namespace = {}
+    body = []
+    c = count()
+
+    assert target == 'cpu'
+
+    def bind(value):
+        name = f'k{next(c)}'
+        namespace[name] = value
+        return name
+
+    def ref(n):
+        if n not in eqv:
+            if n.is_constant(Primitive):
+                eqv[n] = bind(implementation(n.value))
+            elif n.is_constant() and not n.is_constant_graph():
+                eqv[n] = bind(n.value)
+            else:
+                # Graphs are pushed on the stack by the VM, like inputs.
+                eqv[n] = f'i{len(inputs)}'
+                inputs.append(n)
+        return eqv[n]
+
+    for n in lst:
+        assert n.is_apply()
+        assert n.inputs[0].is_constant(Primitive)
+        fn = n.inputs[0].value
+        args = n.inputs[1:]
+        ufunc_impl = None
+        if fn in (P.array_map, P.array_reduce):
+            ufunc_impl = ufunc_implementation(n)
+        if ufunc_impl is None:
+            if fn not in py_implementations:
+                raise NotImplementedError(fn)
+            impl, call_args = implementation(fn), []
+        else:
+            impl, ufunc = ufunc_impl
+            call_args = [] if ufunc is None else [bind(ufunc)]
+            args = args[1:]
+        call_args += [ref(a) for a in args]
+        name = f'v{len(body)}'
+        body.append(f'    {name} = {bind(impl)}({", ".join(call_args)})')
+        eqv[n] = name
+
+    outputs = get_outputs(lst, lst[0].graph.manager.uses, set(eqv.keys()))
+
+    params = ', '.join(eqv[i] for i in inputs)
+    results = ''.join(f'{eqv[o]}, ' for o in outputs)
+    source = '\n'.join([f'def segment({params}):',
+                        *body,
+                        f'    return ({results})',
+                        ''])
+    return NumPyRunner(source, namespace), inputs, outputs
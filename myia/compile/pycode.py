@@ -0,0 +1,376 @@
+"""Compile closure-converted graphs to Python source code.
+
+Each graph is turned into a Python function, and the functions of a program
+are compiled together with `compile()` and `exec`, so that the program runs
+without going through the instructions of `FinalVM`:
+
+* Applications of primitives call their implementation directly, or are
+  written as Python operators for the simplest ones (`+`, `<`, `x[i]`, ...).
+* A call to `switch(cond, f, g)` is lowered to an `if` statement. The
+  branches are inlined into it when they are not used anywhere else, which
+  is the case of the branches that the parser generates for `if` and
+  `while` statements.
+* A tail call of a function to itself is lowered to the rebinding of its
+  parameters and a jump back to the beginning of a `while True` loop, so
+  that loops do not grow the Python stack.
+* `partial` is lowered to `functools.partial`.
+* `array_map` and `array_reduce` over primitives use NumPy ufuncs, as in
+  the numpy linear implementation.
+
+Closure conversion must have been applied, since the generated functions
+cannot refer to the variables of other functions.
+
+Unlike `FinalVM`, the generated functions use the Python stack for their
+calls, so deep non-tail recursion is bounded by the recursion limit.
+"""
+
+import functools
+import math
+from itertools import count
+
+from ..ir import manage, toposort
+from ..pipeline import PipelineStep
+from ..prim import Primitive, ops as P, py_implementations
+from .numpy_lin import ufunc_implementation
+
+
+# Primitives that are written as Python operators.
+BINARY_OPS = {
+    P.scalar_add: '+',
+    P.scalar_sub: '-',
+    P.scalar_mul: '*',
+    P.scalar_mod: '%',
+    P.scalar_pow: '**',
+    P.scalar_eq: '==',
+    P.scalar_lt: '<',
+    P.scalar_gt: '>',
+    P.scalar_ne: '!=',
+    P.scalar_le: '<=',
+    P.scalar_ge: '>=',
+    P.bool_eq: '==',
+}
+
+
+UNARY_OPS = {
+    P.scalar_uadd: '+',
+    P.scalar_usub: '-',
+    P.bool_not: 'not ',
+}
+
+
+# Branches nested deeper than this are made into functions rather than
+# inlined, to stay away from the limits of the Python parser.
+MAX_INLINE_DEPTH = 50
+
+
+# Maximum number of nodes that may be inlined in a function in addition to
+# the graphs that are only used once, since inlining these duplicates them.
+MAX_INLINE_NODES = 1000
+
+
+def _tuple(items):
+    """Join items as the elements of a tuple, without the parentheses."""
+    if len(items) == 1:
+        return f'{items[0]},'
+    return ', '.join(items)
+
+
+class PythonProgram:
+    """Run a program compiled to Python.
+
+    Programs can be pickled. The functions are compiled again from their
+    source when they are loaded.
+    """
+
+    def __init__(self, source, namespace, entry):
+        """Compile the program.
+
+        Arguments:
+            source: Source of the functions of the program.
+            namespace: dict of the constants used by the functions.
+            entry: Name of the function to call.
+
+        """
+        self.source = source
+        self.namespace = namespace
+        self.entry = entry
+        glob = dict(namespace)
+        exec(compile(source, '<myia>', 'exec'), glob)
+        self.fn = glob[entry]
+
+    def __call__(self, *args):
+        """Call the program's entry point."""
+        return self.fn(*args)
+
+    def __reduce__(self):
+        return (PythonProgram, (self.source, self.namespace, self.entry))
+
+
+class PythonGenerator:
+    """Generate the source of the Python functions for a graph cluster."""
+
+    def __init__(self, root):
+        """Initialize a PythonGenerator for the graphs used by root."""
+        self.root = root
+        self.manager = manage(root)
+        self.namespace = {}
+        self.constants = {}
+        self.graph_names = {}
+        self.todo = []
+        self.ids = count()
+
+    def generate(self):
+        """Generate the program.
+
+        Returns:
+            A PythonProgram for the root graph.
+
+        """
+        entry = self.graph_name(self.root)
+        chunks = []
+        while self.todo:
+            chunks.append(self.function(self.todo.pop()))
+        source = '\n\n'.join(chunks)
+        return PythonProgram(source, self.namespace, entry)
+
+    def name(self, prefix):
+        """Make a new unique name."""
+        return f'{prefix}{next(self.ids)}'
+
+    def bind(self, value):
+        """Bind value to a name in the namespace, and return the name."""
+        key = (type(value), id(value))
+        if key not in self.constants:
+            name = self.name('k')
+            self.namespace[name] = value
+            self.constants[key] = name
+        return self.constants[key]
+
+    def graph_name(self, g):
+        """Return the name of the function for g, scheduling its generation.
+
+        This is only used for graphs that are not inlined.
+        """
+        if g not in self.graph_names:
+            self.graph_names[g] = self.name('graph')
+            self.todo.append(g)
+        return self.graph_names[g]
+
+    def single_use(self, node):
+        """Return the (user, key) of node if it has exactly one use."""
+        uses = self.manager.uses[node]
+        if len(uses) == 1:
+            return next(iter(uses))
+        return None
+
+    def is_branch_switch(self, node):
+        """Whether node is a switch that is only called, then lowered to if."""
+        if not (node.is_apply() and node.inputs[0].is_constant(Primitive)
+                and node.inputs[0].value is P.switch):
+            return False
+        use = self.single_use(node)
+        return use is not None and use[1] == 0
+
+    def is_graph_partial(self, node):
+        """Whether node is a partial application of a constant graph.
+
+        The value of such a node is only built where it is used as a value.
+        Where it is called, the graph is called directly.
+        """
+        return node.is_apply() and node.inputs[0].is_constant(Primitive) \
+            and node.inputs[0].value is P.partial \
+            and node.inputs[1].is_constant_graph()
+
+    def is_inlinable(self, g, target):
+        """Whether a call to g, assigned to target, can be inlined.
+
+        Graphs that are only used once are inlined where they are called.
+        Graphs that are called in tail position and that may call the
+        current function back are also inlined, within a budget of nodes,
+        so that the loops which go through several graphs (e.g. a while
+        loop containing an if) end up in a single function.
+        """
+        if g in self.inlining or self.depth >= MAX_INLINE_DEPTH:
+            return False
+        if g is not self.root \
+                and sum(self.manager.graph_users[g].values()) == 1:
+            return True
+        if target is None \
+                and self.current in self.manager.graphs_reachable[g]:
+            size = len(self.manager.nodes[g])
+            if self.inlined + size <= MAX_INLINE_NODES:
+                self.inlined += size
+                return True
+        return False
+
+    def resolve(self, node):
+        """Return the node whose value node refers to."""
+        while node in self.alias:
+            node = self.alias[node]
+        return node
+
+    def ref(self, node):
+        """Return an expression for the value of node."""
+        node = self.resolve(node)
+        if node in self.eqv:
+            return self.eqv[node]
+        if self.is_graph_partial(node):
+            args = [self.ref(i) for i in node.inputs[1:]]
+            return f'{self.bind(functools.partial)}({", ".join(args)})'
+        assert node.is_constant()
+        v = node.value
+        if node.is_constant_graph():
+            return self.graph_name(v)
+        elif isinstance(v, Primitive):
+            return self.bind(py_implementations[v])
+        elif type(v) in (int, bool) or (type(v) is float and
+                                        math.isfinite(v)):
+            return f'({v!r})' if v < 0 else repr(v)
+        else:
+            return self.bind(v)
+
+    def expression(self, node):
+        """Return an expression for the application of a primitive."""
+        prim = node.inputs[0].value
+        args = [self.ref(i) for i in node.inputs[1:]]
+        if prim in BINARY_OPS:
+            a, b = args
+            return f'{a} {BINARY_OPS[prim]} {b}'
+        elif prim in UNARY_OPS:
+            a, = args
+            return f'{UNARY_OPS[prim]}{a}'
+        elif prim is P.make_tuple:
+            return f'({_tuple(args)})'
+        elif prim is P.tuple_getitem:
+            a, b = args
+            return f'{a}[{b}]'
+        elif prim is P.switch:
+            cond, a, b = args
+            return f'{a} if {cond} else {b}'
+        elif prim is P.partial:
+            return f'{self.bind(functools.partial)}({", ".join(args)})'
+        elif prim in (P.array_map, P.array_reduce) \
+                and ufunc_implementation(node):
+            impl, ufunc = ufunc_implementation(node)
+            args = args[1:] if ufunc is None else [self.bind(ufunc), *args[1:]]
+            return f'{self.bind(impl)}({", ".join(args)})'
+        else:
+            return f'{self.bind(py_implementations[prim])}({", ".join(args)})'
+
+    def function(self, g):
+        """Return the source of the function for g."""
+        self.current = g
+        self.loop = False
+        self.depth = 0
+        self.inlined = 0
+        self.inlining = [g]
+        self.alias = {}
+        self.params = [self.name('p') for _ in g.parameters]
+        self.eqv = dict(zip(g.parameters, self.params))
+        lines = []
+        self.body(g, lines, 1, None)
+        if self.loop:
+            lines = ['    while True:'] + ['    ' + line for line in lines]
+        header = f'def {self.graph_name(g)}({", ".join(self.params)}):'
+        return '\n'.join([header, *lines, ''])
+
+    def body(self, g, lines, indent, target):
+        """Add the statements that compute the output of g to lines.
+
+        Arguments:
+            g: The graph to compile.
+            lines: The list of lines to add the statements to.
+            indent: The indentation level of the statements.
+            target: The name of the variable to assign the output to, or
+                None to return it.
+
+        """
+        out = g.output
+        for node in toposort(out):
+            if node is out or not node.is_apply() or node.graph is not g \
+                    or self.is_branch_switch(node) \
+                    or self.is_graph_partial(node):
+                continue
+            name = self.name('v')
+            self.apply(node, lines, indent, name)
+            self.eqv[node] = name
+        if out.is_apply() and out.graph is g:
+            self.apply(out, lines, indent, target)
+        else:
+            self.result(self.ref(out), lines, indent, target)
+
+    def result(self, expr, lines, indent, target):
+        """Return expr, or assign it to target."""
+        pad = '    ' * indent
+        if target is None:
+            lines.append(f'{pad}return {expr}')
+        else:
+            lines.append(f'{pad}{target} = {expr}')
+
+    def apply(self, node, lines, indent, target):
+        """Add the statements for an application to lines."""
+        fn, *args = node.inputs
+        if fn.is_constant(Primitive):
+            self.result(self.expression(node), lines, indent, target)
+        elif self.is_branch_switch(fn):
+            pad = '    ' * indent
+            lines.append(f'{pad}if {self.ref(fn.inputs[1])}:')
+            self.call(fn.inputs[2], args, lines, indent + 1, target)
+            lines.append(f'{pad}else:')
+            self.call(fn.inputs[3], args, lines, indent + 1, target)
+        else:
+            self.call(fn, args, lines, indent, target)
+
+    def call(self, fn, args, lines, indent, target):
+        """Add the statements for a call of fn on the args nodes to lines."""
+        fn = self.resolve(fn)
+        if fn.is_constant_graph():
+            g = fn.value
+        elif self.is_graph_partial(fn):
+            g = fn.inputs[1].value
+            args = fn.inputs[2:] + args
+        else:
+            call = f'{self.ref(fn)}({", ".join(map(self.ref, args))})'
+            self.result(call, lines, indent, target)
+            return
+
+        assert len(args) == len(g.parameters)
+        if g is self.current and target is None:
+            pad = '    ' * indent
+            if self.params:
+                args = _tuple([self.ref(a) for a in args])
+                lines.append(f'{pad}{_tuple(self.params)} = {args}')
+            lines.append(f'{pad}continue')
+            self.loop = True
+        elif self.is_inlinable(g, target):
+            self.alias.update(zip(g.parameters, args))
+            self.depth += 1
+            self.inlining.append(g)
+            self.body(g, lines, indent, target)
+            self.inlining.pop()
+            self.depth -= 1
+        else:
+            call = f'{self.graph_name(g)}({", ".join(map(self.ref, args))})'
+            self.result(call, lines, indent, target)
+
+
+class PythonExporter(PipelineStep):
+    """Pipeline step to compile a graph to Python functions.
+
+    This replaces the compile, link and export steps that produce a
+    `FinalVM`.
+
+    Inputs:
+        graph: A closure-converted graph.
+
+    Outputs:
+        output: A callable.
+
+    """
+
+    def step(self, graph):
+        """Compile the graph and its dependencies."""
+        return {'output': PythonGenerator(graph).generate()}
+
+
+step_python_export = PythonExporter.partial()
@@ -0,0 +1,77 @@
+"""Save compiled programs to disk and load them back.
+
+A program is saved in a directory:
+
+* `program.pkl` holds the format version, then the pickled program, e.g.
+  the output of the `standard_pipeline`, as two consecutive pickles. The
+  program contains the linked instruction stream and its constants.
+* Each compiled segment of the program (an object which defines the
+  `export_segment` and `load_segment` methods, such as `NNVMRunner`) is
+  written as separate files in the same directory, and referred to by name
+  from `program.pkl`.
+
+Loading a program does not need to parse, infer or optimize anything.
+"""
+
+import os
+import pickle
+
+
+FORMAT_VERSION = 1
+
+
+class _ProgramPickler(pickle.Pickler):
+
+    def __init__(self, file, directory):
+        super().__init__(file)
+        self.directory = directory
+        self.segments = {}
+
+    def persistent_id(self, obj):
+        if isinstance(obj, type) or not hasattr(obj, 'export_segment'):
+            return None
+        if id(obj) not in self.segments:
+            name = f'segment{len(self.segments)}'
+            metadata = obj.export_segment(self.directory, name)
+            self.segments[id(obj)] = (type(obj), name, metadata)
+        return self.segments[id(obj)]
+
+
+class _ProgramUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, directory):
+        super().__init__(file)
+        self.directory = directory
+        self.segments = {}
+
+    def persistent_load(self, pid):
+        cls, name, metadata = pid
+        if name not in self.segments:
+            self.segments[name] = cls.load_segment(self.directory, name,
+                                                   metadata)
+        return self.segments[name]
+
+
+def save_program(program, directory):
+    """Save a compiled program in directory, creating it if needed."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'program.pkl'), 'wb') as f:
+        pickler = _ProgramPickler(f, directory)
+        pickler.dump(FORMAT_VERSION)
+        pickler.dump(program)
+
+
+def load_program(directory):
+    """Load a program that was written by `save_program`.
+
+    The format version is checked before anything else is loaded.
+    """
+    with open(os.path.join(directory, 'program.pkl'), 'rb') as f:
+        unpickler = _ProgramUnpickler(f, directory)
+        version = unpickler.load()
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f'Unsupported program format version {version!r}'
+                f' (expected {FORMAT_VERSION})'
+            )
+        return unpickler.load()
@@ -4,13 +4,32 @@ from ..ir import Apply, toposort, Graph, Constant
 from ..pipeline import PipelineDefinition, PipelineStep
 from ..prim import Primitive, ops as P
 from ..prim.ops import partial, return_, switch, make_tuple
-from .debug_lin import debug_convert
-from .nnvm import nnvm_convert
-from .vm import FinalVM
+from .vm import DEFAULT_RELEASE_THRESHOLD, FinalVM
+
+
+# The linear implementations are only imported when a pipeline that uses them
+# is created, since some backends (e.g. NNVM/TVM) are slow to import.
+
+
+def _debug_convert():
+    from .debug_lin import debug_convert
+    return debug_convert
+
+
+def _nnvm_convert():
+    from .nnvm import nnvm_convert
+    return nnvm_convert
+
+
+def _numpy_convert():
+    from .numpy_lin import numpy_convert
+    return numpy_convert
+
 
 LIN_IMPLS = dict(
-    debug=debug_convert,
-    nnvm=nnvm_convert,
+    debug=_debug_convert,
+    nnvm=_nnvm_convert,
+    numpy=_numpy_convert,
 )
 
 
@@ -187,6 +206,82 @@ class CompileGraph(PipelineStep):
         """Simulate the effect of a return from a call on the stack."""
         self.height -= nargs
 
+    def single_use(self, node, key):
+        """Whether node is only used, as input number key, by one node."""
+        uses = self.uses[node]
+        return len(uses) == 1 and next(iter(uses))[1] == key
+
+    def static_target(self, node, key):
+        """Return the graph and arguments that node refers to statically.
+
+        This is the case of a constant graph, or of a partial application
+        of a constant graph that is only used as input number key of one
+        node. Otherwise, return None.
+        """
+        if node.is_constant_graph():
+            return node.value, []
+        elif node.is_apply() and node.inputs[0].is_constant(Primitive) \
+                and node.inputs[0].value is partial \
+                and node.inputs[1].is_constant_graph() \
+                and self.single_use(node, key):
+            return node.inputs[1].value, node.inputs[2:]
+        return None
+
+    def tail_jumps(self, graph):
+        """Find the static jumps that can replace the graph's tail call.
+
+        A tail call to a constant graph (e.g. the graph itself, in the
+        recursion that implements a loop) is a jump to that graph. A tail
+        call to the result of a switch between two constant graphs, or
+        partial applications of them, is a jump to either one.
+
+        Returns:
+            None if the output is not such a tail call. Otherwise, a tuple
+            of the switch's condition (None if there is no switch), of the
+            list of (graph, arguments) targets, and of the set of nodes
+            that do not need to be computed because of the jump.
+
+        """
+        out = graph.output
+        if not out.is_apply():
+            return None
+        fn, *args = out.inputs
+        target = self.static_target(fn, 0)
+        if target is not None:
+            g, pargs = target
+            return None, [(g, [*pargs, *args])], {fn}
+        if fn.is_apply() and fn.inputs[0].is_constant(Primitive) \
+                and fn.inputs[0].value is switch \
+                and self.single_use(fn, 0):
+            cond, *branches = fn.inputs[1:]
+            targets = [self.static_target(b, key)
+                       for key, b in enumerate(branches, 2)]
+            if all(t is not None for t in targets):
+                return (cond,
+                        [(g, [*pargs, *args]) for g, pargs in targets],
+                        {fn, *branches})
+        return None
+
+    def jump(self, jumps):
+        """Add the instruction for the static jumps of a graph."""
+        cond, targets, _ = jumps
+        # prime the arguments because self.ref() can invalidate
+        # previously returned references if a new one is not ready
+        for _, args in targets:
+            for a in args:
+                self.ref(a)
+        if cond is not None:
+            self.ref(cond)
+        targets = [(g, tuple(self.ref(a) for a in args))
+                   for g, args in targets]
+        if cond is None:
+            (g, args), = targets
+            self.add_instr('jump', g, self.height, args)
+        else:
+            (gt, argst), (gf, argsf) = targets
+            self.add_instr('switch_jump', self.ref(cond),
+                           gt, argst, gf, argsf, self.height)
+
     def step(self, graph, splits):
         """Convert the graph into a list of instructions."""
         self._reset()
@@ -196,7 +291,13 @@ class CompileGraph(PipelineStep):
 
         param_height = self.height
 
+        self.uses = graph.manager.uses
+        jumps = self.tail_jumps(graph)
+        skip = set() if jumps is None else jumps[2]
+
         for split in splits:
+            if not isinstance(split, list) and split in skip:
+                continue
             if isinstance(split, list):
                 run, inputs, outputs = \
                     self.pipeline.resources.lin_convert(
@@ -247,6 +348,11 @@ class CompileGraph(PipelineStep):
                         raise AssertionError(f"Unknown special function "
                                              "{fn.value}")
 
+                elif split is graph.output and jumps is not None:
+                    self.jump(jumps)
+                    # execution stops here
+                    break
+
                 else:
                     # pre-push the function on the stack
                     self.ref(fn)
@@ -289,7 +395,7 @@ class OptimizeInstrs(PipelineStep):
 
 graph_transform = PipelineDefinition(
     resources=dict(
-        lin_convert=nnvm_convert,
+        lin_convert=None,
         target='cpu',
         dev_id=0,
     ),
@@ -323,7 +429,7 @@ class CompileGraphs(PipelineStep):
         """
         super().__init__(pipeline_init)
         self.transform = graph_transform.configure(
-            lin_convert=LIN_IMPLS[linear_impl],
+            lin_convert=LIN_IMPLS[linear_impl](),
             target=target,
             dev_id=dev_id).make()
 
@@ -370,6 +476,12 @@ class LinkInstrs(PipelineStep):
             instr = uinstrs[i]
             if instr[0] == 'push_graph':
                 uinstrs[i] = ('push', mapping[instr[1]])
+            elif instr[0] == 'jump':
+                uinstrs[i] = ('jump', mapping[instr[1]], *instr[2:])
+            elif instr[0] == 'switch_jump':
+                _, cond, gt, argst, gf, argsf, height = instr
+                uinstrs[i] = ('switch_jump', cond, mapping[gt], argst,
+                              mapping[gf], argsf, height)
 
         return {'instrs': uinstrs}
 
@@ -384,13 +496,24 @@ class VMExporter(PipelineStep):
         output: callable
     """
 
+    def __init__(self, pipeline_init, release_threshold):
+        """Initialize a VMExporter.
+
+        Arguments:
+            release_threshold: see `FinalVM`.
+
+        """
+        super().__init__(pipeline_init)
+        self.release_threshold = release_threshold
+
     def step(self, instrs):
         """Make a callable."""
-        return {'output': FinalVM(instrs)}
+        return {'output': FinalVM(instrs, self.release_threshold)}
 
 
 step_wrap_primitives = WrapPrimitives.partial()
 step_compile = CompileGraphs.partial(
     linear_impl='nnvm', target='cpu', dev_id=0)
 step_link = LinkInstrs.partial()
-step_export = VMExporter.partial()
+step_export = VMExporter.partial(
+    release_threshold=DEFAULT_RELEASE_THRESHOLD)
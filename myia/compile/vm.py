@@ -13,21 +13,60 @@ class struct_partial:
         return f"partial({self.fn}, {self.args})"
 
 
+# Size in bytes from which arrays are released as soon as they are popped.
+DEFAULT_RELEASE_THRESHOLD = 1 << 16
+
+# Number of slots above which the value stack is shrunk after a call.
+MAX_KEPT_STACK_SIZE = 1 << 14
+
+
 class FinalVM:
     """Run a sequence of instructions.
 
     These instructions can represent multiple graphs with arbitrary
     recursion between them.
+
+    The value stack is allocated once and reused by every call. It
+    starts with enough room for any chain of calls that does not
+    recurse, i.e. the sum of the stack space each function asks for in
+    its `pad_stack`, and doubles whenever recursion needs more. Every
+    slot that was used is cleared at once when the call returns, and if
+    the stack grew beyond `MAX_KEPT_STACK_SIZE` slots, it is reallocated
+    to its initial size instead.
+
+    Popped slots are left as they are until the end of the call, unless
+    an array of at least `release_threshold` bytes was put on the stack
+    during the call, as an argument or as the output of an external
+    function. From then on, slots are cleared in bulk as they are
+    popped, so that large intermediate values are freed while the
+    program is still running.
     """
 
-    def __init__(self, code):
-        """Create a VM with the specified instructions."""
+    def __init__(self, code, release_threshold=DEFAULT_RELEASE_THRESHOLD):
+        """Create a VM with the specified instructions.
+
+        Arguments:
+            code: The linked instructions.
+            release_threshold: Number of bytes from which an array
+                value is released as soon as it is popped off the stack,
+                or None to clear the stack only at the end of each call.
+
+        """
         self.code = tuple(code)
-        self.stack = [None]  # The value stack
+        self.release_threshold = release_threshold
+        self.stack_size = 1 + sum(instr[1] for instr in self.code
+                                  if instr[0] == 'pad_stack')
+        self.stack = [None] * self.stack_size  # The value stack
+        self.top = 0  # highest stack slot used since the last cleanup
+        self.releasing = False  # whether popped slots are cleared
         self.retp = [-1]  # The call stack
         self.pc = 0  # program counter (next instruction)
         self.sp = 0  # stack pointer (for the value stack)
 
+    def __reduce__(self):
+        # Only the code is needed; the runtime state is reset by eval().
+        return (FinalVM, (self.code, self.release_threshold))
+
     def _push(self, v):
         """Push a value to the stack."""
         self.stack[self.sp] = v
@@ -36,16 +75,30 @@ class FinalVM:
     def _pop(self, n=1):
         """Pop a number of values off the stack returning the top.
 
-        This also clears values that were popped off the stack.
+        The popped slots are only cleared if the VM is releasing them.
         """
         v = self.stack[self.sp - 1]
-        for p in range(n):
-            self.stack[self.sp - p - 1] = None
         self.sp -= n
+        if self.releasing:
+            self.stack[self.sp:self.sp + n] = [None] * n
         return v
 
+    def _check_release(self, v):
+        """Start releasing popped slots if v is a large array."""
+        if not self.releasing and self.release_threshold is not None \
+                and getattr(v, 'nbytes', -1) >= self.release_threshold:
+            self.releasing = True
+
+    def _reserve(self, size):
+        """Ensure that the stack has at least size slots."""
+        if size > self.top:
+            self.top = size
+            if size > len(self.stack):
+                self.stack.extend(
+                    [None] * max(size - len(self.stack), len(self.stack)))
+
     def _move_stack(self, nitems, height):
-        """Move a range of values down the stack, clearing the excess.
+        """Move a range of values down the stack, popping the excess.
 
         This is used to implement tailcalls.
         """
@@ -87,31 +140,42 @@ class FinalVM:
     def eval(self, args):
         """Evalute the code for this vm with the passed-in arguments."""
         # reset the runtime to initial values
-        self.stack = [None] * len(args)  # The value stack
         self.retp = [-1]  # The call stack
         self.pc = 0  # program counter (next instruction)
         self.sp = 0  # stack pointer (for the value stack)
+        self._reserve(len(args))
+
+        try:
+            # Calling convention is to push arguments from last to first
+            # because it makes partial application easier.
+            for a in reversed(args):
+                if isinstance(a, bool):
+                    a = int(a)
+                self._check_release(a)
+                self._push(a)
 
-        # Calling convention is to push arguments from last to first
-        # because it makes partial application easier.
-        for a in reversed(args):
-            if isinstance(a, bool):
-                a = int(a)
-            self._push(a)
-
-        # Main runtime loop
-        while self.pc >= 0:
-            instr = self.code[self.pc]
-            impl = getattr(self, f'inst_{instr[0]}', None)
-            if impl is None:
-                raise AssertionError(f'Unknown instruction {instr[0]}')
-            self.pc += 1
-            impl(*instr[1:])
-
-        # When we reach here there should be a single value on the
-        # value stack and it is the return value for the evaluation.
-        assert self.sp == 1, self.sp
-        return self.stack[0]
+            # Main runtime loop
+            while self.pc >= 0:
+                instr = self.code[self.pc]
+                impl = getattr(self, f'inst_{instr[0]}', None)
+                if impl is None:
+                    raise AssertionError(f'Unknown instruction {instr[0]}')
+                self.pc += 1
+                impl(*instr[1:])
+
+            # When we reach here there should be a single value on the
+            # value stack and it is the return value for the evaluation.
+            assert self.sp == 1, self.sp
+            return self.stack[0]
+
+        finally:
+            # Release the values of this call all at once.
+            if len(self.stack) > max(self.stack_size, MAX_KEPT_STACK_SIZE):
+                self.stack = [None] * self.stack_size
+            else:
+                self.stack[:self.top] = [None] * self.top
+            self.top = 0
+            self.releasing = False
 
     def inst_call(self, jmp):
         """Call.
@@ -145,6 +209,51 @@ class FinalVM:
         self._move_stack(nargs, height)
         self._do_jmp(jmp)
 
+    def inst_jump(self, jmp, height, args):
+        """Jump.
+
+        This implements a tail call to a known position.  The arguments
+        are written in place of the parameters of the current function,
+        the rest of its values are popped, and execution continues at
+        the given position.  This does not push the pc on the call stack.
+
+        Arguments:
+            jmp: code position to jump to.
+            height: height of the stack relative to the previous
+                    function (includes arguments)
+            args: references to the arguments of the call.
+
+        """
+        vals = [self._ref(a) for a in reversed(args)]
+        base = self.sp - height
+        top = base + len(vals)
+        self.stack[base:top] = vals
+        if self.releasing:
+            self.stack[top:self.sp] = [None] * (self.sp - top)
+        self.sp = top
+        self.pc = jmp
+
+    def inst_switch_jump(self, cond, jtrue, atrue, jfalse, afalse, height):
+        """Conditional jump.
+
+        This jumps to one of two known positions depending on the value
+        of the conditional, as `jump` does.
+
+        Arguments:
+            cond: reference to a boolean value
+            jtrue: code position to jump to if cond is true.
+            atrue: references to the arguments for jtrue.
+            jfalse: code position to jump to if cond is false.
+            afalse: references to the arguments for jfalse.
+            height: height of the stack relative to the previous
+                    function (includes arguments)
+
+        """
+        if self._ref(cond):
+            self.inst_jump(jtrue, height, atrue)
+        else:
+            self.inst_jump(jfalse, height, afalse)
+
     def inst_return(self, rpos, height):
         """Return.
 
@@ -239,9 +348,7 @@ class FinalVM:
             sz: stack space
 
         """
-        need = sz - (len(self.stack) - self.sp)
-        if need > 0:
-            self.stack.extend([None] * need)
+        self._reserve(self.sp + sz)
 
     def inst_external(self, fn, args):
         """Call external function.
@@ -256,4 +363,5 @@ class FinalVM:
         """
         outs = fn(*(self._ref(a) for a in args))
         for o in outs:
+            self._check_release(o)
             self._push(o)
@@ -37,6 +37,24 @@ def core(fn):
     return fn
 
 
+def checkpoint(fn):
+    """Recompute the intermediate values of fn when differentiating it.
+
+    The resulting graph is given the `checkpoint` flag. The forward pass of
+    its gradient only keeps its arguments alive, and its backpropagator
+    runs the function again to get the intermediate values it needs. This
+    trades computation for memory in deep models.
+
+    Only functions that are called, rather than nested in the function
+    being differentiated, are checkpointed. Checkpointed functions are not
+    inlined until their gradient is computed.
+    """
+    flags = dict(getattr(fn, '_myia_flags', {}))
+    flags['checkpoint'] = True
+    fn._myia_flags = flags
+    return fn
+
+
 @core
 def arrayable_binary(mname, x, y):
     """Define a binary function that upcasts its arguments to Array.
@@ -789,3 +807,53 @@ class GradOperation(MetaGraph):
 
 
 grad = GradOperation('grad')
+
+
+class JVPOperation(MetaGraph):
+    """Implements the jvp(f) operation.
+
+    jvp(f)(x, ..., dx, ...) returns the pair (f(x, ...), df), where df is
+    the derivative of f at (x, ...) in the direction (dx, ...), computed in
+    forward mode. Each tangent has the same type as its input.
+    """
+
+    def specialize_from_types(self, types):
+        """Generate the graph."""
+        ft, = types
+        assert isinstance(ft, GraphInferrer)
+        g = ft._graph
+        assert isinstance(g, Graph)
+
+        dfbuilder = Graph()
+        dfbuilder.debug.name = f"jvp{len(g.parameters)}"
+        # Inlining the builder lets JVP be expanded on a constant graph,
+        # which is required if tuple arguments are erased.
+        dfbuilder.flags['core'] = True
+
+        with About(g.debug, 'copy'):
+            fn = dfbuilder.add_parameter()
+
+        with About(g.debug, 'jvp'):
+            jf = dfbuilder.apply(P.JVP, fn)
+
+        with About(g.debug, 'jvp'):
+            df = Graph()
+
+        params = []
+        for orig_p in g.parameters:
+            with About(orig_p.debug, 'copy'):
+                params.append(df.add_parameter())
+        tangents = []
+        for orig_p in g.parameters:
+            with About(orig_p.debug, 'jvp_tangent'):
+                tangents.append(df.add_parameter())
+        pairs = [df.apply(P.make_tuple, p, t)
+                 for p, t in zip(params, tangents)]
+        df.output = df.apply(jf, *pairs)
+
+        dfbuilder.output = Constant(df)
+
+        return dfbuilder
+
+
+jvp = JVPOperation('jvp')
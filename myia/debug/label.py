@@ -29,6 +29,10 @@ short_relation_symbols = {
     'grad_fprop': '▶',
     'grad_bprop': '◀',
     'grad_sens': '∇',
+    'jvp': '▷',
+    'jvp_primal': '',
+    'jvp_app': '',
+    'jvp_tangent': '∂',
 }
 
 
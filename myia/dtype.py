@@ -1,6 +1,7 @@
 """Type representation."""
 
 
+import copyreg
 import numpy
 from types import FunctionType
 from typing import Tuple as TupleT, Dict as DictT, Any
@@ -72,6 +73,12 @@ class TypeMeta(type):
 
         The named parameters correspond to the fields declared in the Type's
         annotations.
+
+        Types are interned: parameterizing a generic twice with the same
+        parameters returns the same object, so types can be compared with
+        `is` and hashed by identity. Parameters that are already hashable,
+        such as other types or tuples of types, are looked up directly, and
+        the others are frozen into an equivalent key.
         """
         fields = cls._fields
         if not fields:
@@ -81,9 +88,17 @@ class TypeMeta(type):
         elif list(params.keys()) != fields:
             raise TypeError('Invalid type parameterization')
         else:
-            key = (cls, as_frozen(params))
-            if key in _type_cache:
+            values = tuple(params.values())
+            try:
+                key = (cls, values)
                 return _type_cache[key]
+            except TypeError:
+                # Some parameters are lists or dicts, we need to freeze them
+                key = (cls, as_frozen(values))
+                if key in _type_cache:
+                    return _type_cache[key]
+            except KeyError:
+                pass
             rval = type(cls.__qualname__, (cls,), {'_params': params})
             for k, v in params.items():
                 setattr(rval, k, v)
@@ -264,9 +279,18 @@ class Function(Object):
 
     @classmethod
     def parameterize(cls, arguments, retval):
-        """Parameterize using a sequence of arguments and a return type."""
+        """Parameterize using a sequence of arguments and a return type.
+
+        The arguments are stored as a tuple. Since this is called for every
+        application by inference and validation, the type cache is checked
+        directly before going through make_subtype.
+        """
         assert isinstance(arguments, (list, tuple))
-        return cls.make_subtype(arguments=arguments, retval=retval)
+        arguments = tuple(arguments)
+        try:
+            return _type_cache[cls, (arguments, retval)]
+        except (KeyError, TypeError):
+            return cls.make_subtype(arguments=arguments, retval=retval)
 
 
 class JTagged(Object):
@@ -446,6 +470,30 @@ def pytype_to_myiatype(pytype, instance=None):
         return External[pytype]
 
 
+def _make_subtype(generic, params):
+    return generic.make_subtype(**params)
+
+
+def _make_class(dc, attributes):
+    mcls = pytype_to_myiatype(dc)
+    return Class[mcls.tag, attributes, mcls.methods]
+
+
+def _reduce_type(t):
+    """Pickle Myia types so that they unpickle to the same type objects."""
+    if t.is_generic():
+        return t.__qualname__
+    elif ismyiatype(t, Class) and t.tag in tag_to_dataclass:
+        # Class tags are only unique per process, so we go through the
+        # dataclass to find the tag on the other side.
+        return (_make_class, (tag_to_dataclass[t.tag], t.attributes))
+    else:
+        return (_make_subtype, (t.generic, t._params))
+
+
+copyreg.pickle(TypeMeta, _reduce_type)
+
+
 leaf_types = (Bool, Number, TypeType, Problem, External,
               EnvType, SymbolicKeyType)
 
@@ -23,6 +23,12 @@ we generate:
     # SensRemapper (master)
     sens_y = hyper_add(from_z[idx] for z, idx in uses(y))
 
+  The sensitivities of a tuple that is indexed with constants are
+  accumulated element by element instead, so that no zero tuple has to be
+  created and added for each index:
+
+    sens_t = make_tuple(sens_t0 + ..., zeros_like(t[1]), sens_t2 + ...)
+
 * For the output node, in the fprop graph, we generate:
 
     return fprop_y, bprop_y
@@ -51,6 +57,7 @@ expressions. See `SensRemapper.link_apply` for more information.
 from functools import reduce
 
 from .composite import zeros_like, hyper_add
+from .dtype import Tuple, ismyiatype
 from .info import About
 from .ir import Constant, Graph, clone
 from .opt import sexp_to_node
@@ -404,6 +411,13 @@ class BPropAppRemapper(SlaveRemapper):
         new_node.inputs = [fn, arg]
 
 
+def _is_constant_getitem(user, key):
+    """Check if user is `tuple_getitem(x, i)` with i constant, and key 1."""
+    return key == 1 \
+        and user.is_apply(primops.tuple_getitem) \
+        and user.inputs[2].is_constant(int)
+
+
 class SensRemapper(GraphRemapper):
     """Generate the sensitivities in the backward graph.
 
@@ -477,8 +491,20 @@ class SensRemapper(GraphRemapper):
 
         contribs = []
 
+        # Sensitivities for each element of a tuple, if applicable.
+        ntuple = None
+        if not isinstance(node, Graph) and ismyiatype(node.type, Tuple):
+            ntuple = len(node.type.elements)
+        elements = {}
+
         for user, key in uses:
-            if user.graph is g:
+            if user.graph is g and ntuple is not None \
+                    and _is_constant_getitem(user, key):
+                # The contribution of t[i] to t is (0, ..., E:t[i], ..., 0),
+                # but we only keep track of E:t[i].
+                idx = user.inputs[2].value % ntuple
+                elements.setdefault(idx, []).append(self.get(g, user))
+            elif user.graph is g:
                 # We only concern ourselves with uses in this graph
                 if user is user.graph.return_:
                     # This is the graph's output, so the contribution
@@ -530,13 +556,21 @@ class SensRemapper(GraphRemapper):
                     (zeros_like, jinv))
             contribs.append(sexp)
 
+        # All contributions are added together with hyper_add.
+        def mkadd(x, y):
+            return (hyper_add, x, y)
+
+        if elements:
+            contribs.append((primops.make_tuple, *[
+                reduce(mkadd, elements[i]) if i in elements
+                else (zeros_like, (primops.tuple_getitem, jinv, i))
+                for i in range(ntuple)
+            ]))
+
         n = len(contribs)
         if n == 0:
             sexp = (zeros_like, jinv)
         else:
-            # All contributions are added together with hyper_add.
-            def mkadd(x, y):
-                return (hyper_add, x, y)
             sexp = reduce(mkadd, contribs)
 
         new_node.inputs = sexp_to_node(sexp, ng).inputs
@@ -640,13 +674,65 @@ def J(prim: Primitive, resources):
         return g
 
 
+def _checkpoint(graph, jgraph):
+    """Wrap jgraph so that it recomputes the intermediates of graph.
+
+    The forward graph only calls the primal graph, and its backpropagator
+    only keeps the inputs alive. When it is called, the backpropagator calls
+    jgraph again to recompute the intermediates it needs:
+
+        def fprop_checkpoint(jx, jy, ...):
+            out = graph(Jinv(jx), Jinv(jy), ...)
+
+            def bprop_checkpoint(dout):
+                _, bprop = jgraph(jx, jy, ...)
+                return bprop(dout)
+
+            return J(out), bprop_checkpoint
+    """
+    with About(graph.debug, 'grad_fprop'):
+        fprop = Graph()
+    with About(graph.debug, 'grad_bprop'):
+        bprop = Graph()
+
+    jparams = []
+    for p in graph.parameters:
+        with About(p.debug, 'grad_fprop'):
+            jparams.append(fprop.add_parameter())
+    args = [fprop.apply(primops.Jinv, p) for p in jparams]
+    out = fprop.apply(graph, *args)
+
+    with About(graph.output.debug, 'grad_sens'):
+        dout = bprop.add_parameter()
+    app = bprop.apply(jgraph, *jparams)
+    backprop = bprop.apply(primops.tuple_getitem, app, 1)
+    bprop.output = bprop.apply(backprop, dout)
+    # The flag keeps the backpropagator from being inlined in the forward
+    # pass, where the recomputation could be merged with the primal call.
+    bprop.flags['checkpoint_bprop'] = True
+
+    fprop.output = fprop.apply(primops.make_tuple,
+                               fprop.apply(primops.J, out),
+                               bprop)
+    fprop.transforms['primal'] = graph
+    graph.transforms['grad'] = fprop
+    return fprop
+
+
 @overload  # noqa: F811
 def J(graph: Graph, manager):
-    """Implement J on a Graph."""
+    """Implement J on a Graph.
+
+    If the graph has the `checkpoint` flag, the intermediate values it
+    computes are not kept for backpropagation, but recomputed by its
+    backpropagator.
+    """
     if graph.transforms.get('grad', None):
         return graph.transforms['grad']
     manager.add_graph(graph)
     res = _grad(manager, graph)
+    if graph.flags.get('checkpoint', False):
+        res = _checkpoint(graph, res)
     return clone(res)
 
 
@@ -25,6 +25,8 @@ class HyperMap(MetaGraph):
         nonleaf: List of Types to generate a recursive map over.
             Any type not in this list will generate a call to
             fn_leaf.
+        cache: The SpecializationCache to store generated graphs in
+            (default: a new cache).
 
     """
 
@@ -32,13 +34,14 @@ class HyperMap(MetaGraph):
                  fn_leaf=None,
                  fn_rec=None,
                  broadcast=True,
-                 nonleaf=(Array, List, Tuple, Class)):
+                 nonleaf=(Array, List, Tuple, Class),
+                 cache=None):
         """Initialize a HyperMap."""
         if fn_leaf is None:
             name = 'hyper_map'
         else:
             name = f'hyper_map[{fn_leaf}]'
-        super().__init__(name)
+        super().__init__(name, cache)
         self.fn_leaf = fn_leaf
         self.fn_rec = fn_rec or self
         self.broadcast = broadcast
@@ -653,6 +653,10 @@ CONTEXTLESS = Contextless()
 class AbstractReference:
     """Superclass for Reference and VirtualReference."""
 
+    async def get_shallow(self, track):
+        """Get the raw value for the track, which might be wrapped."""
+        return await reify_shallow(await self.get_raw(track))
+
 
 class Reference(AbstractReference):
     """Reference to a certain node in a certain context.
@@ -687,10 +691,6 @@ class Reference(AbstractReference):
         """Get the raw value for the track, which might be wrapped."""
         return self.engine.get_inferred(track, self)
 
-    async def get_shallow(self, track):
-        """Get the raw value for the track, which might be wrapped."""
-        return await reify_shallow(await self.get_raw(track,))
-
     def __eq__(self, other):
         return isinstance(other, Reference) \
             and self.node is other.node \
@@ -1,9 +1,11 @@
-"""Implements JInferrer."""
+"""Implements JInferrer and JVPInferrer."""
 
+from ..ir import Constant
 from ..prim import ops as P
 from ..debug.label import short_relation_symbols as syms
 
-from .graph_infer import Inferrer, ExplicitInferrer, TransformedReference
+from .graph_infer import Inferrer, ExplicitInferrer, TransformedReference, \
+    Context
 from .core import reify, reify_shallow
 
 
@@ -37,3 +39,31 @@ class JInferrer(Inferrer):
             name=f'{syms["grad_bprop"]}{self.fn.identifier}'
         )
         return self.mktuple([res_t, bprop_t])
+
+
+class JVPInferrer(Inferrer):
+    """Inferrer for JVP(fn).
+
+    JVP(fn) takes a (primal, tangent) pair for each argument of fn and returns
+    a (primal, tangent) pair. Tangents have the same type as their primals,
+    except for functions, whose tangents are their JVP.
+
+    Arguments:
+        fn: The function to transform.
+        mktuple: A function to create a tuple appropriate for the track.
+    """
+
+    def __init__(self, fn, mktuple):
+        """Initialize a JVPInferrer."""
+        super().__init__(fn.track, 'JVP')
+        self.fn = fn
+        assert isinstance(fn, Inferrer)
+        self.mktuple = mktuple
+
+    async def infer(self, *pairs):
+        """Infer given the (primal, tangent) arguments."""
+        idx = self.engine.ref(Constant(0), Context.empty())
+        args = [TransformedReference(self.engine, P.tuple_getitem, pair, idx)
+                for pair in pairs]
+        res = await reify(await self.fn(*args))
+        return self.mktuple([res, self.track.ttag(res)])
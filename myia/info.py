@@ -9,6 +9,7 @@ from typing import Any, Set
 # We use per-thread storage for the about stack.
 _about = threading.local()
 _about.stack = [None]
+_about.strip = 0
 
 
 def _stack():
@@ -17,6 +18,11 @@ def _stack():
     return _about.stack
 
 
+def stripping_debug_info():
+    """Return whether debug relations are currently being discarded."""
+    return getattr(_about, 'strip', 0) > 0
+
+
 def current_info():
     """Return the `DebugInfo` for the current context."""
     return _stack()[-1]
@@ -161,13 +167,61 @@ class About:
                 # pragma: no cover
         self.debug = debug
         self.relation = relation
+        self._active = False
 
     def __enter__(self):
-        """Enter the context of this `About`."""
+        """Enter the context of this `About`.
+
+        This does nothing inside `StripDebugInfo`.
+        """
+        if stripping_debug_info():
+            return
+        self._active = True
         _stack().append(DebugInherit(about=self))
 
     def __exit__(self, type, value, tb):
         """Exit the context of this `About`."""
+        if not self._active:
+            return
+        self._active = False
         top = _stack()[-1]
         assert isinstance(top, DebugInfo) and top.about is self
         _stack().pop()
+
+
+class StripDebugInfo:
+    """Context manager to stop propagating debug relations.
+
+    Within `with StripDebugInfo(): ...`, `About` has no effect, so that
+    new `DebugInfo` objects do not refer to the debug information of the
+    objects they derive from. This prevents chains of relations (e.g.
+    through grad, cloning and specialization) from keeping the debug
+    information of every ancestor alive, at the cost of less informative
+    labels and error messages.
+
+    >>> with StripDebugInfo():
+    ...     with About(x, 'purpose'):
+    ...         info = NamedDebugInfo()
+    ...         assert info.about is None
+
+    """
+
+    def __enter__(self):
+        """Start discarding debug relations."""
+        _about.strip = getattr(_about, 'strip', 0) + 1
+
+    def __exit__(self, type, value, tb):
+        """Stop discarding debug relations."""
+        _about.strip -= 1
+
+
+def strip_debug_info(debug):
+    """Drop references held by a `DebugInfo` to other objects.
+
+    The name and location are kept, but the relation to other debug
+    information, the saved trace and the AST are removed.
+    """
+    if isinstance(debug, NamedDebugInfo):
+        debug.about = None
+        debug.trace = None
+    debug.__dict__.pop('ast', None)
@@ -7,7 +7,7 @@ from .manager import (  # noqa
     ManagerError, manage, ParentProxy, GraphManager
 )
 from .metagraph import (  # noqa
-    GraphGenerationError, MetaGraph, MultitypeGraph
+    GraphGenerationError, MetaGraph, MultitypeGraph, SpecializationCache
 )
 from .utils import (  # noqa
     succ_deep, succ_deeper, succ_incoming,
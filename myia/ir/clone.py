@@ -195,6 +195,10 @@ def clone(g,
                        graph_relation=graph_relation)[g]
 
 
+# Flags that transformed graphs keep, because grad still needs them.
+_TRANSFORMABLE_FLAGS = ('checkpoint', 'checkpoint_bprop')
+
+
 def transformable_clone(graph, relation='transform'):
     """Return a clone of the graph that can be safely transformed.
 
@@ -204,6 +208,8 @@ def transformable_clone(graph, relation='transform'):
     """
     with About(graph.debug, relation):
         newg = Graph()
+        newg.flags = {flag: value for flag, value in graph.flags.items()
+                      if flag in _TRANSFORMABLE_FLAGS}
     for p in graph.parameters:
         with About(p.debug, 'copy'):
             newg.add_parameter()
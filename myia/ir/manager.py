@@ -2,6 +2,7 @@
 
 
 from collections import defaultdict, Counter
+from collections.abc import Hashable
 
 from ..graph_utils import dfs, FOLLOW, EXCLUDE
 from ..utils import Events, Partializable, OrderedSet
@@ -55,10 +56,22 @@ class ParentProxy:
 
 
 class PerGraphStatistic(dict):
-    """Represents a statistic that maps each graph to some information."""
+    """Represents a statistic that maps each graph to some information.
+
+    Nodes and edges are usually added in bulk, through the `add_nodes` and
+    `add_edges` events, when a new graph is acquired by the manager. By
+    default, these are processed one by one by `_on_add_node` and
+    `_on_add_edge`, but subclasses may override `_on_add_nodes` and
+    `_on_add_edges` to do it more efficiently.
+
+    Statistics are created by the manager the first time they are requested,
+    at which point they process all graphs, nodes and edges that are already
+    in the manager, and then they are updated incrementally.
+    """
 
     constructor = dict
     include_graph_none = False
+    valid = True
 
     def __init__(self, manager):
         """Initialize a PerGraphStatistic."""
@@ -66,13 +79,29 @@ class PerGraphStatistic(dict):
         self.manager = manager
         evts = self.manager.events
         evts.add_node.register(self._on_add_node)
+        evts.add_nodes.register(self._on_add_nodes)
         evts.drop_node.register(self._on_drop_node)
         evts.add_graph.register(self._on_add_graph)
         evts.drop_graph.register(self._on_drop_graph)
         evts.add_edge.register(self._on_add_edge)
+        evts.add_edges.register(self._on_add_edges)
         evts.drop_edge.register(self._on_drop_edge)
         if self.include_graph_none:
             self[None] = self.constructor()
+        self._acquire_existing()
+
+    def _acquire_existing(self):
+        """Process the graphs, nodes and edges already in the manager."""
+        mng = self.manager
+        for graph in mng.graphs:
+            self._on_add_graph(None, graph)
+        self._on_add_nodes(None, mng.all_nodes)
+        self._on_add_edges(None, self._existing_edges())
+
+    def _existing_edges(self):
+        return [(node, key, inp)
+                for node in self.manager.all_nodes
+                for key, inp in enumerate(node.inputs)]
 
     def reset(self):
         """Reset this graph's information."""
@@ -87,12 +116,20 @@ class PerGraphStatistic(dict):
     def _on_add_node(self, event, node):
         pass
 
+    def _on_add_nodes(self, event, nodes):
+        for node in nodes:
+            self._on_add_node(event, node)
+
     def _on_drop_node(self, event, node):
         pass
 
     def _on_add_edge(self, event, node, key, value):
         pass
 
+    def _on_add_edges(self, event, edges):
+        for node, key, value in edges:
+            self._on_add_edge(event, node, key, value)
+
     def _on_drop_edge(self, event, node, key, value):
         pass
 
@@ -106,6 +143,10 @@ class NodesStatistic(PerGraphStatistic):
     def _on_add_node(self, event, node):
         self[node.graph].add(node)
 
+    def _on_add_nodes(self, event, nodes):
+        for node in nodes:
+            self[node.graph].add(node)
+
     def _on_drop_node(self, event, node):
         self[node.graph].remove(node)
 
@@ -154,6 +195,11 @@ class CounterStatistic(PerGraphStatistic):
     def _on_add_edge(self, event, node, key, inp):
         self._on_mod_edge(event, node, key, inp, 1)
 
+    def _on_add_edges(self, event, edges):
+        mod_edge = self._on_mod_edge
+        for node, key, inp in edges:
+            mod_edge(event, node, key, inp, 1)
+
     def _on_drop_edge(self, event, node, key, inp):
         self._on_mod_edge(event, node, key, inp, -1)
 
@@ -197,18 +243,42 @@ class GDepDirectStatistic(CounterStatistic):
 class GDepProxStatistic(CounterStatistic):
     """Implements `GraphManager.graph_dependencies_prox`."""
 
-    def _on_mod_edge(self, event, node, key, inp, direction):
+    def _mod_edge(self, node, inp, direction):
+        """Update the counts and return whether nesting was invalidated."""
         g1 = node.graph
+        invalidate = False
 
         if inp.is_constant_graph():
             ig = inp.value
             if self.mod(g1, ParentProxy(ig), direction):
-                self.manager.events.invalidate_nesting()
+                invalidate = True
 
         g2 = inp.graph
         if g1 and g2 and g1 is not g2:
             if self.mod(g1, g2, direction):
-                self.manager.events.invalidate_nesting()
+                invalidate = True
+
+        return invalidate
+
+    def _on_mod_edge(self, event, node, key, inp, direction):
+        if self._mod_edge(node, inp, direction):
+            self.manager.events.invalidate_nesting()
+
+    def _on_add_edges(self, event, edges):
+        invalidate = False
+        for node, key, inp in edges:
+            if self._mod_edge(node, inp, 1):
+                invalidate = True
+        if invalidate:
+            self.manager.events.invalidate_nesting()
+
+    def _acquire_existing(self):
+        # Nesting statistics are computed from this one, so they cannot
+        # be invalid because of edges that were there before it existed.
+        for graph in self.manager.graphs:
+            self._on_add_graph(None, graph)
+        for node, key, inp in self._existing_edges():
+            self._mod_edge(node, inp, 1)
 
 
 class GraphsUsedStatistic(CounterStatistic):
@@ -227,6 +297,30 @@ class GraphUsersStatistic(CounterStatistic):
             self.mod(inp.value, node.graph, direction)
 
 
+class CallsStatistic(CounterStatistic):
+    """Implements `GraphManager.calls`.
+
+    Unlike other statistics, this maps constant functions rather than
+    graphs, to a counter of the nodes that apply them. A node may be
+    counted more than once, e.g. when one constant replaces another with
+    the same value.
+    """
+
+    def _on_add_graph(self, event, graph):
+        pass
+
+    def _on_drop_graph(self, event, graph):
+        pass
+
+    def _on_mod_edge(self, event, node, key, inp, direction):
+        if key == 0 and inp.is_constant(Hashable):
+            fn = inp.value
+            self.setdefault(fn, {})
+            self.mod(fn, node, direction)
+            if not self[fn]:
+                del self[fn]
+
+
 class NestingStatistic(PerGraphStatistic):
     """Represents a statistic about nesting.
 
@@ -258,6 +352,12 @@ class NestingStatistic(PerGraphStatistic):
     def _on_drop_graph(self, event, graph):
         self.reset()
 
+    def _on_add_nodes(self, event, nodes):
+        pass
+
+    def _on_add_edges(self, event, edges):
+        pass
+
     def recompute(self):
         """Recompute the information from scratch."""
         self._recompute()
@@ -379,6 +479,12 @@ class FVTotalStatistic(NestingStatistic, CounterStatistic):
                     self.mod(curr, g2, count)
                     curr = mng.parents[curr]
 
+    def _on_add_edges(self, event, edges):
+        if not self.valid:
+            return
+        for node, key, inp in edges:
+            self._on_mod_edge(event, node, key, inp, 1)
+
     def _on_mod_edge(self, event, node, key, inp, direction):
         if not self.valid:
             return
@@ -393,8 +499,9 @@ class FVTotalStatistic(NestingStatistic, CounterStatistic):
 
         if inp.is_constant_graph():
             ig = inp.value
-            if self.manager._parents.valid:
-                p = self.manager._parents[ig]
+            parents = self.manager._statistics.get('parents', None)
+            if parents is not None and parents.valid:
+                p = parents[ig]
                 if p:
                     _update(p, ig)
 
@@ -432,52 +539,137 @@ class RecursiveStatistic(NestingStatistic):
             self[g] = g in gs
 
 
-class GraphManager(Partializable):
-    """Structure to hold information about graphs and modify them.
-
-    Attributes are updated incrementally when graph mutations are committed.
+class ValueNumberingStatistic(PerGraphStatistic):
+    """Implements `GraphManager.value_numbers`.
 
-    Properties are updated incrementally when possible, but may be invalidated
-    when graph dependencies change. In that case they will be recomputed lazily
-    the next time they are requested.
+    Each graph is mapped to a table from the structural key of its nodes to
+    the first node that was found with that key. The key of a constant is
+    its value along with its type, and the key of an application is the
+    tuple of its inputs, so that two nodes with the same key compute the
+    same thing. Nodes that are added to a graph, or whose inputs change, are
+    put in `dirty` until they are numbered.
 
     Attributes:
-        all_nodes:
-            Set of all nodes in all graphs managed by this GraphManager.
+        dirty: The set of nodes that are not in the tables, and may be
+            equivalent to a node that is.
+        keys: Map each node in the tables to its key.
 
-        nodes:
-            Map each graph to the set of nodes that belong to it.
+    """
 
-        uses:
-            Map each node to the set of nodes that point to it.
+    include_graph_none = True
+
+    def __init__(self, manager):
+        """Initialize a ValueNumberingStatistic."""
+        self.dirty = OrderedSet()
+        self.keys = {}
+        super().__init__(manager)
+
+    def reset(self):
+        """Reset this graph's information."""
+        self.dirty.clear()
+        self.keys.clear()
+        return super().reset()
+
+    def number(self, node):
+        """Number node and return the representative for its key.
+
+        This is node itself if no other node has the same key, or if node
+        has no key, e.g. if it is a parameter.
+        """
+        key = self._key(node)
+        if key is None:
+            return node
+        table = self.get(node.graph)
+        if table is None:
+            return node
+        main = table.setdefault(key, node)
+        if main is node:
+            self.keys[node] = key
+        return main
+
+    def _key(self, node):
+        if node.is_constant():
+            key = (type(node.value), node.value, node.type)
+        elif node.is_apply() and node is not node.graph.return_:
+            key = tuple(node.inputs)
+        else:
+            return None
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _invalidate(self, node):
+        key = self.keys.pop(node, None)
+        if key is not None:
+            table = self.get(node.graph)
+            if table is not None and table.get(key) is node:
+                del table[key]
+
+    def _on_add_node(self, event, node):
+        self.dirty.add(node)
 
-        free_variables_direct:
-            Map each graph to its free variables.
+    def _on_add_nodes(self, event, nodes):
+        self.dirty.update(nodes)
 
-            "Direct" free variables are those that the graph refers
-            to directly. Nested graphs are not taken into account, but
-            they are in `free_variables_total`.
+    def _on_drop_node(self, event, node):
+        self._invalidate(node)
+        self.dirty.discard(node)
+
+    def _on_add_edge(self, event, node, key, value):
+        self._invalidate(node)
+        self.dirty.add(node)
+
+    def _on_add_edges(self, event, edges):
+        for node, key, value in edges:
+            self._on_add_edge(event, node, key, value)
 
-        graphs_used:
-            Map each graph to the set of graphs it uses. For each graph,
-            this is the set of graphs that it refers to directly.
+    def _on_drop_edge(self, event, node, key, value):
+        self._invalidate(node)
+        self.dirty.add(node)
 
-        graph_users:
-            Map each graph to the set of graphs that use it. For each graph,
-            this is the set of graphs that refer to it directly.
 
-        graph_dependencies_direct:
-            Map each graph to the graphs it gets free variables from.
+class GraphManager(Partializable):
+    """Structure to hold information about graphs and modify them.
 
-            This is the set of graphs that own the nodes returned by
-            `free_variables_direct`, for each graph.
+    Attributes are updated incrementally when graph mutations are committed.
 
-        graph_constants:
-            Map each graph to the set of Constant nodes that have this
-            graph as a value.
+    Properties are computed the first time they are requested, so that a
+    manager only maintains the statistics that are actually used. After that,
+    they are updated incrementally when possible, but may be invalidated when
+    graph dependencies change. In that case they will be recomputed lazily the
+    next time they are requested.
+
+    Attributes:
+        all_nodes:
+            Set of all nodes in all graphs managed by this GraphManager.
+
+        uses:
+            Map each node to the set of nodes that point to it.
 
     """
 
+    _statistic_classes = dict(
+        nodes=NodesStatistic,
+        constants=ConstantsStatistic,
+        free_variables_direct=FVDirectStatistic,
+        graph_constants=GraphConstantsStatistic,
+        graphs_used=GraphsUsedStatistic,
+        graph_users=GraphUsersStatistic,
+        graph_dependencies_direct=GDepDirectStatistic,
+        graph_dependencies_prox=GDepProxStatistic,
+        graph_dependencies_total=GDepTotalStatistic,
+        parents=ParentStatistic,
+        children=ChildrenStatistic,
+        scopes=ScopeStatistic,
+        free_variables_total=FVTotalStatistic,
+        graphs_reachable=GraphsReachableStatistic,
+        recursive=RecursiveStatistic,
+        value_numbers=ValueNumberingStatistic,
+        calls=CallsStatistic,
+    )
+
     def __init__(self, *roots, manage=True):
         """Initialize the GraphManager."""
         self.roots = roots
@@ -491,10 +683,12 @@ class GraphManager(Partializable):
         """
         self.events = Events(
             add_node=None,
+            add_nodes=None,
             drop_node=None,
             add_graph=None,
             drop_graph=None,
             add_edge=None,
+            add_edges=None,
             drop_edge=None,
             invalidate_nesting=None,
         )
@@ -503,23 +697,7 @@ class GraphManager(Partializable):
         self.graphs = OrderedSet()
         self.all_nodes = OrderedSet()
         self.uses = defaultdict(OrderedSet)
-
-        self.nodes = NodesStatistic(self)
-        self.constants = ConstantsStatistic(self)
-        self.free_variables_direct = FVDirectStatistic(self)
-        self.graph_constants = GraphConstantsStatistic(self)
-        self.graphs_used = GraphsUsedStatistic(self)
-        self.graph_users = GraphUsersStatistic(self)
-        self.graph_dependencies_direct = GDepDirectStatistic(self)
-        self.graph_dependencies_prox = GDepProxStatistic(self)
-
-        self._graph_dependencies_total = GDepTotalStatistic(self)
-        self._parents = ParentStatistic(self)
-        self._children = ChildrenStatistic(self)
-        self._scopes = ScopeStatistic(self)
-        self._free_variables_total = FVTotalStatistic(self)
-        self._graphs_reachable = GraphsReachableStatistic(self)
-        self._recursive = RecursiveStatistic(self)
+        self._statistics = {}
 
         for root in roots:
             self.add_graph(root, root=True)
@@ -621,25 +799,47 @@ class GraphManager(Partializable):
             self._process_edge(node, key, inp, direction)
 
     def _acquire_nodes(self, nodes):
-        """Add newly connected nodes."""
+        """Add newly connected nodes.
+
+        Rather than firing `add_node` and `add_edge` for each new node and
+        edge, this collects them all and fires `add_nodes` and `add_edges`
+        once, so that statistics can be updated in one pass.
+        """
+        all_nodes = self.all_nodes
+
         def limit(x):
-            if x in self.all_nodes:
+            if x in all_nodes:
                 return EXCLUDE
             else:
                 return FOLLOW
 
         acq = OrderedSet()
         for node in nodes:
-            new_nodes = OrderedSet(dfs(node, succ_deeper, limit))
-            self.all_nodes |= new_nodes
-            acq |= new_nodes
+            new_nodes = list(dfs(node, succ_deeper, limit))
+            all_nodes.update(new_nodes)
+            acq.update(new_nodes)
+
+        if not acq:
+            return
 
+        uses = self.uses
+        graphs = self.graphs
+        edges = []
         for node in acq:
             g = node.graph
-            if g is not None:
+            if g is not None and g not in graphs:
                 self.add_graph(g)
-            self.events.add_node(node)
-            self._process_inputs(node, 1)
+            for key, inp in enumerate(node.inputs):
+                g = inp.graph
+                if g is not None and g not in graphs:
+                    self.add_graph(g)
+                if inp.is_constant_graph() and inp.value not in graphs:
+                    self.add_graph(inp.value)
+                uses[inp].add((node, key))
+                edges.append((node, key, inp))
+
+        self.events.add_nodes(acq)
+        self.events.add_edges(edges)
 
     def _maybe_drop_nodes(self, nodes):
         """Check if the nodes are connected to a graph, drop them if not."""
@@ -667,11 +867,74 @@ class GraphManager(Partializable):
 
         return graphs_to_check
 
-    def _ensure_statistic(self, stat):
+    def _ensure_statistic(self, name):
+        stat = self._statistics.get(name, None)
+        if stat is None:
+            stat = self._statistic_classes[name](self)
+            self._statistics[name] = stat
         if not stat.valid:
             stat.recompute()
         return stat
 
+    @property
+    def nodes(self):
+        """Map each graph to the set of nodes that belong to it."""
+        return self._ensure_statistic('nodes')
+
+    @property
+    def constants(self):
+        """Map each graph to the set of constants it uses."""
+        return self._ensure_statistic('constants')
+
+    @property
+    def free_variables_direct(self):
+        """Map each graph to its free variables.
+
+        "Direct" free variables are those that the graph refers
+        to directly. Nested graphs are not taken into account, but
+        they are in `free_variables_total`.
+        """
+        return self._ensure_statistic('free_variables_direct')
+
+    @property
+    def graph_constants(self):
+        """Map each graph to the Constant nodes that have it as a value."""
+        return self._ensure_statistic('graph_constants')
+
+    @property
+    def graphs_used(self):
+        """Map each graph to the set of graphs it uses.
+
+        For each graph, this is the set of graphs that it refers to directly.
+        """
+        return self._ensure_statistic('graphs_used')
+
+    @property
+    def graph_users(self):
+        """Map each graph to the set of graphs that use it.
+
+        For each graph, this is the set of graphs that refer to it directly.
+        """
+        return self._ensure_statistic('graph_users')
+
+    @property
+    def graph_dependencies_direct(self):
+        """Map each graph to the graphs it gets free variables from.
+
+        This is the set of graphs that own the nodes returned by
+        `free_variables_direct`, for each graph.
+        """
+        return self._ensure_statistic('graph_dependencies_direct')
+
+    @property
+    def graph_dependencies_prox(self):
+        """Map each graph to the graphs it depends on, or their proxies.
+
+        This is like `graph_dependencies_direct`, but graphs used as constants
+        contribute a `ParentProxy` for their own parent.
+        """
+        return self._ensure_statistic('graph_dependencies_prox')
+
     @property
     def graph_dependencies_total(self):
         """Map each graph to the set of graphs it depends on.
@@ -680,7 +943,7 @@ class GraphManager(Partializable):
         includes the graphs from which nested graphs need free
         variables.
         """
-        return self._ensure_statistic(self._graph_dependencies_total)
+        return self._ensure_statistic('graph_dependencies_total')
 
     @property
     def parents(self):
@@ -689,7 +952,7 @@ class GraphManager(Partializable):
         Top-level graphs are associated to `None` in the returned
         dictionary.
         """
-        return self._ensure_statistic(self._parents)
+        return self._ensure_statistic('parents')
 
     @property
     def children(self):
@@ -697,7 +960,7 @@ class GraphManager(Partializable):
 
         This is the inverse map of `parents`.
         """
-        return self._ensure_statistic(self._children)
+        return self._ensure_statistic('children')
 
     @property
     def scopes(self):
@@ -705,7 +968,7 @@ class GraphManager(Partializable):
 
         The set associated to a graph includes the graph.
         """
-        return self._ensure_statistic(self._scopes)
+        return self._ensure_statistic('scopes')
 
     @property
     def free_variables_total(self):
@@ -715,7 +978,7 @@ class GraphManager(Partializable):
         variables needed by children graphs. Furthermore, graph Constants may
         figure as free variables.
         """
-        return self._ensure_statistic(self._free_variables_total)
+        return self._ensure_statistic('free_variables_total')
 
     @property
     def graphs_reachable(self):
@@ -724,7 +987,7 @@ class GraphManager(Partializable):
         For each graph, this is the set of graphs that it refers to
         directly *plus* the set of graphs it refers to indirectly.
         """
-        return self._ensure_statistic(self._graphs_reachable)
+        return self._ensure_statistic('graphs_reachable')
 
     @property
     def recursive(self):
@@ -732,7 +995,24 @@ class GraphManager(Partializable):
 
         A graph is considered recursive if it is reachable from itself.
         """
-        return self._ensure_statistic(self._recursive)
+        return self._ensure_statistic('recursive')
+
+    @property
+    def value_numbers(self):
+        """Map each graph to a table of its nodes, by structural key.
+
+        This is used for common subexpression elimination. Nodes in the
+        `dirty` set of the result have not been numbered yet.
+        """
+        return self._ensure_statistic('value_numbers')
+
+    @property
+    def calls(self):
+        """Map each constant function to the nodes that apply it.
+
+        Functions that are not applied anywhere are not in the mapping.
+        """
+        return self._ensure_statistic('calls')
 
     def set_parameters(self, graph, parameters):
         """Replace a graph's parameters."""
@@ -9,25 +9,104 @@ class GraphGenerationError(Exception):
     """Raised when a graph could not be generated by a MetaGraph."""
 
 
+class SpecializationCache:
+    """Size-bounded cache of graphs generated by MetaGraphs.
+
+    Entries are keyed by `(metagraph, types)`, so one cache can be shared
+    by several MetaGraphs. When the cache is full, the least recently used
+    entry is evicted.
+
+    Attributes:
+        maxsize: The maximal number of entries, or None for no bound.
+        hits: Number of lookups that found a graph.
+        misses: Number of lookups that did not.
+        evictions: Number of entries that were evicted.
+
+    """
+
+    def __init__(self, maxsize=1000):
+        """Initialize a SpecializationCache."""
+        self.maxsize = maxsize
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return the entry for key, or default if there is none."""
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries[key] = value
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        entries = self._entries
+        entries.pop(key, None)
+        entries[key] = value
+        if self.maxsize is not None:
+            while len(entries) > self.maxsize:
+                del entries[next(iter(entries))]
+                self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
+
+    def info(self):
+        """Return a dictionary of statistics about the cache."""
+        return dict(
+            size=len(self._entries),
+            maxsize=self.maxsize,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
+
 class MetaGraph:
     """Graph generator.
 
     Can be called with a pipeline's resources and a list of argument types to
     generate a graph corresponding to these types.
+
+    Attributes:
+        name: The name of the MetaGraph.
+        cache: A SpecializationCache holding the generated graphs. It may be
+            shared with other MetaGraphs.
+
     """
 
-    def __init__(self, name):
+    def __init__(self, name, cache=None):
         """Initialize a MetaGraph."""
         self.name = name
-        self.cache = {}
+        self.cache = SpecializationCache() if cache is None else cache
 
     async def specialize(self, argrefs):
         """Generate a Graph for the given references."""
         types = tuple([await arg['type'] for arg in argrefs])
+        return self.generate_graph(types)
 
-        if types not in self.cache:
-            self.cache[types] = self.specialize_from_types(types)
-        return self.cache[types]
+    def generate_graph(self, types):
+        """Return a Graph for this type signature, using the cache."""
+        key = (self, types)
+        g = self.cache.get(key)
+        if g is None:
+            g = self.specialize_from_types(types)
+            self.cache[key] = g
+        return g
 
     def specialize_from_types(self, types):
         """Generate a Graph for this type signature."""
@@ -43,30 +122,75 @@ class MetaGraph:
 
 
 class MultitypeGraph(MetaGraph):
-    """Associates type signatures to specific graphs."""
+    """Associates type signatures to specific graphs.
+
+    Lookups are memoized on the exact argument types, when these are all
+    Myia types, in a SpecializationCache with the same bound as the graph
+    cache. On a miss, only the entries that are compatible with the
+    generic of each argument type are checked; these candidate lists are
+    indexed as well.
+    """
 
-    def __init__(self, name, entries={}):
+    def __init__(self, name, entries={}, cache=None):
         """Initialize a MultitypeGraph."""
-        super().__init__(name)
+        super().__init__(name, cache)
         self.entries = list(entries.items())
+        self._index = {}
+        self._memo = SpecializationCache(self.cache.maxsize)
 
     def register(self, *types):
         """Register a function for the given type signature."""
         def deco(fn):
             self.entries.append((types, fn))
+            self._index.clear()
+            self._memo.clear()
             return fn
         return deco
 
-    def _getfn(self, types):
-        for sig, fn in self.entries:
-            if len(sig) != len(types):
-                continue
+    @staticmethod
+    def _dispatch_key(t):
+        return t.generic if ismyiatype(t) else type(t)
+
+    @staticmethod
+    def _may_match(t1, key):
+        if ismyiatype(t1, generic=True):
+            return ismyiatype(key, t1)
+        elif ismyiatype(t1):
+            return key is t1.generic
+        else:
+            return isinstance(key, type) and issubclass(key, t1)
+
+    def _candidates(self, key):
+        try:
+            return self._index[key]
+        except KeyError:
+            cands = [(sig, fn) for sig, fn in self.entries
+                     if len(sig) == len(key)
+                     and all(self._may_match(t1, k)
+                             for t1, k in zip(sig, key))]
+            self._index[key] = cands
+            return cands
+
+    def _resolve(self, types):
+        key = tuple(map(self._dispatch_key, types))
+        for sig, fn in self._candidates(key):
             if all(issubtype(t2, t1) if ismyiatype(t1) else isinstance(t2, t1)
                    for t1, t2 in zip(sig, types)):
                 return fn
         else:
             raise GraphGenerationError(types)
 
+    def _getfn(self, types):
+        types = tuple(types)
+        if not all(ismyiatype(t) for t in types):
+            # Other types, e.g. inferrers, are specific to a pipeline and
+            # would keep it alive in the memo
+            return self._resolve(types)
+        fn = self._memo.get(types)
+        if fn is None:
+            fn = self._memo[types] = self._resolve(types)
+        return fn
+
     def specialize_from_types(self, types):
         """Generate a Graph for this type signature."""
         from ..parser import parse
@@ -74,5 +198,5 @@ class MultitypeGraph(MetaGraph):
 
     def __call__(self, *args):
         """Call like a normal function."""
-        fn = self._getfn([typeof(arg) for arg in args])
+        fn = self._getfn(tuple(map(typeof, args)))
         return fn(*args)
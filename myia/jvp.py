@@ -0,0 +1,318 @@
+"""Generate the graphs for forward mode differentiation.
+
+The JVP transform on a graph produces a graph that takes a (primal, tangent)
+pair for each parameter, and returns the pair of the graph's output and of
+its tangent, i.e. the product of the graph's Jacobian with the input
+tangents. For each node `y = f(x)` of the graph, we generate:
+
+* Three nodes in the new graph, using one GraphRemapper and two
+  SlaveRemappers:
+
+    temp = jvp_f((primal_x, tangent_x))  # JVPAppRemapper     (slave)
+    primal_y = temp[0]                   # JVPPrimalRemapper  (master)
+    tangent_y = temp[1]                  # JVPTangentRemapper (slave)
+
+* For structural primitives such as make_tuple, tuple_getitem or switch,
+  the primal and tangent nodes are generated directly, without a call:
+
+    primal_y = make_tuple(primal_x, primal_z)
+    tangent_y = make_tuple(tangent_x, tangent_z)
+
+* For the output node, we generate:
+
+    return primal_y, tangent_y
+
+Unlike reverse mode, no backward graph is needed, so the tangents are
+computed alongside the primal values and nothing has to be kept alive for
+later.
+"""
+
+
+from .composite import zeros_like
+from .dtype import Function, ismyiatype
+from .info import About
+from .ir import Constant, Graph, MetaGraph, clone
+from .prim import ops as primops, Primitive
+from .prim.jvp_implementations import jvp_graphs
+from .grad import GraphRemapper, SlaveRemapper, RemapperSet
+from .utils import overload
+
+
+# How the inputs of a structural primitive are mapped to the inputs of the
+# tangent node: P is the primal of the input, T is its tangent and X is the
+# (primal, tangent) pair. A trailing * repeats the last letter for all the
+# remaining inputs. The primal node always applies the primitive to the
+# primals of the inputs. The operations on J and on environments are listed
+# here so that reverse mode graphs can be differentiated in forward mode.
+_structural = {
+    primops.make_tuple: 'T*',
+    primops.tuple_getitem: 'TP',
+    primops.tuple_setitem: 'TPT',
+    primops.make_list: 'T*',
+    primops.list_getitem: 'TP',
+    primops.list_setitem: 'TPT',
+    primops.list_append: 'TT',
+    primops.make_record: 'PT*',
+    primops.getattr: 'TP',
+    primops.switch: 'PTT',
+    primops.identity: 'T',
+    primops.partial: 'TX*',
+    primops.J: 'T',
+    primops.Jinv: 'T',
+    primops.embed: 'P',
+    primops.env_setitem: 'TPT',
+    primops.env_getitem: 'TPT',
+    primops.env_add: 'TT',
+}
+
+
+def _structural_spec(node):
+    fn = node.inputs[0]
+    if fn.is_constant(Primitive):
+        return _structural.get(fn.value, None)
+    return None
+
+
+def _is_function(node):
+    return node.is_constant((Graph, Primitive, MetaGraph)) \
+        or ismyiatype(node.type, Function)
+
+
+def _has_tangent(v):
+    if isinstance(v, tuple):
+        return all(_has_tangent(x) for x in v)
+    return isinstance(v, (int, float)) or hasattr(v, 'dtype')
+
+
+class JVPPrimalRemapper(GraphRemapper):
+    """Generate the primal nodes in the forward graph.
+
+    x = a(b, c) => P:x = (A:x)[0]
+    """
+
+    def get(self, g, node):
+        """Get the primal node, creating it if it is a local graph."""
+        if node.is_constant_graph() and node.value in self.graphs:
+            return self.get_primal_graph(node.value)
+        return super().get(g, node)
+
+    def get_primal_graph(self, graph):
+        """Make the primal of a graph in the remapped scope.
+
+        The original graph may refer to the nodes of its parent graph, so
+        it is rather wrapped around its transformed version:
+
+            lambda x, y, ...: jvp_graph((x, 0), (y, 0), ...)[0]
+        """
+        if (graph, 'primal') not in self.repl:
+            with About(graph.debug, 'copy'):
+                wrapper = Graph()
+            params = [wrapper.add_parameter() for _ in graph.parameters]
+            pairs = [wrapper.apply(primops.make_tuple, p,
+                                   wrapper.apply(zeros_like, p))
+                     for p in params]
+            app = wrapper.apply(self.get_graph(graph), *pairs)
+            wrapper.output = wrapper.apply(primops.tuple_getitem, app, 0)
+            self.repl[graph, 'primal'] = Constant(wrapper)
+        return self.repl[graph, 'primal']
+
+    def gen_parameter(self, g, ng, p):
+        """Parameters are (primal, tangent) pairs."""
+        with About(p.debug, 'jvp'):
+            pair = ng.add_parameter()
+        self.repl[p, 'pair'] = pair
+        with About(p.debug, self.relation):
+            new_node = ng.apply(primops.tuple_getitem, pair, 0)
+        self.add_node(p, g, p, ng, new_node, link=False)
+
+    def gen_apply(self, g, ng, node):
+        """Generate primal nodes for all applications but the output."""
+        if node is not g.return_:
+            super().gen_apply(g, ng, node)
+
+    def gen_constant_graph(self, g, ng, ct):
+        """Local graphs are remapped lazily, by get_primal_graph."""
+        if ct.value not in self.graphs:
+            self.gen_constant(g, ng, ct)
+
+    def gen_fv(self, g, ng, fv):
+        """Free variables outside the remapped scope are kept as they are.
+
+        Remapped free variables are remapped elsewhere.
+        """
+        if fv.graph not in self.graphs:
+            self.repl[fv] = fv
+
+    def link_apply(self, g, ng, node, new_node):
+        """Link generated nodes to their inputs.
+
+        x = a(b, c) => P:x = (A:x)[0]
+        x = make_tuple(b, c) => P:x = make_tuple(P:b, P:c)
+        """
+        if _structural_spec(node):
+            fn, *args = node.inputs
+            new_node.inputs = [fn, *[self.get(g, a) for a in args]]
+        else:
+            app = self.remappers['jvp_app'].get(g, node)
+            new_node.inputs = [Constant(primops.tuple_getitem), app,
+                               Constant(0)]
+
+    def get_pair(self, g, node):
+        """Generate the (P:node, T:node) pair in the graph for g."""
+        if node.is_parameter() and node.graph is g:
+            return self.repl[node, 'pair']
+        ng = self.get_graph(g)
+        tangent = self.remappers['jvp_tangent'].get(g, node)
+        return ng.apply(primops.make_tuple, self.get(g, node), tangent)
+
+    def finalize_graph(self, g, ng):
+        """We generate the pair (P:output, T:output)."""
+        g.transforms['jvp'] = ng
+        ng.transforms['primal'] = g
+        out = self.get(g, g.output)
+        tangent = self.remappers['jvp_tangent'].get(g, g.output)
+        ng.output = ng.apply(primops.make_tuple, out, tangent)
+
+
+class JVPAppRemapper(SlaveRemapper):
+    """Generate the applications of forward graphs.
+
+    x = a(b, c) => A:x = (T:a)((P:b, T:b), (P:c, T:c))
+    """
+
+    def gen_apply(self, g, ng, node):
+        """Structural primitives and the output are not applied."""
+        if node is not g.return_ and not _structural_spec(node):
+            super().gen_apply(g, ng, node)
+
+    def link_apply(self, g, ng, node, new_node):
+        """Link generated nodes to their inputs.
+
+        x = a(b, c) => A:x = (T:a)((P:b, T:b), (P:c, T:c))
+        """
+        primal = self.remappers['jvp_primal']
+        fn, *args = node.inputs
+        new_node.inputs = [self.remappers['jvp_tangent'].get(g, fn),
+                           *[primal.get_pair(g, a) for a in args]]
+
+
+class JVPTangentRemapper(SlaveRemapper):
+    """Generate the tangent nodes in the forward graph.
+
+    x = a(b, c) => T:x = (A:x)[1]
+    """
+
+    def get(self, g, node):
+        """Get the tangent node, generating it if it is a constant.
+
+        * Graphs in the remapped scope map to their remapped versions.
+        * Other functions are wrapped with JVP.
+        * Numbers and arrays have a zero tangent, and other constants are
+          their own tangents.
+        * Free variables outside the remapped scope have a zero tangent.
+        """
+        if (g, node) in self.repl or node in self.repl:
+            return super().get(g, node)
+        ng = self.get_graph(g)
+        if node.is_constant_graph() and node.value in self.graphs:
+            new_node = Constant(self.master.get_graph(node.value))
+            self.repl[node] = new_node
+            return new_node
+        elif node.is_constant((Graph, Primitive, MetaGraph)):
+            with About(node.debug, self.relation):
+                new_node = ng.apply(primops.JVP, node)
+        elif node.is_constant():
+            if _has_tangent(node.value):
+                new_node = ng.apply(zeros_like, node)
+            else:
+                new_node = node
+        else:
+            assert node.graph not in self.graphs
+            with About(node.debug, self.relation):
+                new_node = ng.apply(zeros_like, node)
+        self.repl[g, node] = new_node
+        return new_node
+
+    def gen_parameter(self, g, ng, p):
+        """Generate the tangent of parameter p, from its pair."""
+        pair = self.master.repl[p, 'pair']
+        with About(p.debug, self.relation):
+            new_node = ng.apply(primops.tuple_getitem, pair, 1)
+        self.add_node(p, g, p, ng, new_node, link=False)
+
+    def gen_apply(self, g, ng, node):
+        """Generate tangent nodes for all applications but the output."""
+        if node is not g.return_:
+            super().gen_apply(g, ng, node)
+
+    def link_apply(self, g, ng, node, new_node):
+        """Link generated nodes to their inputs.
+
+        x = a(b, c) => T:x = (A:x)[1]
+        x = make_tuple(b, c) => T:x = make_tuple(T:b, T:c)
+        """
+        spec = _structural_spec(node)
+        primal = self.remappers['jvp_primal']
+        fn, *args = node.inputs
+        if spec and fn.value in (primops.J, primops.Jinv) \
+                and _is_function(args[0]):
+            # J(f) is a new function, so its tangent is its own JVP.
+            new_node.inputs = [Constant(primops.JVP), primal.get(g, node)]
+        elif spec:
+            if spec.endswith('*'):
+                spec = spec[:-2] + spec[-2] * (len(args) - len(spec) + 2)
+            getters = {'P': primal.get, 'T': self.get, 'X': primal.get_pair}
+            new_node.inputs = [fn, *[getters[k](g, a)
+                                     for k, a in zip(spec, args)]]
+        else:
+            app = self.remappers['jvp_app'].get(g, node)
+            new_node.inputs = [Constant(primops.tuple_getitem), app,
+                               Constant(1)]
+
+
+def _jvp(mng, root):
+    graphs = root.scope
+
+    remappers = RemapperSet(
+        graphs,
+        jvp_primal=JVPPrimalRemapper.partial(
+            graph_relation='jvp'
+        ),
+        jvp_app=JVPAppRemapper.partial(
+            master='jvp_primal'
+        ),
+        jvp_tangent=JVPTangentRemapper.partial(
+            master='jvp_primal'
+        ),
+    )
+    remappers.run()
+    return remappers['jvp_primal'].get_graph(root)
+
+
+@overload
+def JVP(prim: Primitive, manager):
+    """Implement JVP on a Primitive."""
+    try:
+        g = jvp_graphs[prim]
+    except KeyError:
+        raise NotImplementedError(f'JVP({prim}) is not implemented')
+    if isinstance(g, Graph):
+        return clone(g)
+    else:
+        return g
+
+
+@overload  # noqa: F811
+def JVP(graph: Graph, manager):
+    """Implement JVP on a Graph."""
+    if not graph.transforms.get('jvp', None):
+        manager.add_graph(graph)
+        _jvp(manager, graph)
+    return clone(graph.transforms['jvp'])
+
+
+@overload  # noqa: F811
+def JVP(other: object, manager):
+    """We do not implement JVP on non-functions."""
+    name = type(other).__qualname__
+    raise NotImplementedError(f'JVP(::{name}) not implemented')
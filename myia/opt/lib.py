@@ -1,12 +1,12 @@
 """Library of optimizations."""
 
-from ..composite import hyper_add
+from ..composite import hyper_add, zeros_like
 from ..dtype import type_cloner, Function, JTagged, Number, ismyiatype, \
     Tuple, UInt
 from ..infer import Inferrer
 from ..ir import Graph, Constant, GraphCloner, transformable_clone
 from ..prim import Primitive, ops as P
-from ..utils import Namespace, Partializable
+from ..utils import Namespace, Partializable, UNKNOWN
 from ..utils.unify import Var, var, SVar
 
 from .opt import \
@@ -168,6 +168,19 @@ add_zero_r = psub(
     name='add_zero_r'
 )
 
+# hyper_add(x, zeros_like(y)) => x
+add_zeros_like_l = psub(
+    pattern=(hyper_add, (zeros_like, Y), X),
+    replacement=X,
+    name='add_zeros_like_l'
+)
+
+add_zeros_like_r = psub(
+    pattern=(hyper_add, X, (zeros_like, Y)),
+    replacement=X,
+    name='add_zeros_like_r'
+)
+
 elim_identity = psub(
     pattern=(P.identity, X),
     replacement=X,
@@ -189,6 +202,24 @@ elim_distribute = psub(
 )
 
 
+# array_map(scalar_add, x, distribute(scalar_to_array(0), shp)) => x
+# This is what adding zeros_like of an array reduces to. array_map requires
+# both arrays to have the same shape, so x already has shape shp.
+add_zero_array_l = psub(
+    pattern=(P.array_map, P.scalar_add,
+             (P.distribute, (P.scalar_to_array, 0), C), X),
+    replacement=X,
+    name='add_zero_array_l'
+)
+
+add_zero_array_r = psub(
+    pattern=(P.array_map, P.scalar_add,
+             X, (P.distribute, (P.scalar_to_array, 0), C)),
+    replacement=X,
+    name='add_zero_array_r'
+)
+
+
 # array_reduce(f, x, shp) => x when x.shape == shp
 elim_array_reduce = psub(
     pattern=(P.array_reduce, Y, X, C),
@@ -483,12 +514,24 @@ def make_inliner(inline_criterion, check_recursive):
             returns whether the graph should be inlined or not.
         check_recursive: Check whether a function is possibly recursive
             before inlining it. If it is, don't inline.
+
+    Graphs with the `checkpoint` flag are not inlined while J may still be
+    applied to them, so that J can be applied to them as a whole. The
+    backpropagators generated for them, which have the `checkpoint_bprop`
+    flag, are never inlined.
     """
     @pattern_replacer(G, Xs)
     def inline(optimizer, node, equiv):
         g = equiv[G].value
         args = equiv[Xs]
 
+        if g.flags.get('checkpoint_bprop', False):
+            return node
+
+        if g.flags.get('checkpoint', False) \
+                and _may_apply_J_to_functions(node.graph.manager):
+            return node
+
         if inline_criterion is not None:
             if not inline_criterion(g, node, args):
                 return node
@@ -504,6 +547,19 @@ def make_inliner(inline_criterion, check_recursive):
     return inline
 
 
+def _may_apply_J_to_functions(manager):
+    """Whether a J node of manager may be applied to a function."""
+    for node in manager.calls.get(P.J, ()):
+        t = node.inputs[1].type
+        if not ismyiatype(t):
+            return True
+        try:
+            _nofunction(t)
+        except TypeError:
+            return True
+    return False
+
+
 def is_trivial_graph(g, node, args):
     """Inline trivial graphs.
 
@@ -797,6 +853,20 @@ def expand_J(optimizer, node, equiv):
     return Constant(newg)
 
 
+@pattern_replacer(P.JVP, C)
+def expand_jvp(optimizer, node, equiv):
+    """Replaces a call to JVP(f) by the graph for JVP(f)."""
+    from ..jvp import JVP as JVPimpl
+    arg = equiv[C].value
+    if isinstance(arg, Graph) and arg.output.type is UNKNOWN:
+        # Graphs that were just generated, e.g. by expand_J, may still
+        # contain resolve or MetaGraphs. They will be expanded once they
+        # are renormalized.
+        return None
+    newg = JVPimpl(arg, optimizer.resources.manager)
+    return Constant(newg)
+
+
 @type_cloner.variant
 def _nofunction(self, f: (Function, Inferrer)):
     raise TypeError('Function found')
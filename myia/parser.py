@@ -39,12 +39,19 @@ from typing import Dict, List, NamedTuple, Optional, Tuple, \
     overload as pyoverload
 
 from .info import About, DebugInherit, NamedDebugInfo
-from .ir import ANFNode, Apply, Constant, Graph, Parameter
+from .ir import ANFNode, Apply, Constant, Graph, GraphCloner, Parameter
 from .prim import ops as primops
 from .utils import ModuleNamespace, ClosureNamespace
 
 
 _parse_cache = {}
+_template_cache = {}
+_source_cache = {}
+
+
+# Maximal number of entries in _template_cache, from which the least
+# recently used ones are evicted.
+TEMPLATE_CACHE_SIZE = 256
 
 
 class Location(NamedTuple):
@@ -65,6 +72,43 @@ class Location(NamedTuple):
     node: ast.AST
 
 
+class LazyLocation:
+    """A location in source code, computed on demand.
+
+    Computing token-accurate locations requires tokenizing the function's
+    source, which is costly and only useful when an error is reported. A
+    LazyLocation holds on to the AST nodes it spans and only asks its parser
+    to tokenize the source the first time one of the Location fields other
+    than `filename` and `node` is accessed.
+
+    Attributes:
+        filename: The filename.
+        node: The AST node or list of AST nodes for this location.
+
+    """
+
+    def __init__(self, parser, node0, node1, node):
+        """Initialize a LazyLocation from the first and last AST nodes."""
+        self.parser = parser
+        self.filename = parser.filename
+        self.node = node
+        self._nodes = (node0, node1)
+        self._location = None
+
+    @property
+    def location(self) -> Location:
+        """The corresponding Location, computed on first access."""
+        if self._location is None:
+            self._location = self.parser.resolve_location(*self._nodes,
+                                                          self.node)
+        return self._location
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.location, attr)
+
+
 class MyiaSyntaxError(Exception):
     """Exception to indicate that the syntax is invalid for myia."""
 
@@ -117,18 +161,64 @@ def _fresh(node):
         return node
 
 
+def _get_source(func):
+    """Return the source lines of func and the line at which it starts.
+
+    The result is cached on the function's code object, which is shared by
+    all the closures created from the same definition.
+    """
+    code = func.__code__
+    if code not in _source_cache:
+        _source_cache[code] = inspect.getsourcelines(func)
+    return _source_cache[code]
+
+
+def _rebind(template, namespace, func):
+    """Return a clone of template that resolves nonlocals in func's closure.
+
+    The template graph was parsed from another function with the same code
+    and globals, and refers to that function's closure through namespace.
+    """
+    cloner = GraphCloner(template, total=False, clone_constants=True)
+    graph = cloner[template]
+    closure_namespace = ClosureNamespace(func)
+    for node, new in cloner.repl.items():
+        if isinstance(node, Constant) and node.value is namespace:
+            new.value = closure_namespace
+    return graph
+
+
 def parse(func):
     """Parse a function into a Myia graph.
 
     The result of the parsing is cached: multiple calls to parse on the same
     function will return the same graph. It should therefore be cloned prior
     to manipulation.
+
+    Functions with the same code object and globals, e.g. an inner function
+    that is re-created every time its enclosing function is called, are only
+    parsed once. The graphs of the other functions are clones of the first
+    one, which resolve nonlocal variables in their own closure.
     """
     if func in _parse_cache:
         return _parse_cache[func]
-    parser = Parser(func)
-    graph = parser.parse()
-    graph.flags.update(getattr(func, '_myia_flags', {}))
+    flags = getattr(func, '_myia_flags', {})
+    key = (func.__code__, id(func.__globals__))
+    entry = _template_cache.pop(key, None)
+    if entry is not None and entry[0] is func.__globals__:
+        _, template, namespace, base_flags = entry
+        graph = _rebind(template, namespace, func)
+        graph.flags = {**base_flags, **flags}
+    else:
+        parser = Parser(func)
+        template = graph = parser.parse()
+        namespace = parser.closure_namespace
+        base_flags = dict(graph.flags)
+        graph.flags.update(flags)
+    _template_cache[key] = (func.__globals__, template, namespace,
+                            base_flags)
+    while len(_template_cache) > TEMPLATE_CACHE_SIZE:
+        del _template_cache[next(iter(_template_cache))]
     _parse_cache[func] = graph
     return graph
 
@@ -157,7 +247,7 @@ class Parser:
     def __init__(self, function: FunctionType) -> None:
         """Construct a parser."""
         self.function = function
-        _, self.line_offset = inspect.getsourcelines(function)
+        self.source_lines, self.line_offset = _get_source(function)
         self.filename: str = inspect.getfile(function)
         # This is used to resolve the function's globals.
         self.global_namespace = ModuleNamespace(function.__module__)
@@ -166,8 +256,8 @@ class Parser:
         # Will be set later
         self.graph = None
 
-    def make_location(self, node) -> Location:
-        """Create a Location from an AST node."""
+    def make_location(self, node) -> LazyLocation:
+        """Create a LazyLocation from an AST node."""
         if isinstance(node, (list, tuple)):
             if len(node) == 0:
                 return None
@@ -177,19 +267,28 @@ class Parser:
             node0 = node
             node1 = node
         if hasattr(node0, 'lineno') and hasattr(node0, 'col_offset'):
-            li1, col1 = node0.first_token.start
-            li2, col2 = node1.last_token.end
-            li1 += self.line_offset - 1
-            li2 += self.line_offset - 1
-            col1 += self.col_offset
-            col2 += self.col_offset
-            return Location(self.filename,
-                            li1, col1, li2, col2, node)
+            return LazyLocation(self, node0, node1, node)
         else:
             # Some nodes like Index carry no location information, but
             # we basically just pass through them.
             return None  # pragma: no cover
 
+    def resolve_location(self, node0, node1, node) -> Location:
+        """Create a Location spanning from node0 to node1.
+
+        The source is tokenized the first time this is called, in order to
+        mark the AST nodes with their first and last tokens.
+        """
+        if self.tokens is None:
+            self.tokens = asttokens.ASTTokens(self.source, tree=self.tree)
+        li1, col1 = node0.first_token.start
+        li2, col2 = node1.last_token.end
+        li1 += self.line_offset - 1
+        li2 += self.line_offset - 1
+        col1 += self.col_offset
+        col2 += self.col_offset
+        return Location(self.filename, li1, col1, li2, col2, node)
+
     def make_condition_blocks(self, block):
         """Make two blocks for an if statement or expression."""
         with About(block.graph.debug, 'if_true'):
@@ -206,12 +305,16 @@ class Parser:
 
     def parse(self) -> Graph:
         """Parse the function into a Myia graph."""
-        src0 = inspect.getsource(self.function)
+        src0 = ''.join(self.source_lines)
         src = textwrap.dedent(src0)
         # We need col_offset to compensate for the dedent
         self.col_offset = len(src0.split('\n')[0]) - len(src.split('\n')[0])
-        tree = asttokens.ASTTokens(src, parse=True).tree
-        function_def = tree.body[0]
+        # Token positions are only computed if a location is needed, see
+        # resolve_location.
+        self.source = src
+        self.tree = ast.parse(src)
+        self.tokens = None
+        function_def = self.tree.body[0]
         assert isinstance(function_def, ast.FunctionDef)
         graph = self._process_function(None, function_def).graph
         return graph
@@ -9,6 +9,7 @@ from .pipeline import (  # noqa
 from .standard import (  # noqa
     standard_resources,
     standard_pipeline,
+    standard_python_pipeline,
     standard_debug_pipeline,
     scalar_pipeline,
     scalar_debug_pipeline,
@@ -1,5 +1,6 @@
 """Tools to generate and configure Myia's operation pipeline."""
 
+from contextlib import nullcontext
 
 from ..utils import merge, Merge, NS, Partial, Partializable, \
     partition_keywords
@@ -240,23 +241,41 @@ class _PipelineSlice:
 
         Errors are put in the 'error' key of the result, and the step
         at which an error happened is put in the 'error_step' key.
+
+        If the pipeline has a `debug_info` resource, the steps are run
+        within its context, and it is asked to release debug information
+        once the last step of the pipeline has run successfully. Slices
+        that stop before the last step keep it, so that the pipeline can
+        be run one step at a time.
         """
-        for step in self.pipeline._seq[self.slice]:
-            if 'error' in args:
-                break
-            if step.active:
-                valid_args, rest = partition_keywords(step.step, args)
-                try:
-                    results = step.step(**valid_args)
-                    if not isinstance(results, dict) and len(valid_args) == 1:
-                        field_name, = valid_args.keys()
-                        results = {field_name: results}
-                    args = {**args, **results}
-                except Exception as e:
-                    args['error'] = e
-                    args['error_step'] = step
+        debug_info = getattr(self.pipeline.resources, 'debug_info', None)
+        with debug_info or nullcontext():
+            for step in self.pipeline._seq[self.slice]:
+                if 'error' in args:
+                    break
+                if step.active:
+                    valid_args, rest = partition_keywords(step.step, args)
+                    try:
+                        results = step.step(**valid_args)
+                        if not isinstance(results, dict) \
+                                and len(valid_args) == 1:
+                            field_name, = valid_args.keys()
+                            results = {field_name: results}
+                        args = {**args, **results}
+                    except Exception as e:
+                        args['error'] = e
+                        args['error_step'] = step
+        if debug_info is not None and 'error' not in args \
+                and self.includes_last_step():
+            debug_info.release()
         return args
 
+    def includes_last_step(self):
+        """Whether the slice runs the last step of the pipeline."""
+        stop = self.slice.stop
+        nsteps = len(self.pipeline._seq)
+        return stop is None or stop >= nsteps
+
     def __call__(self, **args):
         results = self.run_and_catch(**args)
         if 'error' in results:
@@ -7,6 +7,7 @@ from types import FunctionType
 
 from .. import dtype, operations, parser, composite as C
 from ..infer import InferenceEngine, ANYTHING
+from ..info import StripDebugInfo, strip_debug_info
 from ..ir import Graph, clone
 from ..prim import ops as P
 from ..specialize import TypeSpecializer
@@ -417,3 +418,40 @@ class InferenceResource(PipelineResource):
         """Perform inference and specialization."""
         _, context = self.infer(graph, argspec, outspec, clear=True)
         return self.specialize(graph, context)
+
+
+class DebugInfoResource(PipelineResource):
+    """Controls how much debug information the pipeline keeps.
+
+    Attributes:
+        strip: If True, debug relations are not propagated while the
+            pipeline runs (see `StripDebugInfo`), and the debug references
+            of the graphs and nodes that remain in the manager are dropped
+            once it is done. This reduces memory usage, but labels and
+            error messages will be less informative.
+
+    """
+
+    def __init__(self, pipeline_init, strip):
+        """Initialize a DebugInfoResource."""
+        super().__init__(pipeline_init)
+        self.strip = strip
+        self._strip_context = StripDebugInfo()
+
+    def __enter__(self):
+        if self.strip:
+            self._strip_context.__enter__()
+
+    def __exit__(self, type, value, tb):
+        if self.strip:
+            self._strip_context.__exit__(type, value, tb)
+
+    def release(self):
+        """Drop debug references in the manager, if strip is True."""
+        if not self.strip:
+            return
+        mng = self.resources.manager
+        for g in mng.graphs:
+            strip_debug_info(g.debug)
+        for node in mng.all_nodes:
+            strip_debug_info(node.debug)
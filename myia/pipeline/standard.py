@@ -1,8 +1,9 @@
 """Pre-made pipelines."""
 
 
-from ..compile import step_wrap_primitives, step_compile, step_link, \
-    step_export
+from ..compile.transform import step_wrap_primitives, step_compile, \
+    step_link, step_export
+from ..compile.pycode import step_python_export
 from ..infer import Context
 from ..ir import GraphManager
 from ..prim import py_implementations
@@ -11,7 +12,7 @@ from ..prim.type_inferrers import TypeTrack, type_inferrer_constructors
 from ..prim.shape_inferrers import ShapeTrack, shape_inferrer_constructors
 from ..pipeline.resources import scalar_object_map, standard_object_map, \
     standard_method_map, default_convert, ConverterResource, \
-    InferenceResource
+    InferenceResource, DebugInfoResource
 
 from . import steps
 from .pipeline import PipelineDefinition
@@ -42,6 +43,9 @@ standard_resources = dict(
         tied_tracks={},
         context_class=Context,
         erase_value=True,
+    ),
+    debug_info=DebugInfoResource.partial(
+        strip=False
     )
 )
 
@@ -73,6 +77,25 @@ standard_pipeline = PipelineDefinition(
 )
 
 
+standard_python_pipeline = PipelineDefinition(
+    resources=standard_resources,
+    steps=dict(
+        parse=steps.step_parse,
+        resolve=steps.step_resolve,
+        infer=steps.step_infer,
+        specialize=steps.step_specialize,
+        erase_class=steps.step_erase_class,
+        opt=steps.step_opt,
+        erase_tuple=steps.step_erase_tuple,
+        opt2=steps.step_opt2,
+        cconv=steps.step_cconv,
+        validate=steps.step_validate,
+        export=step_python_export,
+        wrap=steps.step_wrap,
+    )
+)
+
+
 standard_debug_pipeline = PipelineDefinition(
     resources=standard_resources,
     steps=dict(
@@ -14,7 +14,7 @@ from ..opt import PatternEquilibriumOptimizer, lib as optlib, CSE, \
 from ..prim import vm_implementations
 from ..utils import overload, flatten
 from ..validate import validate, whitelist as default_whitelist, \
-    validate_type as default_validate_type
+    validate_type as default_validate_type, ValidationError
 from ..vm import VM
 
 from .pipeline import pipeline_function, PipelineStep
@@ -211,6 +211,9 @@ step_debug_opt = Optimizer.partial(
         grad=[
             optlib.expand_J,
         ],
+        jvp=[
+            optlib.expand_jvp,
+        ],
         renormalize='renormalize',
         cse=CSE.partial(report_changes=False),
         jelim=optlib.JElim.partial(),
@@ -248,8 +251,12 @@ step_opt = Optimizer.partial(
             optlib.multiply_by_zero_r,
             optlib.add_zero_l,
             optlib.add_zero_r,
+            optlib.add_zeros_like_l,
+            optlib.add_zeros_like_r,
 
             # Array simplifications
+            optlib.add_zero_array_l,
+            optlib.add_zero_array_r,
             optlib.elim_distribute,
             optlib.elim_array_reduce,
             optlib.merge_transposes,
@@ -281,6 +288,9 @@ step_opt = Optimizer.partial(
         grad=[
             optlib.expand_J,
         ],
+        jvp=[
+            optlib.expand_jvp,
+        ],
         renormalize='renormalize',
         cse=CSE.partial(report_changes=False),
         jelim=optlib.JElim.partial(),
@@ -348,21 +358,47 @@ class Validator(PipelineStep):
     def __init__(self,
                  pipeline_init,
                  whitelist=default_whitelist,
-                 validate_type=default_validate_type):
-        """Initialize a Validator."""
+                 validate_type=default_validate_type,
+                 renormalize=True):
+        """Initialize a Validator.
+
+        Arguments:
+            pipeline_init: Provided by the pipeline.
+            whitelist: The primitives allowed in the graph.
+            validate_type: The function to validate each type with.
+            renormalize: Whether to infer and specialize the graph again
+                before validating it. This makes sure that the types are up
+                to date with the optimizations. If it is False, the types
+                set by the previous steps are validated as they are, and
+                the graph is only inferred again if that fails, e.g.
+                because an optimization created nodes that were never
+                inferred. This saves time in trusted builds whose steps
+                keep the types up to date.
+        """
         super().__init__(pipeline_init)
         self.whitelist = whitelist
         self.validate_type = validate_type
+        self.renormalize = renormalize
 
     def step(self, graph, argspec=None, outspec=None):
         """Validate the graph."""
+        if not self.renormalize:
+            try:
+                self._validate(graph)
+                return {'graph': graph}
+            except ValidationError:
+                pass
         graph = self.resources.inferrer.renormalize(
             graph, argspec, outspec
         )
+        self._validate(graph)
+        return {'graph': graph}
+
+    def _validate(self, graph):
         validate(graph,
                  whitelist=self.whitelist,
-                 validate_type=self.validate_type)
-        return {'graph': graph}
+                 validate_type=self.validate_type,
+                 manager=self.resources.manager)
 
 
 step_validate = Validator.partial()
@@ -513,6 +549,29 @@ def convert_result(res, orig_t, vm_t):
     return _convert_result[vm_t](res, orig_t, vm_t)
 
 
+class WrappedOutput:
+    """Call a compiled function with Python arguments.
+
+    The arguments are converted to the format expected by the VM, and the
+    result is converted back. Unlike a closure, this can be pickled as long
+    as the wrapped function can.
+    """
+
+    def __init__(self, fn, orig_arg_t, orig_out_t, vm_out_t):
+        """Initialize a WrappedOutput."""
+        self.fn = fn
+        self.orig_arg_t = orig_arg_t
+        self.orig_out_t = orig_out_t
+        self.vm_out_t = vm_out_t
+
+    def __call__(self, *args):
+        """Convert the arguments, call the function, convert the result."""
+        args = tuple(flatten(convert_arg(arg, ot) for arg, ot in
+                             zip(args, self.orig_arg_t)))
+        res = self.fn(*args)
+        return convert_result(res, self.orig_out_t, self.vm_out_t)
+
+
 @pipeline_function
 def step_wrap(self,
               graph,
@@ -528,17 +587,10 @@ def step_wrap(self,
             raise AssertionError(
                 'OutputWrapper step requires the erase_class/tuple steps'
             )
-        fn = output
         orig_arg_t = [arg['type'] for arg in orig_argspec or argspec]
         orig_out_t = (orig_outspec or outspec)['type']
         vm_out_t = graph.type.retval
-
-        def wrapped(*args):
-            args = tuple(flatten(convert_arg(arg, ot) for arg, ot in
-                                 zip(args, orig_arg_t)))
-            res = fn(*args)
-            res = convert_result(res, orig_out_t, vm_out_t)
-            return res
+        wrapped = WrappedOutput(output, orig_arg_t, orig_out_t, vm_out_t)
         return {'output': wrapped}
 
 
@@ -4,6 +4,8 @@ Each primitive is associated to an augmented function, which returns a pair of
 the (augmented) original primitive's output and a backpropagator function.
 """
 
+from collections.abc import ItemsView, KeysView, ValuesView
+
 from ..composite import zeros_like
 from ..debug.label import short_labeler, short_relation_symbols as syms
 from ..info import NamedDebugInfo, About
@@ -83,29 +85,92 @@ def bprop_to_augm(prim, fn):
     return clone(outer)
 
 
-augmented_graphs = Registry()
+def augm_from_fprop(prim, fn):
+    """Given a function for the augmented primitive, make its graph."""
+    g = parse(fn)
+    for g2 in manage(g, weak=True).graphs:
+        name = short_labeler.name(g2)
+        name = name.replace('__fprop__', syms['grad_fprop'])
+        g2.debug.name = name.replace('__bprop__', syms['grad_bprop'])
+        g2.flags.update(_flags)
+    g.transforms['primal'] = prim
+    return g
+
+
+class AugmentedGraphRegistry(Registry):
+    """Associates primitives to their augmented graphs.
+
+    Graphs that are generated from Python functions are only parsed the
+    first time they are requested, and then cached in the registry. Until
+    then, only the function to generate them from is stored.
+    """
+
+    def __init__(self):
+        """Initialize an AugmentedGraphRegistry."""
+        super().__init__()
+        self._builders = {}
+
+    def register_builder(self, prim, builder, fn):
+        """Register `builder(prim, fn)` to make prim's augmented graph."""
+        self.pop(prim, None)
+        self._builders[prim] = (builder, fn)
+
+    def __missing__(self, prim):
+        builder, fn = self._builders[prim]
+        # The builder is only dropped once the graph was built, so that a
+        # failed build can be retried and still reports its own error
+        g = builder(prim, fn)
+        self[prim] = g
+        return g
+
+    def __setitem__(self, prim, g):
+        self._builders.pop(prim, None)
+        super().__setitem__(prim, g)
+
+    def __contains__(self, prim):
+        return super().__contains__(prim) or prim in self._builders
+
+    def __iter__(self):
+        yield from super().__iter__()
+        yield from self._builders
+
+    def __len__(self):
+        return super().__len__() + len(self._builders)
+
+    def get(self, prim, default=None):
+        """Return the graph for prim, or default if there is none."""
+        return self[prim] if prim in self else default
+
+    def keys(self):
+        """Return the primitives, whether their graph was built or not."""
+        return KeysView(self)
+
+    def values(self):
+        """Return the graphs, building them if needed."""
+        return ValuesView(self)
+
+    def items(self):
+        """Return the (primitive, graph) pairs, building graphs if needed."""
+        return ItemsView(self)
+
+
+augmented_graphs = AugmentedGraphRegistry()
 register = augmented_graphs.register
 
 
 def register_bprop(prim):
     """Register an augmented function for prim, given a backpropagator."""
     def deco(fn):
-        g = bprop_to_augm(prim, fn)
-        return register(prim)(g)
+        augmented_graphs.register_builder(prim, bprop_to_augm, fn)
+        return fn
     return deco
 
 
 def register_augm(prim):
     """Register an augmented function for prim."""
     def deco(fn):
-        g = parse(fn)
-        for g2 in manage(g, weak=True).graphs:
-            name = short_labeler.name(g2)
-            name = name.replace('__fprop__', syms['grad_fprop'])
-            g2.debug.name = name.replace('__bprop__', syms['grad_bprop'])
-            g2.flags.update(_flags)
-        g.transforms['primal'] = prim
-        return register(prim)(g)
+        augmented_graphs.register_builder(prim, augm_from_fprop, fn)
+        return fn
     return deco
 
 
@@ -0,0 +1,346 @@
+"""Implementations of the primitives' forward derivatives.
+
+Each primitive is associated to a graph that takes a (primal, tangent) pair
+for each of the primitive's arguments, and returns the pair of the
+primitive's output and of its tangent.
+"""
+
+from ..composite import zeros_like
+from ..info import NamedDebugInfo, About
+from ..ir import Graph, clone, MetaGraph
+from ..pipeline import standard_pipeline
+
+from . import ops as primops
+from .grad_implementations import AugmentedGraphRegistry
+from .py_implementations import \
+    scalar_add, scalar_mul, scalar_div, scalar_sub, scalar_usub, \
+    scalar_eq, scalar_log, scalar_pow, scalar_sin, scalar_cos, switch, \
+    transpose, array_to_scalar, scalar_to_array, distribute, array_map, \
+    array_reduce, dot, reshape, scalar_cast, getitem
+
+
+parse = standard_pipeline \
+    .select('parse') \
+    .make_transformer('input', 'graph')
+
+
+_flags = {
+    'flatten_inference': True,
+}
+
+
+def jvp_to_graph(prim, fn):
+    """Given a function for the tangent, make the forward graph.
+
+    fn takes the primitive's arguments, its output and then the tangents
+    of its arguments, and returns the tangent of the output:
+
+        def jvp_prim(x, y, out, dx, dy):
+            return ...
+
+    The resulting graph is equivalent to:
+
+        def jvp_prim((x, dx), (y, dy)):
+            out = prim(x, y)
+            return out, jvp_prim(x, y, out, dx, dy)
+    """
+    info = NamedDebugInfo(prim=prim, name=prim.name)
+
+    rule = clone(parse(fn))
+    rule.flags.update(_flags)
+    rule.debug.name = None
+    rule.debug.about = About(info, 'jvp_tangent')  # type: ignore
+    nargs = (len(rule.parameters) - 1) // 2
+
+    with About(info, 'jvp'):
+        g = Graph()
+    g.flags.update(_flags)
+    g.transforms['primal'] = prim
+
+    pairs = [g.add_parameter() for _ in range(nargs)]
+    args = [g.apply(primops.tuple_getitem, p, 0) for p in pairs]
+    dargs = [g.apply(primops.tuple_getitem, p, 1) for p in pairs]
+    out = g.apply(prim, *args)
+    dout = g.apply(rule, *args, out, *dargs)
+    g.output = g.apply(primops.make_tuple, out, dout)
+    return clone(g)
+
+
+jvp_graphs = AugmentedGraphRegistry()
+register = jvp_graphs.register
+
+
+def register_jvp(prim):
+    """Register the tangent function for prim."""
+    def deco(fn):
+        jvp_graphs.register_builder(prim, jvp_to_graph, fn)
+        return fn
+    return deco
+
+
+@register_jvp(primops.scalar_add)
+def jvp_scalar_add(x, y, out, dx, dy):
+    """Tangent for primitive `scalar_add`."""
+    return scalar_add(dx, dy)
+
+
+@register_jvp(primops.scalar_sub)
+def jvp_scalar_sub(x, y, out, dx, dy):
+    """Tangent for primitive `scalar_sub`."""
+    return scalar_sub(dx, dy)
+
+
+@register_jvp(primops.scalar_mul)
+def jvp_scalar_mul(x, y, out, dx, dy):
+    """Tangent for primitive `scalar_mul`."""
+    return scalar_add(scalar_mul(dx, y), scalar_mul(x, dy))
+
+
+@register_jvp(primops.scalar_div)
+def jvp_scalar_div(x, y, out, dx, dy):
+    """Tangent for primitive `scalar_div`."""
+    return scalar_div(scalar_sub(dx, scalar_mul(out, dy)), y)
+
+
+@register_jvp(primops.scalar_pow)
+def jvp_scalar_pow(x, y, out, dx, dy):
+    """Tangent for primitive `scalar_pow`."""
+    dbase = scalar_mul(dx, scalar_mul(y, scalar_pow(x, scalar_sub(y, 1))))
+    # The logarithm is only taken when the exponent varies, so that
+    # x ** c remains differentiable for x <= 0.
+    if scalar_eq(dy, 0):
+        return dbase
+    else:
+        return scalar_add(dbase, scalar_mul(dy, scalar_mul(scalar_log(x),
+                                                           out)))
+
+
+@register_jvp(primops.scalar_exp)
+def jvp_scalar_exp(x, out, dx):
+    """Tangent for primitive `scalar_exp`."""
+    return scalar_mul(dx, out)
+
+
+@register_jvp(primops.scalar_log)
+def jvp_scalar_log(x, out, dx):
+    """Tangent for primitive `scalar_log`."""
+    return scalar_div(dx, x)
+
+
+@register_jvp(primops.scalar_sin)
+def jvp_scalar_sin(x, out, dx):
+    """Tangent for primitive `scalar_sin`."""
+    return scalar_mul(dx, scalar_cos(x))
+
+
+@register_jvp(primops.scalar_cos)
+def jvp_scalar_cos(x, out, dx):
+    """Tangent for primitive `scalar_cos`."""
+    return scalar_usub(scalar_mul(dx, scalar_sin(x)))
+
+
+@register_jvp(primops.scalar_tan)
+def jvp_scalar_tan(x, out, dx):
+    """Tangent for primitive `scalar_tan`."""
+    return scalar_mul(dx, scalar_add(1, scalar_mul(out, out)))
+
+
+@register_jvp(primops.scalar_uadd)
+def jvp_scalar_uadd(x, out, dx):
+    """Tangent for primitive `scalar_uadd`."""
+    return dx
+
+
+@register_jvp(primops.scalar_usub)
+def jvp_scalar_usub(x, out, dx):
+    """Tangent for primitive `scalar_usub`."""
+    return scalar_usub(dx)
+
+
+@register_jvp(primops.scalar_cast)
+def jvp_scalar_cast(x, t, out, dx, dt):
+    """Tangent for primitive `scalar_cast`."""
+    return scalar_cast(dx, t)
+
+
+@register_jvp(primops.typeof)
+def jvp_typeof(x, out, dx):
+    """Tangent for primitive `typeof`."""
+    return out
+
+
+class ZeroJVP(MetaGraph):
+    """Generate the forward graph for a primitive that is not differentiable.
+
+    The tangent of the primitive's output is always zero.
+    """
+
+    def __init__(self, prim):
+        """Initialize a ZeroJVP for prim."""
+        super().__init__(f'{prim.name}_jvp')
+        self.prim = prim
+
+    def specialize_from_types(self, types):
+        """Generate the forward graph."""
+        g = Graph()
+        pairs = [g.add_parameter() for t in types]
+        args = [g.apply(primops.tuple_getitem, p, 0) for p in pairs]
+        out = g.apply(self.prim, *args)
+        g.output = g.apply(primops.make_tuple, out, g.apply(zeros_like, out))
+        g.transforms['primal'] = self.prim
+        g.flags.update(_flags)
+        return g
+
+
+for _prim in (primops.scalar_trunc, primops.scalar_floor,
+              primops.scalar_eq, primops.scalar_lt, primops.scalar_gt,
+              primops.scalar_ne, primops.scalar_le, primops.scalar_ge,
+              primops.bool_not, primops.bool_and, primops.bool_or,
+              primops.bool_eq, primops.hastype, primops.tuple_len,
+              primops.list_len, primops.array_len, primops.shape,
+              primops.broadcast_shape, primops.invert_permutation):
+    register(_prim)(ZeroJVP(_prim))
+
+
+@register_jvp(primops.identity)
+def jvp_identity(x, out, dx):
+    """Tangent for primitive `identity`."""
+    return dx
+
+
+@register_jvp(primops.tuple_getitem)
+def jvp_tuple_getitem(data, idx, out, ddata, didx):
+    """Tangent for primitive `tuple_getitem`."""
+    return getitem(ddata, idx)
+
+
+@register_jvp(primops.switch)
+def jvp_switch(cond, tb, fb, out, dcond, dtb, dfb):
+    """Tangent for primitive `switch`."""
+    return switch(cond, dtb, dfb)
+
+
+@register_jvp(primops.scalar_to_array)
+def jvp_scalar_to_array(x, out, dx):
+    """Tangent for primitive `scalar_to_array`."""
+    return scalar_to_array(dx)
+
+
+@register_jvp(primops.array_to_scalar)
+def jvp_array_to_scalar(x, out, dx):
+    """Tangent for primitive `array_to_scalar`."""
+    return array_to_scalar(dx)
+
+
+@register_jvp(primops.dot)
+def jvp_dot(x, y, out, dx, dy):
+    """Tangent for primitive `dot`."""
+    return array_map(scalar_add, dot(dx, y), dot(x, dy))
+
+
+@register_jvp(primops.reshape)
+def jvp_reshape(xs, shp, out, dxs, dshp):
+    """Tangent for primitive `reshape`."""
+    return reshape(dxs, shp)
+
+
+@register_jvp(primops.transpose)
+def jvp_transpose(xs, perm, out, dxs, dperm):
+    """Tangent for primitive `transpose`."""
+    return transpose(dxs, perm)
+
+
+@register_jvp(primops.distribute)
+def jvp_distribute(arr, shp, out, darr, dshp):
+    """Tangent for primitive `distribute`."""
+    return distribute(darr, shp)
+
+
+class MakeTupleJVP(MetaGraph):
+    """Generate the forward graph for make_tuple."""
+
+    def specialize_from_types(self, types):
+        """Generate the forward graph."""
+        g = Graph()
+        pairs = [g.add_parameter() for t in types]
+        args = [g.apply(primops.tuple_getitem, p, 0) for p in pairs]
+        dargs = [g.apply(primops.tuple_getitem, p, 1) for p in pairs]
+        g.output = g.apply(primops.make_tuple,
+                           g.apply(primops.make_tuple, *args),
+                           g.apply(primops.make_tuple, *dargs))
+        g.transforms['primal'] = primops.make_tuple
+        g.flags.update(_flags)
+        return g
+
+
+register(primops.make_tuple)(MakeTupleJVP(name='make_tuple_jvp'))
+
+
+class ArrayMapJVP(MetaGraph):
+    """Generate the forward graph for array_map.
+
+    Sketch of the transform:
+
+        array_map(f, xs, ys, ...) =>
+
+        def jvp_array_map((f, jvp_f), (xs, dxs), (ys, dys), ...):
+            out = array_map(f, xs, ys, ...)
+            f_dout = lambda x, y, ..., dx, dy, ...: jvp_f((x, dx),
+                                                          (y, dy), ...)[1]
+            dout = array_map(f_dout, xs, ys, ..., dxs, dys, ...)
+            return out, dout
+    """
+
+    def specialize_from_types(self, types):
+        """Generate the forward graph."""
+        g = Graph()
+        nargs = len(types) - 1
+        pairs = [g.add_parameter() for _ in range(nargs + 1)]
+        f, *args = [g.apply(primops.tuple_getitem, p, 0) for p in pairs]
+        jf, *dargs = [g.apply(primops.tuple_getitem, p, 1) for p in pairs]
+        out = g.apply(primops.array_map, f, *args)
+
+        func = Graph()
+        fargs = [func.add_parameter() for _ in range(nargs)]
+        fdargs = [func.add_parameter() for _ in range(nargs)]
+        fpairs = [func.apply(primops.make_tuple, x, dx)
+                  for x, dx in zip(fargs, fdargs)]
+        call = func.apply(jf, *fpairs)
+        func.output = func.apply(primops.tuple_getitem, call, 1)
+        dout = g.apply(primops.array_map, func, *args, *dargs)
+
+        g.output = g.apply(primops.make_tuple, out, dout)
+        g.transforms['primal'] = primops.array_map
+
+        func.flags.update(_flags)
+        g.flags.update(_flags)
+
+        return g
+
+
+register(primops.array_map)(ArrayMapJVP(name='array_map_jvp'))
+
+
+def jvp_sum(fn, xs, shp, out, dfn, dxs, dshp):  # pragma: no cover
+    """Tangent for sum(xs) = array_reduce(scalar_add, xs, shp)."""
+    return array_reduce(scalar_add, dxs, shp)
+
+
+class ArrayReduceJVP(MetaGraph):
+    """Generate the forward graph for array_reduce.
+
+    For the time being, the forward derivative of array_reduce is only
+    supported over the `scalar_add` operation (sum, basically).
+    """
+
+    def specialize_from_types(self, types):
+        """Generate the forward graph."""
+        fpair, arrpair, shppair = types
+        jf = fpair.elements[1]
+        assert jf._graph.transforms['primal'] is primops.scalar_add
+        return jvp_to_graph(primops.array_reduce, jvp_sum)
+
+
+register(primops.array_reduce)(
+    ArrayReduceJVP(name='array_reduce_jvp')
+)
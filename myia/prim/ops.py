@@ -125,6 +125,7 @@ resolve = Primitive('resolve')
 partial = Primitive('partial')
 J = Primitive('J')
 Jinv = Primitive('Jinv')
+JVP = Primitive('JVP')
 embed = Primitive('embed')
 env_setitem = Primitive('env_setitem')
 env_getitem = Primitive('env_getitem')
@@ -656,6 +656,19 @@ def _Jinv_vm(vm, x):
         return x
 
 
+@py_register(primops.JVP)
+def JVP(x):
+    """Implement `JVP`."""
+    raise NotImplementedError()
+
+
+@vm_register(primops.JVP)
+def _JVP_vm(vm, x):
+    """Implement `JVP`."""
+    from ..jvp import JVP as _JVP
+    return _JVP(x, vm.manager)
+
+
 @register(primops.embed)
 def embed(node):
     """Placeholder for the implementation of `embed`."""
@@ -13,7 +13,7 @@ from ..infer import ANYTHING, GraphInferrer, register_inferrer, \
     PartialInferrer, Track, MyiaShapeError, Inferrer,  MetaGraphInferrer, \
     InferenceError, MyiaTypeError, TransformedReference, MultiInferrer, \
     DummyInferrer, Context
-from ..infer.jinf import JInferrer
+from ..infer.jinf import JInferrer, JVPInferrer
 from ..ir import Graph, MetaGraph
 
 from . import ops as P
@@ -34,6 +34,11 @@ def _stag_shape(self, shp: Inferrer):
     return NOSHAPE
 
 
+@shape_cloner.variant
+def _ttag_shape(self, shp: Inferrer):
+    return JVPInferrer(shp, TupleShape)
+
+
 class ShapeTrack(Track):
     """Infer the shape of a constant."""
 
@@ -103,6 +108,10 @@ class ShapeTrack(Track):
         """Return type for sensitivity of x given shape(x)."""
         return _stag_shape(t)
 
+    def ttag(self, shp):
+        """Return shape for the tangent of x given shape(x)."""
+        return _ttag_shape(shp)
+
 
 shape_inferrer = partial(register_inferrer,
                          constructors=shape_inferrer_constructors)
@@ -479,6 +488,16 @@ async def infer_shape_Jinv(track, x):
         return shp
 
 
+@shape_inferrer(P.JVP, nargs=1)
+async def infer_shape_JVP(track, fn):
+    """Infer the return shape of JVP."""
+    shp = await fn.get_shallow('shape')
+    if isinstance(shp, Inferrer):
+        return track.ttag(shp)
+    else:
+        return NOSHAPE
+
+
 @shape_inferrer(P.embed, nargs=1)
 async def infer_shape_embed(track, x):
     """Infer the return shape of embed."""
@@ -11,7 +11,7 @@ from ..infer import ANYTHING, GraphInferrer, PartialInferrer, \
     MyiaTypeError, register_inferrer, Track, Inferrer, MetaGraphInferrer, \
     ExplicitInferrer, VOID, TransformedReference, MultiInferrer, \
     DummyInferrer, Context
-from ..infer.jinf import JInferrer
+from ..infer.jinf import JInferrer, JVPInferrer
 from ..ir import Graph, MetaGraph
 from ..utils import Namespace, Var, RestrictedVar, is_dataclass_type
 
@@ -53,6 +53,11 @@ def _stag_type(self, t: Inferrer):
     return EnvType
 
 
+@type_cloner.variant
+def _ttag_type(self, t: Inferrer):
+    return JVPInferrer(t, lambda elems: Tuple[elems])
+
+
 class TypeTrack(Track):
     """Infer the type of a constant.
 
@@ -129,6 +134,10 @@ class TypeTrack(Track):
         """Return type for sensitivity of x given typeof(x)."""
         return _stag_type(t)
 
+    def ttag(self, t):
+        """Return type for the tangent of x given typeof(x)."""
+        return _ttag_type(t)
+
 
 ########################
 # Default constructors #
@@ -615,6 +624,16 @@ async def infer_type_Jinv(track, x):
                             refs=[x])
 
 
+@type_inferrer(P.JVP, nargs=1)
+async def infer_type_JVP(track, fn):
+    """Infer the return type of JVP."""
+    fn_t = await fn.get_shallow('type')
+    if not isinstance(fn_t, Inferrer):
+        raise MyiaTypeError(f'JVP expects a function, not {fn_t}',
+                            refs=[fn])
+    return track.ttag(fn_t)
+
+
 @type_inferrer(P.embed, nargs=1)
 async def infer_type_embed(track, x):
     """Infer the return type of embed."""
@@ -2,7 +2,7 @@
 
 
 import asyncio
-
+import numpy
 from functools import partial
 from operator import getitem
 
@@ -72,6 +72,10 @@ class PrimitiveValueInferrer(Inferrer):
             args_unwrapped = [unwrap(arg) for arg in args]
             try:
                 v = self.impl(*args_unwrapped)
+                if isinstance(v, numpy.bool_):
+                    # Comparisons between NumPy scalars return NumPy
+                    # booleans, but conditions must be True or False.
+                    v = bool(v)
                 try:
                     # Throw away non-hashable results
                     # Use a whitelist of types instead?
@@ -335,6 +339,12 @@ async def infer_value_Jinv(track, x):
     return await x.get_raw('value')
 
 
+@value_inferrer(P.JVP, nargs=1)
+async def infer_value_JVP(track, fn):
+    """Infer the return value of JVP."""
+    return ANYTHING
+
+
 @value_inferrer(P.embed, nargs=1)
 async def infer_value_embed(track, x):
     """Infer the return value of embed."""
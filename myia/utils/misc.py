@@ -4,6 +4,7 @@ import builtins
 import inspect
 import itertools
 import sys
+import threading
 import numpy as np
 from typing import Any, Dict, List, TypeVar
 from colorama import AnsiToWin32
@@ -599,40 +600,100 @@ def _add(self, x: object, y):
     return x + y
 
 
+_MISSING = Named('MISSING')
+
+
 class EnvInstance:
     """Environment mapping keys to values.
 
     Keys are SymbolicKeyInstances, which represent nodes in the graph along
     with inferred properties.
+
+    EnvInstances are persistent: `set` and `add` return new environments and
+    leave the original untouched. In order to avoid copying the contents on
+    every `set`, all the versions derived from an environment share the same
+    dictionary, which holds the contents of the version that was accessed
+    last. Every other version stores the difference with the next version
+    towards that one, and the dictionary is moved over to a version when it
+    is accessed ("rerooting"). Since environments are typically updated
+    linearly during backpropagation, `set` runs in constant time.
+
+    Since even reading an environment reroots the dictionary, all the
+    versions that share it also share a lock, which is held while the
+    dictionary is accessed, so that they can be used from several threads.
     """
 
     def __init__(self, _contents={}):
         """Initialize a EnvType."""
-        self._contents = dict(_contents)
+        self._data = dict(_contents)
+        self._diff = None
+        self._lock = threading.Lock()
+
+    def _reroot(self):
+        """Move the shared dictionary to this version and return it.
+
+        The lock must be held by the caller.
+        """
+        path = []
+        env = self
+        while env._diff is not None:
+            path.append(env)
+            env = env._diff[2]
+        for env in reversed(path):
+            key, value, nxt = env._diff
+            data = nxt._data
+            old = data.get(key, _MISSING)
+            if value is _MISSING:
+                del data[key]
+            else:
+                data[key] = value
+            nxt._data, nxt._diff = None, (key, old, env)
+            env._data, env._diff = data, None
+        return self._data
+
+    @property
+    def _contents(self):
+        with self._lock:
+            return dict(self._reroot())
 
     def get(self, key, default):
         """Get the sensitivity list for the given key."""
-        return self._contents.get(key, default)
+        with self._lock:
+            return self._reroot().get(key, default)
 
     def set(self, key, value):
         """Set a value for the given key."""
-        rval = EnvInstance(self._contents)
-        rval._contents[key] = value
-        return rval
+        with self._lock:
+            data = self._reroot()
+            if not data:
+                # This also keeps newenv from referencing everything derived
+                # from it.
+                return EnvInstance({key: value})
+            rval = EnvInstance.__new__(EnvInstance)
+            self._data, self._diff = None, (key, data.get(key, _MISSING), rval)
+            data[key] = value
+            rval._data, rval._diff = data, None
+            rval._lock = self._lock
+            return rval
 
     def add(self, other):
         """Add two EnvInstances."""
+        if len(other) == 0:
+            return self
+        if len(self) == 0:
+            return other
         rval = EnvInstance(self._contents)
         for k, v in other._contents.items():
-            v0 = rval._contents.get(k)
+            v0 = rval._data.get(k)
             if v0 is not None:
-                rval._contents[k] = _add(v0, v)
+                rval._data[k] = _add(v0, v)
             else:
-                rval._contents[k] = v
+                rval._data[k] = v
         return rval
 
     def __len__(self):
-        return len(self._contents)
+        with self._lock:
+            return len(self._reroot())
 
 
 newenv = EnvInstance()
@@ -2,13 +2,24 @@
 
 
 class OrderedSet:
-    """Like set(), but ordered."""
+    """Like set(), but ordered.
 
-    def __init__(self, elems=[]):
+    The elements are stored as the keys of a dict, which preserves insertion
+    order. Bulk operations work directly on the dict (or on its key views)
+    rather than adding or removing elements one at a time.
+    """
+
+    __slots__ = ('_d', '__weakref__')
+
+    def __init__(self, elems=()):
         """Create an OrderedSet."""
-        self._d = dict()
-        for e in elems:
-            self.add(e)
+        self._d = dict.fromkeys(elems)
+
+    @classmethod
+    def _from_dict(cls, d):
+        res = cls.__new__(cls)
+        res._d = d
+        return res
 
     def add(self, e):
         """Add an element."""
@@ -27,9 +38,10 @@ class OrderedSet:
 
     def copy(self):
         """Return a shallow copy."""
-        res = OrderedSet.__new__(OrderedSet)
-        res._d = self._d.copy()
-        return res
+        return self._from_dict(self._d.copy())
+
+    def __contains__(self, e):
+        return e in self._d
 
     def __len__(self):
         return len(self._d)
@@ -57,11 +69,19 @@ class OrderedSet:
 
     def isdisjoint(self, other):
         """Return True if there are no elements in common."""
-        return not any(e in other for e in self)
+        if isinstance(other, OrderedSet):
+            other = other._d
+        if isinstance(other, (set, frozenset, dict)) \
+                and len(other) < len(self._d):
+            d = self._d
+            return not any(e in d for e in other)
+        return not any(e in other for e in self._d)
 
     def issubset(self, other):
         """Test whether every element in the set is in `other`."""
-        return all(e in other for e in self)
+        if isinstance(other, OrderedSet):
+            return self._d.keys() <= other._d.keys()
+        return all(e in other for e in self._d)
 
     __le__ = issubset
 
@@ -70,7 +90,8 @@ class OrderedSet:
 
     def issuperset(self, other):
         """Test whether every element in `other` is in the set."""
-        return OrderedSet(other).issubset(self)
+        d = self._d
+        return all(e in d for e in other)
 
     __ge__ = issuperset
 
@@ -95,6 +116,14 @@ class OrderedSet:
 
     def difference(self, *others):
         """Return a new set with elements that are not in the others."""
+        if len(others) == 1:
+            other = others[0]
+            if isinstance(other, OrderedSet):
+                other = other._d
+            elif not isinstance(other, (set, frozenset, dict)):
+                other = set(other)
+            return self._from_dict({e: None for e in self._d
+                                    if e not in other})
         res = self.copy()
         res.difference_update(*others)
         return res
@@ -111,27 +140,50 @@ class OrderedSet:
 
     def update(self, *others):
         """Update the set, adding elements from all others."""
+        d = self._d
         for other in others:
-            for e in other:
-                self.add(e)
+            if isinstance(other, OrderedSet):
+                d.update(other._d)
+            else:
+                d.update(dict.fromkeys(other))
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
 
     def intersection_update(self, *others):
         """Update the set, keeping only elements found in it and all others."""
         for other in others:
-            for e in list(self):
-                if e not in other:
-                    self.discard(e)
+            if isinstance(other, OrderedSet):
+                other = other._d
+            self._d = {e: None for e in self._d if e in other}
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
 
     def difference_update(self, *others):
         """Update the set, removing elements found in others."""
+        pop = self._d.pop
         for other in others:
             for e in other:
-                self.discard(e)
+                pop(e, None)
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
 
     def symmetric_difference_update(self, other):
         """Update the set, keeping only the difference from both sets."""
+        d = self._d
+        if other is self:
+            other = list(d)
         for e in other:
-            if e in self:
-                self.remove(e)
+            if e in d:
+                del d[e]
             else:
-                self.add(e)
+                d[e] = None
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
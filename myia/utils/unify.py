@@ -292,10 +292,57 @@ def default_visit(value: dict, fn):
     return {fn(k): fn(v) for k, v in sorted(value.items())}
 
 
+# Unification collects the elements of lists and tuples directly, as long as
+# they are visited with this function.
+_visit_sequence = default_visit.map[tuple]
+
+
 class VisitError(Exception):
     """Report unvisitable object."""
 
 
+_MISSING = object()
+
+
+def _bind(equiv, var, value, trail):
+    """Bind var to value in equiv, recording the previous value in trail."""
+    if trail is not None:
+        trail.append((var, equiv.get(var, _MISSING)))
+    equiv[var] = value
+
+
+def _undo(equiv, trail):
+    """Undo all the bindings recorded in trail, and clear it."""
+    while trail:
+        var, old = trail.pop()
+        if old is _MISSING:
+            del equiv[var]
+        else:
+            equiv[var] = old
+
+
+def _find(v, equiv, trail):
+    """Return what v is transitively bound to in equiv.
+
+    When the bindings are not being recorded in a trail, the variables on
+    the way are rebound directly to the result, so that the next lookups
+    are shorter.
+    """
+    if not isinstance(v, Var) or v not in equiv:
+        return v
+    root = equiv[v]
+    if not isinstance(root, Var) or root not in equiv:
+        return root
+    path = [v]
+    while isinstance(root, Var) and root in equiv:
+        path.append(root)
+        root = equiv[root]
+    if trail is None:
+        for var in path[:-1]:
+            equiv[var] = root
+    return root
+
+
 class Unification:
     """Unification engine."""
 
@@ -369,20 +416,29 @@ class Unification:
         This is called as required from `unify_raw`, but can also be
         called directly.
         """
+        return self._unify_union(w, v, equiv, None)
+
+    def _unify_union(self, w, v, equiv, trail):
+        # Each alternative is tried directly on equiv, and its bindings are
+        # undone afterwards, using a trail of the previous values.
         ok: Dict[Any, EquivT] = dict()
+        alt_trail: List = []
         for vw in w.values:
-            equiv_copy = dict(equiv)
-            # try each of the possible alternatives
             try:
-                ok[vw] = self.unify_raw(vw, v, equiv_copy)
+                self._unify(vw, v, equiv, alt_trail)
             except UnificationError:
                 pass
+            else:
+                ok[vw] = {k: equiv[k] for k, old in alt_trail
+                          if old is _MISSING}
+            _undo(equiv, alt_trail)
         if len(ok) == 0:
             # if none match we fail
             raise UnificationError("All values unmatched for UnionVar")
         elif len(ok) == 1:
             # if there is a single match, we record it as the union value
-            equiv.update(ok.popitem()[1])
+            for k, value in ok.popitem()[1].items():
+                _bind(equiv, k, value, trail)
             return equiv
         else:
             # if there were multiple matches, we try to find the
@@ -393,9 +449,8 @@ class Unification:
             # those differences should at most be for a single variable.
 
             # get the set of keys in common between all matches
-            initial_keys = set(equiv.keys())
             ok_values = [v for v in ok.values()]
-            comm_keys = [set(en.keys()) - initial_keys for en in ok_values]
+            comm_keys = [set(en.keys()) for en in ok_values]
             common_ground = reduce(lambda x, v: x & v, comm_keys)
 
             # check if common keys have the same values
@@ -415,12 +470,33 @@ class Unification:
             assert not isinstance(diff, UnionVar)
 
             # lift the UnionVar
-            equiv[diff] = UnionVar(set(okv[diff] for okv in ok_values))
+            _bind(equiv, diff, UnionVar(set(okv[diff] for okv in ok_values)),
+                  trail)
             return equiv
 
     def _getvar(self, v):
         return getattr(v, '__var__', v)
 
+    def _elements(self, value):
+        """Return the list of the elements of value, for unification."""
+        getvar = self._getvar
+        if isinstance(value, Seq):
+            return list(value)
+        if type(value) in (list, tuple) \
+                and self.visitors.map[type(value)] is _visit_sequence:
+            return [getvar(x) for x in value]
+        values = []
+
+        def append(u):
+            values.append(getvar(u))
+            return u
+
+        try:
+            self.visit(append, value)
+        except VisitError:
+            raise UnificationError("Cannot visit elements")
+        return values
+
     def unify_raw(self, w, v, equiv: EquivT) -> EquivT:
         """'raw' interface for unification.
 
@@ -445,109 +521,109 @@ class Unification:
             described by `equiv` or this function might never return.
 
         """
-        w = self._getvar(w)
-        v = self._getvar(v)
-
-        while isinstance(w, Var) and w in equiv:
-            w = equiv[w]
-        while isinstance(v, Var) and v in equiv:
-            v = equiv[v]
-
-        if self.eq(w, v):
-            return equiv
-
-        if isinstance(w, UnionVar):
-            return self.unify_union(w, v, equiv)
-
-        if isinstance(v, UnionVar):
-            return self.unify_union(v, w, equiv)
-
-        if isinstance(v, Var) and isinstance(w, Var):
-            u = v.intersection(w)
-            if u is NotImplemented:
-                u = w.intersection(v)
-            if u is False:
-                raise UnificationError("Incompatible variables")
-            if u is not NotImplemented:
-                assert isinstance(u, Var)
-                if u is not v:
-                    equiv[v] = u
-                if u is not w:
-                    equiv[w] = u
-                return equiv
-
-        if isinstance(w, Var):
-            if w.matches(v):
-                equiv[w] = v
-                return equiv
-
-        if isinstance(v, Var):
-            if v.matches(w):
-                equiv[v] = w
-                return equiv
-
-        if type(v) != type(w):
-            raise UnificationError("Type match error")
-
-        if isinstance(v, Seq) and isinstance(w, Seq):
-            values_v = list(v)
-            values_w = list(w)
-        else:
-            def appender(l):
-                def fn(u):
-                    l.append(self._getvar(u))
-                    return u
-                return fn
-            try:
-                values_v = []
-                self.visit(appender(values_v), v)
-                values_w = []
-                self.visit(appender(values_w), w)
-            except VisitError:
-                raise UnificationError("Cannot visit elements")
-
-        sv = -1
-        sw = -1
-
-        for i, vv in enumerate(values_v):
-            if isinstance(vv, SVar):
-                if sv != -1:
-                    raise UnificationError("Multiple SVars in sequence")
-                sv = i
-
-        for i, vw in enumerate(values_w):
-            if isinstance(vw, SVar):
-                if sw != -1:
-                    raise UnificationError("Multiple SVars in sequence")
-                sw = i
-
-        if sv != -1 and sw != -1:
-            if len(values_v) == len(values_w) and sv == sw:
-                self.unify_raw(values_w[sw], values_v[sv], equiv)
-                values_v.pop(sv)
-                values_w.pop(sw)
-            else:
-                raise UnificationError("SVars in both sides of the match")
-
-        if sv != -1 and len(values_w) >= len(values_v) - 1:
-            wb = values_w[:sv]
-            diff = len(values_w) - len(values_v) + 1
-            wm = Seq(values_w[sv:sv+diff])
-            we = values_w[sv+diff:]
-            values_w = wb + [wm] + we
-
-        if sw != -1 and len(values_v) >= len(values_w) - 1:
-            vb = values_v[:sw]
-            diff = len(values_v) - len(values_w) + 1
-            vm = Seq(values_v[sw:sw+diff])
-            ve = values_v[sw+diff:]
-            values_v = vb + [vm] + ve
-
-        if len(values_w) != len(values_v):
-            raise UnificationError("Structures of differing size")
-
-        for wi, vi in zip(values_w, values_v):
-            equiv = self.unify_raw(wi, vi, equiv)
+        return self._unify(w, v, equiv, None)
+
+    def _unify(self, w, v, equiv, trail):
+        # equiv is used as a union-find structure: each variable points to
+        # the variable or value it was bound to. The pairs that remain to be
+        # unified are kept on a stack rather than processed recursively, so
+        # that deep terms do not exhaust the Python stack. If trail is not
+        # None, the previous value of every binding is appended to it, so
+        # that they can be undone with _undo.
+        getvar = self._getvar
+        eq = self.eq
+        stack = [(w, v)]
+
+        while stack:
+            w, v = stack.pop()
+            w = _find(getvar(w), equiv, trail)
+            v = _find(getvar(v), equiv, trail)
+
+            if eq(w, v):
+                continue
+
+            if isinstance(w, UnionVar):
+                self._unify_union(w, v, equiv, trail)
+                continue
+
+            if isinstance(v, UnionVar):
+                self._unify_union(v, w, equiv, trail)
+                continue
+
+            if isinstance(v, Var) and isinstance(w, Var):
+                u = v.intersection(w)
+                if u is NotImplemented:
+                    u = w.intersection(v)
+                if u is False:
+                    raise UnificationError("Incompatible variables")
+                if u is not NotImplemented:
+                    assert isinstance(u, Var)
+                    if u is not v:
+                        _bind(equiv, v, u, trail)
+                    if u is not w:
+                        _bind(equiv, w, u, trail)
+                    continue
+
+            if isinstance(w, Var):
+                if w.matches(v):
+                    _bind(equiv, w, v, trail)
+                    continue
+
+            if isinstance(v, Var):
+                if v.matches(w):
+                    _bind(equiv, v, w, trail)
+                    continue
+
+            if type(v) != type(w):
+                raise UnificationError("Type match error")
+
+            values_v = self._elements(v)
+            values_w = self._elements(w)
+
+            sv = -1
+            sw = -1
+
+            for i, vv in enumerate(values_v):
+                if isinstance(vv, SVar):
+                    if sv != -1:
+                        raise UnificationError("Multiple SVars in sequence")
+                    sv = i
+
+            for i, vw in enumerate(values_w):
+                if isinstance(vw, SVar):
+                    if sw != -1:
+                        raise UnificationError("Multiple SVars in sequence")
+                    sw = i
+
+            svars = None
+            if sv != -1 and sw != -1:
+                if len(values_v) == len(values_w) and sv == sw:
+                    svars = (values_w.pop(sw), values_v.pop(sv))
+                else:
+                    raise UnificationError("SVars in both sides of the match")
+
+            if sv != -1 and len(values_w) >= len(values_v) - 1:
+                wb = values_w[:sv]
+                diff = len(values_w) - len(values_v) + 1
+                wm = Seq(values_w[sv:sv+diff])
+                we = values_w[sv+diff:]
+                values_w = wb + [wm] + we
+
+            if sw != -1 and len(values_v) >= len(values_w) - 1:
+                vb = values_v[:sw]
+                diff = len(values_v) - len(values_w) + 1
+                vm = Seq(values_v[sw:sw+diff])
+                ve = values_v[sw+diff:]
+                values_v = vb + [vm] + ve
+
+            if len(values_w) != len(values_v):
+                raise UnificationError("Structures of differing size")
+
+            # Pushed in reverse, so that the elements are unified from left
+            # to right, after the SVars.
+            stack.extend(reversed(list(zip(values_w, values_v))))
+            if svars is not None:
+                stack.append(svars)
 
         return equiv
 
@@ -602,11 +678,16 @@ class Unification:
             have to take care of this.
 
         """
-        v = self._getvar(v)
-        if v in equiv:
-            return equiv[v]
+        getvar = self._getvar
+        visit = self.visit
 
-        try:
-            return self.visit(lambda u: self.reify(u, equiv), v)
-        except VisitError:
-            return v
+        def fn(u):
+            u = getvar(u)
+            if u in equiv:
+                return equiv[u]
+            try:
+                return visit(fn, u)
+            except VisitError:
+                return u
+
+        return fn(v)
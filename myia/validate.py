@@ -7,7 +7,7 @@ from .dshape import ListShape, TupleShape
 from .infer import DEAD
 from .ir import manage
 from .prim import Primitive, ops as P
-from .utils import overload, ErrorPool
+from .utils import overload, ErrorPool, OrderedSet
 
 
 class ValidationError(Exception):
@@ -98,6 +98,7 @@ whitelist = frozenset({
     P.scalar_le,
     P.scalar_ge,
     P.scalar_floor,
+    P.scalar_trunc,
     P.bool_not,
     P.bool_and,
     P.bool_or,
@@ -142,6 +143,7 @@ whitelist = frozenset({
     P.env_add,
     # P.J,
     # P.Jinv,
+    # P.JVP,
     P.scalar_cast,
 })
 
@@ -152,50 +154,91 @@ class Validator:
     Every node of each graph must have a concrete type in its type attribute,
     every application must be compatible with its argument types, and every
     primitive must belong to the whitelist.
+
+    All the checks are made in a single pass over the nodes. Since types are
+    interned, the types and the (type, shape) pairs that were found to be
+    valid are remembered, and not checked again for the other nodes.
     """
 
-    def __init__(self, root, whitelist, validate_type=validate_type):
+    def __init__(self, root, whitelist, validate_type=validate_type,
+                 manager=None):
         """Initialize and run the Validator."""
         self.errors = ErrorPool(exc_class=ValidationError)
         self.whitelist = frozenset(whitelist)
         self._validate_type_fn = validate_type
-        self._run(root)
+        self._valid_types = set()
+        self._valid_shapes = set()
+        self._run(root, manager)
 
-    def _test(self, node, fn):
-        try:
-            fn(node)
-        except ValidationError as err:
-            err.node = node
-            self.errors.add(err)
+    def _validate_type(self, t):
+        if t not in self._valid_types:
+            self._validate_type_fn(t)
+            self._valid_types.add(t)
 
-    def _validate_type(self, node):
-        return self._validate_type_fn(node.type)
+    def _validate_shape(self, t, shp):
+        try:
+            key = (t, shp)
+            if key in self._valid_shapes:
+                return
+        except TypeError:
+            return _validate_shape(t, shp)
+        _validate_shape(t, shp)
+        self._valid_shapes.add(key)
 
     def _validate_oper(self, node):
-        if node.is_constant(Primitive):
-            if node.value not in self.whitelist:
-                raise ValidationError(f'Illegal primitive: {node.value}')
+        if node.value not in self.whitelist:
+            raise ValidationError(f'Illegal primitive: {node.value}')
 
     def _validate_consistency(self, node):
-        if node.is_apply():
-            expected = Function[[i.type for i in node.inputs[1:]], node.type]
-            actual = node.inputs[0].type
-            if actual != expected:
-                raise ValidationError(
-                    f'Function/argument inconsistency: Expected {expected}, '
-                    f'Got {actual}.'
-                )
-
-    def _validate_shape(self, node):
-        return _validate_shape(node.type, node.inferred['shape'])
-
-    def _run(self, root):
-        manager = manage(root)
-        for node in list(manager.all_nodes):
-            self._test(node, self._validate_type)
-            self._test(node, self._validate_shape)
-            self._test(node, self._validate_oper)
-            self._test(node, self._validate_consistency)
+        expected = Function[[i.type for i in node.inputs[1:]], node.type]
+        actual = node.inputs[0].type
+        if actual != expected:
+            raise ValidationError(
+                f'Function/argument inconsistency: Expected {expected}, '
+                f'Got {actual}.'
+            )
+
+    def _validate_node(self, node):
+        errors = []
+        t = node.type
+        try:
+            self._validate_type(t)
+        except ValidationError as err:
+            errors.append(err)
+        try:
+            self._validate_shape(t, node.inferred['shape'])
+        except ValidationError as err:
+            errors.append(err)
+        if node.is_constant(Primitive):
+            try:
+                self._validate_oper(node)
+            except ValidationError as err:
+                errors.append(err)
+        elif node.is_apply():
+            try:
+                self._validate_consistency(node)
+            except ValidationError as err:
+                errors.append(err)
+        for err in errors:
+            err.node = node
+            self.errors.add(err)
+
+    def _nodes(self, root, manager):
+        """Return the nodes reachable from root in the manager."""
+        manager.add_graph(root)
+        graphs = OrderedSet([root])
+        graphs.update(manager.graphs_reachable[root])
+        nodes = OrderedSet()
+        for g in graphs:
+            nodes.update(manager.nodes[g])
+            nodes.update(manager.constants[g])
+        return nodes
+
+    def _run(self, root, manager):
+        if manager is None:
+            manager = manage(root)
+        for node in self._nodes(root, manager):
+            self._validate_node(node)
 
         def stringify(err):
             return f'* {err.node} -- {err.args[0]}'
@@ -203,11 +246,15 @@ class Validator:
         self.errors.trigger(stringify=stringify)
 
 
-def validate(root, whitelist=whitelist, validate_type=validate_type):
+def validate(root, whitelist=whitelist, validate_type=validate_type,
+             manager=None):
     """Verify that g is properly type-specialized.
 
     Every node of each graph must have a concrete type in its type attribute,
     every application must be compatible with its argument types, and every
     primitive must belong to the whitelist.
+
+    Only the graphs reachable from root are validated. If no manager is
+    given, root's manager is used, or a new one is created.
     """
-    Validator(root, whitelist, validate_type)
+    Validator(root, whitelist, validate_type, manager)
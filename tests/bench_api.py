@@ -0,0 +1,46 @@
+"""Benchmark the memory retained by MyiaFunction's cache.
+
+Run with `python -m tests.bench_api`.
+"""
+
+import gc
+import tracemalloc
+
+from myia.api import MyiaFunction
+
+
+def poly(n, x):
+    """Evaluate a polynomial whose degree is specialized on."""
+    res = 0.0
+    i = 0
+    while i < n:
+        res = res * x + 1.0
+        i = i + 1
+    return res
+
+
+def retained_per_specialization(lean, count):
+    """Return the average number of bytes kept alive per specialization."""
+    fn = MyiaFunction(poly, specialize_values=['n'], lean=lean)
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for n in range(count):
+        fn.compile((n, 2.0))
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def main(count=10):
+    """Compare the default and lean modes."""
+    # Warm up the global caches (parser, types, etc.)
+    MyiaFunction(poly, specialize_values=['n']).compile((1000, 2.0))
+    for lean in (False, True):
+        size = retained_per_specialization(lean, count)
+        print(f'lean={lean}: {size / 1024:.1f} KiB per specialization')
+
+
+if __name__ == '__main__':
+    main()
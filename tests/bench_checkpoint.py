@@ -0,0 +1,130 @@
+"""Benchmark the memory used by gradients with and without checkpointing.
+
+Run with `python -m tests.bench_checkpoint`. Each configuration runs in a
+fresh interpreter, and reports the peak memory allocated while running the
+compiled gradient of a stack of tanh layers, as traced by tracemalloc.
+"""
+
+import subprocess
+import sys
+import tracemalloc
+from dataclasses import dataclass
+
+import numpy
+
+from myia.composite import grad, checkpoint
+from myia.dtype import Array, Tuple
+from myia.pipeline import PipelineDefinition, standard_resources, steps
+from myia.prim.py_implementations import array_reduce, scalar_add
+
+
+pipeline = PipelineDefinition(
+    resources=standard_resources,
+    steps=dict(
+        parse=steps.step_parse,
+        resolve=steps.step_resolve,
+        infer=steps.step_infer,
+        specialize=steps.step_specialize,
+        erase_class=steps.step_erase_class,
+        opt=steps.step_opt,
+        erase_tuple=steps.step_erase_tuple,
+        opt2=steps.step_opt2,
+        export=steps.step_debug_export,
+        wrap=steps.step_wrap,
+    )
+)
+
+
+def tanh(x):
+    e = numpy.exp(-2 * x)
+    return (1 - e) / (1 + e)
+
+
+@dataclass(frozen=True)
+class TanhLayer:
+    W: Array
+    b: Array
+
+    def apply(self, input):
+        return tanh(input @ self.W + self.b)
+
+
+@dataclass(frozen=True)
+class CheckpointTanhLayer:
+    W: Array
+    b: Array
+
+    @checkpoint
+    def apply(self, input):
+        return tanh(input @ self.W + self.b)
+
+
+@dataclass(frozen=True)
+class Model:
+    layers: Tuple
+
+    def apply(self, x):
+        for layer in self.layers:
+            x = layer.apply(x)
+        return x
+
+
+def cost(model, x, y):
+    yy = model.apply(x)
+    diff = (yy - y)
+    return array_reduce(scalar_add, diff ** 2, ())
+
+
+def grad_cost(model, x, y):
+    return grad(cost)(model, x, y)
+
+
+def make_model(layer_class, depth, width):
+    rng = numpy.random.RandomState(0)
+    return Model(layers=tuple(
+        layer_class(rng.randn(width, width) / width,
+                    numpy.zeros((1, width)))
+        for _ in range(depth)
+    ))
+
+
+def measure(layer_class, depth, width=256, batch=64):
+    """Return the peak memory in bytes used by one gradient computation."""
+    model = make_model(layer_class, depth, width)
+    x = numpy.ones((batch, width))
+    y = numpy.zeros((batch, width))
+    args = (model, x, y)
+    res = pipeline.run(input=grad_cost,
+                       argspec=[{'value': arg} for arg in args])
+    fn = res['output']
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    """Print the peak memory for increasing depths."""
+    for depth in (1, 2, 4, 8):
+        results = []
+        for layer_class in ('TanhLayer', 'CheckpointTanhLayer'):
+            proc = subprocess.run(
+                [sys.executable, '-m', 'tests.bench_checkpoint',
+                 layer_class, str(depth)],
+                stdout=subprocess.PIPE,
+                universal_newlines=True,
+                check=True,
+            )
+            results.append(int(proc.stdout) / 2 ** 20)
+        plain, ckpt = results
+        print(f'depth {depth:2}: {plain:8.1f}MB    '
+              f'checkpointed: {ckpt:8.1f}MB')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        layer_class, depth = sys.argv[1:]
+        print(measure(globals()[layer_class], int(depth)))
+    else:
+        main()
@@ -0,0 +1,88 @@
+"""Benchmark MultitypeGraph dispatch on composite-heavy programs.
+
+Run with `python -m tests.bench_composite`.
+"""
+
+import time
+
+import numpy as np
+
+from myia.composite import exp, log, grad, _leaf_add, _leaf_zeros_like
+from myia.dtype import Array, Bool, EnvType, Float, Int
+from myia.pipeline import standard_debug_pipeline
+
+
+f64 = Float[64]
+i64 = Int[64]
+
+
+def timed(fn, *args):
+    """Return the time taken by fn(*args), in milliseconds."""
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+lookups = [
+    (exp, (f64,)),
+    (exp, (Array[f64],)),
+    (log, (Array[f64],)),
+    (_leaf_add, (f64, f64)),
+    (_leaf_add, (EnvType, EnvType)),
+    (_leaf_zeros_like, (Bool,)),
+    (_leaf_zeros_like, (i64,)),
+    (_leaf_zeros_like, (Array[f64],)),
+]
+
+
+def bench_dispatch(count):
+    """Resolve each composite signature count times."""
+    for _ in range(count):
+        for mt, types in lookups:
+            mt._getfn(types)
+
+
+def logexp(x, y):
+    """Chain elementwise composites."""
+    return np.log(np.exp(x) + np.exp(y)) * np.exp(x - y)
+
+
+def pairs(x, y):
+    """Go through tuples, so that gradients are added with hyper_add."""
+    p = (np.exp(x), y * x)
+    q = (p[1], p[0])
+    return p[0] * q[0] + np.exp(p[1] - q[1])
+
+
+def grad_pairs(x, y):
+    """Differentiate through the composites and tuples."""
+    return grad(pairs)(x, y)
+
+
+# The debug VM can run the J primitives that are left after optimization
+pipeline = standard_debug_pipeline.configure({'validate': False})
+
+
+def bench_pipeline(fn, *args):
+    """Compile fn through the debug pipeline and run it."""
+    argspec = [{'value': arg} for arg in args]
+    res = pipeline.run(input=fn, argspec=argspec)
+    res['output'](*args)
+
+
+def main(count=10000):
+    """Run all benchmarks."""
+    t = timed(bench_dispatch, count)
+    print(f'dispatch: {t * 1000 / (count * len(lookups)):.2f}us per lookup')
+    x = np.ones((10, 10))
+    y = np.full((10, 10), 2.0)
+    for fn, args in [(logexp, (x, y)),
+                     (pairs, (x, y)),
+                     (grad_pairs, (1.0, 2.0))]:
+        t = timed(bench_pipeline, fn, *args)
+        print(f'{fn.__name__}{tuple(type(a).__name__ for a in args)}: '
+              f'{t:.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark common subexpression elimination on large graphs.
+
+Run with `python -m tests.bench_cse`. A graph where every operation is
+computed twice is built directly, then CSE is run once on the whole graph,
+and then again after each of a series of small modifications, the way the
+optimizer runs it after each round of optimizations. The number of nodes
+eliminated and the time taken by each run are reported.
+"""
+
+import time
+
+from myia.ir import Graph, manage
+from myia.opt import cse
+from myia.prim import ops as P
+
+
+def make_graph(size):
+    """Make a graph with size steps that compute each operation twice."""
+    g = Graph()
+    x = g.add_parameter()
+    y = g.add_parameter()
+    for i in range(size):
+        a = g.apply(P.scalar_add, x, y)
+        b = g.apply(P.scalar_add, x, y)
+        x = g.apply(P.scalar_mul, a, b)
+    g.output = x
+    return g
+
+
+def timed_cse(g, mng):
+    """Return the number of nodes eliminated by CSE, and the time taken."""
+    before = len(mng.all_nodes)
+    start = time.perf_counter()
+    cse(g, mng)
+    elapsed = time.perf_counter() - start
+    return before - len(mng.all_nodes), elapsed * 1000
+
+
+def main():
+    """Print the results of CSE for increasing graph sizes."""
+    for size in (1000, 4000, 16000):
+        g = make_graph(size)
+        mng = manage(g)
+        eliminated, elapsed = timed_cse(g, mng)
+        print(f'{size:6} steps: first run eliminated {eliminated:6} nodes '
+              f'in {elapsed:8.1f}ms')
+
+        # Duplicate one addition at a time, halfway through the graph
+        node = g.output
+        for _ in range(size // 2):
+            node = node.inputs[1]
+        total_eliminated = 0
+        total_elapsed = 0
+        runs = 10
+        for _ in range(runs):
+            add = node.inputs[1]
+            mng.set_edge(node, 2, g.apply(P.scalar_add, *add.inputs[1:]))
+            eliminated, elapsed = timed_cse(g, mng)
+            total_eliminated += eliminated
+            total_elapsed += elapsed
+        print(f'{size:6} steps: next runs eliminated '
+              f'{total_eliminated / runs:6.1f} nodes '
+              f'in {total_elapsed / runs:8.1f}ms on average')
+
+
+if __name__ == '__main__':
+    main()
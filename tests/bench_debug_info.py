@@ -0,0 +1,83 @@
+"""Benchmark the memory kept by debug information during compilation.
+
+Run with `python -m tests.bench_debug_info`. Each program is compiled through
+the standard pipeline, with the numpy linear implementation, once with debug
+information kept and once with it released after the last step. The peak
+memory allocated during compilation, the memory still held by the compiled
+program, and the compilation time are reported for both.
+"""
+
+import gc
+import time
+import tracemalloc
+
+from myia.composite import grad
+from myia.pipeline import standard_pipeline
+
+
+pipelines = {
+    strip: standard_pipeline.configure({
+        'compile.linear_impl': 'numpy',
+        'debug_info.strip': strip})
+    for strip in (False, True)
+}
+
+
+def poly(x, y):
+    a = x * y + x
+    b = a * a - y
+    c = b * x + a
+    return c * c + b
+
+
+def grad_poly(x, y):
+    return grad(poly)(x, y)
+
+
+def loops(n):
+    s = 0
+    i = 0
+    while i < n:
+        if i % 2 == 0:
+            s = s + i
+        else:
+            s = s - 1
+        i = i + 1
+    return s
+
+
+# name: (function, arguments)
+programs = {
+    'poly': (poly, (2.0, 3.0)),
+    'grad_poly': (grad_poly, (2.0, 3.0)),
+    'loops': (loops, (10,)),
+}
+
+
+def measure(pipeline, fn, args):
+    """Return the peak and kept memory in KiB, and the compile time in ms."""
+    argspec = [{'value': arg} for arg in args]
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    res = pipeline.run(input=fn, argspec=argspec)
+    elapsed = time.perf_counter() - start
+    del res['input']
+    gc.collect()
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024, kept / 1024, elapsed * 1000
+
+
+def main():
+    """Print the memory and time taken by every program, per setting."""
+    print(f'{"program":12}{"strip":>7}{"peak":>12}{"kept":>12}{"time":>12}')
+    for name, (fn, args) in programs.items():
+        for strip, pipeline in pipelines.items():
+            peak, kept, elapsed = measure(pipeline, fn, args)
+            print(f'{name:12}{str(strip):>7}{peak:10.0f}KB{kept:10.0f}KB'
+                  f'{elapsed:10.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark type construction in inference and validation.
+
+Run with `python -m tests.bench_dtype`. A graph with a long chain of scalar
+operations is built directly, without going through the parser, and the
+time taken to infer and specialize it, then to validate the result, is
+reported for increasing sizes. Both steps build a Function type for every
+application in the graph.
+"""
+
+import time
+
+from myia.dtype import Bool, Float, Function, Int, Tuple
+from myia.ir import Graph
+from myia.pipeline import standard_debug_pipeline
+from myia.prim import ops as P
+from myia.validate import validate
+
+
+specialize = standard_debug_pipeline.select('infer', 'specialize')
+
+
+def make_graph(size):
+    """Make a graph that alternates additions and multiplications."""
+    g = Graph()
+    x = g.add_parameter()
+    y = g.add_parameter()
+    for i in range(size):
+        prim = P.scalar_add if i % 2 else P.scalar_mul
+        x = g.apply(prim, x, y)
+    g.output = x
+    return g
+
+
+def bench_function_types(count):
+    """Construct Function types from interned arguments count times."""
+    args = [Int[64], Float[64], Tuple[Bool, Int[64]]]
+    for _ in range(count):
+        Function[args, Float[64]]
+
+
+def main():
+    """Print the time taken by each step for increasing graph sizes."""
+    start = time.perf_counter()
+    bench_function_types(100000)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f'100000 Function types: {elapsed:8.1f}ms')
+    for size in (1000, 2000, 4000):
+        argspec = [{'value': 1.0}, {'value': 2.0}]
+        start = time.perf_counter()
+        res = specialize.run(graph=make_graph(size), argspec=argspec)
+        inferred = time.perf_counter()
+        validate(res['graph'])
+        validated = time.perf_counter()
+        print(f'{size:6} nodes: '
+              f'infer+specialize {(inferred - start) * 1000:8.1f}ms    '
+              f'validate {(validated - inferred) * 1000:8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
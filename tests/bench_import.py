@@ -0,0 +1,50 @@
+"""Benchmark the time it takes to import Myia's main modules.
+
+Run with `python -m tests.bench_import`. Each module is imported in a fresh
+interpreter with `python -X importtime`.
+"""
+
+import subprocess
+import sys
+
+
+modules = ['myia.pipeline', 'myia.api', 'myia.compile']
+heavy = ['nnvm', 'tvm', 'myia.compile.nnvm', 'myia.prim.grad_implementations']
+
+
+def importtime(module):
+    """Return the cumulative import times of module and its imports.
+
+    The result maps each imported module to its cumulative import time,
+    in microseconds.
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            # Header line
+            pass
+    return times
+
+
+def main():
+    """Print the import time of each module and which heavy modules load."""
+    for module in modules:
+        times = importtime(module)
+        loaded = [m for m in heavy if m in times]
+        print(f'{module:20}{times[module] / 1000:10.1f}ms'
+              f'    heavy imports: {", ".join(loaded) or "none"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark Jacobians computed in forward mode against reverse mode.
+
+Run with `python -m tests.bench_jvp`. The Jacobian of a layer mapping n
+inputs to m outputs is computed column by column with n calls to its JVP,
+and row by row with m calls to the gradient of its outputs weighted by a
+basis vector. Forward mode should win when n is small compared to m, and
+reverse mode in the opposite case.
+"""
+
+import time
+
+import numpy
+
+from myia.composite import grad, jvp
+from myia.pipeline import PipelineDefinition, standard_resources, steps
+from myia.prim.py_implementations import array_reduce, scalar_add
+
+
+pipeline = PipelineDefinition(
+    resources=standard_resources,
+    steps=dict(
+        parse=steps.step_parse,
+        resolve=steps.step_resolve,
+        infer=steps.step_infer,
+        specialize=steps.step_specialize,
+        erase_class=steps.step_erase_class,
+        opt=steps.step_opt,
+        erase_tuple=steps.step_erase_tuple,
+        opt2=steps.step_opt2,
+        export=steps.step_debug_export,
+        wrap=steps.step_wrap,
+    )
+)
+
+
+def tanh(x):
+    e = numpy.exp(-2 * x)
+    return (1 - e) / (1 + e)
+
+
+def layer(x, W):
+    return tanh(tanh(x @ W) * 2.0)
+
+
+def column(x, W, dx, dW):
+    return jvp(layer)(x, W, dx, dW)[1]
+
+
+def weighted(x, W, e):
+    return array_reduce(scalar_add, layer(x, W) * e, ())
+
+
+def row(x, W, e):
+    return grad(weighted)(x, W, e)
+
+
+def compile(fn, *args):
+    res = pipeline.run(input=fn, argspec=[{'value': arg} for arg in args])
+    return res['output']
+
+
+def jacobian_forward(x, W):
+    """Compute the Jacobian of layer with respect to x, in forward mode."""
+    n = x.shape[1]
+    dW = numpy.zeros(W.shape)
+    dxs = numpy.eye(n).reshape((n, 1, n))
+    fn = compile(column, x, W, dxs[0], dW)
+    start = time.perf_counter()
+    jac = numpy.concatenate([fn(x, W, dx, dW) for dx in dxs]).T
+    return jac, time.perf_counter() - start
+
+
+def jacobian_reverse(x, W):
+    """Compute the Jacobian of layer with respect to x, in reverse mode."""
+    m = W.shape[1]
+    es = numpy.eye(m).reshape((m, 1, m))
+    fn = compile(row, x, W, es[0])
+    start = time.perf_counter()
+    jac = numpy.concatenate([fn(x, W, e) for e in es])
+    return jac, time.perf_counter() - start
+
+
+def main():
+    """Print the time taken by both modes for various layer shapes."""
+    rng = numpy.random.RandomState(0)
+    for n, m in ((4, 256), (32, 32), (256, 4)):
+        x = rng.randn(1, n)
+        W = rng.randn(n, m) / n
+        jf, tf = jacobian_forward(x, W)
+        jr, tr = jacobian_reverse(x, W)
+        assert numpy.allclose(jf, jr)
+        print(f'{n:4} inputs, {m:4} outputs: '
+              f'forward {tf * 1000:8.1f}ms    '
+              f'reverse {tr * 1000:8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark the linear implementations of the compile pipeline.
+
+Run with `python -m tests.bench_linear`. The programs of tests/test_compile.py
+and tests/test_model.py are compiled with each linear implementation (debug,
+nnvm and numpy), and the time taken by compilation and by one call to the
+compiled program is reported for each of them. Implementations that cannot
+compile a program, e.g. because a primitive has no NNVM lowering or because
+NNVM is not installed, are reported as failing.
+"""
+
+import time
+from types import ModuleType
+
+from myia.composite import grad
+from myia.pipeline import standard_pipeline
+
+from . import test_compile, test_model
+
+
+pipelines = {
+    impl: standard_pipeline.configure({'compile.linear_impl': impl})
+    for impl in ('debug', 'nnvm', 'numpy')
+}
+
+
+def _first_args(test):
+    for mark in getattr(test, 'pytestmark', []):
+        if mark.name == 'parametrize' and mark.args[0] == 'args':
+            args = mark.args[1][0]
+            return args if isinstance(args, tuple) else (args,)
+    return None
+
+
+def collect(module: ModuleType):
+    """Return the (name, fn, args) of the parse_compare tests in module."""
+    programs = []
+    for name, test in vars(module).items():
+        if name.startswith('test_') and hasattr(test, '__orig__'):
+            args = _first_args(test)
+            if args is not None:
+                programs.append((name, test.__orig__, args))
+    return programs
+
+
+def backward(model, x, y):
+    return grad(test_model.cost)(model, x, y)
+
+
+def measure(pipeline, fn, args, repeat=20):
+    """Return the compile time and the time of one call, in ms."""
+    argspec = [{'value': arg} for arg in args]
+    start = time.perf_counter()
+    f = pipeline.run(input=fn, argspec=argspec)['output']
+    compiled = time.perf_counter()
+    for _ in range(repeat):
+        f(*args)
+    end = time.perf_counter()
+    return (compiled - start) * 1000, (end - compiled) * 1000 / repeat
+
+
+def main():
+    """Print the compile and run times of every program, per backend."""
+    programs = collect(test_compile) + collect(test_model)
+    programs.append(('backward', backward,
+                     (test_model.make_model(), test_model.MC(3, 6),
+                      test_model.MD(3, 8))))
+    print(f'{"program":32}' + ''.join(f'{impl:>24}' for impl in pipelines))
+    for name, fn, args in programs:
+        line = f'{name:32}'
+        for impl, pipeline in pipelines.items():
+            try:
+                comp, run = measure(pipeline, fn, args)
+            except Exception as exc:
+                line += f'{type(exc).__name__:>24}'
+            else:
+                line += f'{comp:10.1f}ms {run:9.3f}ms'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark tight loops compiled through Myia and run by FinalVM.
+
+Run with `python -m tests.bench_loops`. Each program is a loop with a small
+body, written as a while statement or as tail recursion, so that its run
+time is dominated by the cost of the tail calls that implement iteration.
+The programs are compiled with the debug and numpy linear implementations,
+and the time per iteration is reported for each of them, along with the
+time taken by Python itself.
+"""
+
+import time
+
+from myia.pipeline import standard_pipeline
+
+
+pipelines = {
+    impl: standard_pipeline.configure({'compile.linear_impl': impl})
+    for impl in ('debug', 'numpy')
+}
+
+
+def loop(n):
+    i = 0
+    while i < n:
+        i = i + 1
+    return i
+
+
+def loop_if(n):
+    i = 0
+    s = 0
+    while i < n:
+        if i % 2 == 0:
+            s = s + i
+        else:
+            s = s - 1
+        i = i + 1
+    return s
+
+
+def nested(n):
+    s = 0
+    i = 0
+    while i < n:
+        j = 0
+        while j < 10:
+            s = s + j
+            j = j + 1
+        i = i + 1
+    return s
+
+
+def fsum(n):
+    def f(i, acc):
+        if i == 0:
+            return acc
+        return f(i - 1, acc + i)
+    return f(n, 0)
+
+
+# name: (function, argument, number of iterations)
+programs = {
+    'loop': (loop, 2000, 2000),
+    'loop_if': (loop_if, 2000, 2000),
+    'nested': (nested, 200, 2000),
+    # Python itself is limited by the recursion limit here
+    'fsum': (fsum, 500, 500),
+}
+
+
+def measure(fn, n, repeat=3):
+    """Return the best time of fn(n) over a few runs, in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(n)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """Print the time per iteration of every program, in microseconds."""
+    print(f'{"program":16}{"python":>12}' +
+          ''.join(f'{impl:>12}' for impl in pipelines))
+    for name, (fn, n, iterations) in programs.items():
+        line = f'{name:16}{measure(fn, n) * 1e6 / iterations:10.3f}us'
+        for pipeline in pipelines.values():
+            f = pipeline.run(input=fn, argspec=[{'value': n}])['output']
+            assert f(n) == fn(n)
+            line += f'{measure(f, n) * 1e6 / iterations:10.3f}us'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark programs compiled with the NNVM and debug linear backends.
+
+Run with `python -m tests.bench_nnvm`. Each program is compiled with both
+linear implementations of the standard pipeline. Programs that use a
+primitive without an NNVM lowering cannot be compiled with NNVM at all, in
+which case the missing primitive is reported instead of a time.
+"""
+
+import time
+
+import numpy
+
+from myia.pipeline import standard_pipeline
+from myia.prim.py_implementations import array_map, array_reduce, \
+    array_to_scalar, bool_or, reshape, scalar_add, scalar_cast, scalar_gt, \
+    scalar_mul, scalar_trunc, switch, transpose
+
+from .common import f32
+
+
+nnvm_pipeline = standard_pipeline
+debug_pipeline = standard_pipeline.configure({
+    'compile.linear_impl': 'debug'
+})
+
+
+def tanh(x):
+    e = numpy.exp(-2 * x)
+    return (1 - e) / (1 + e)
+
+
+def layer(x, W):
+    return tanh(x @ W)
+
+
+def reduce_prod(x, W):
+    return array_reduce(scalar_mul, x @ W, (1, 1))
+
+
+def relu(x, W):
+    y = x @ W
+    return array_map(switch, array_map(scalar_gt, y, y * 0.0), y, y * 0.0)
+
+
+def any_positive(x, W):
+    return array_reduce(bool_or, array_map(scalar_gt, x @ W, W * 0.0), ())
+
+
+def reshape_sum(x, W):
+    y = reshape(transpose(x @ W, (1, 0)), (8, 8))
+    return array_reduce(scalar_add, y, (8, 1))
+
+
+def trunc_cast(x, W):
+    s = array_to_scalar(array_reduce(scalar_add, x @ W, ()))
+    return scalar_cast(scalar_trunc(s), f32)
+
+
+programs = [layer, reduce_prod, relu, any_positive, reshape_sum, trunc_cast]
+
+
+def measure(pipeline, fn, args, repeat=100):
+    """Compile fn with pipeline and return the time of one call in ms."""
+    res = pipeline.run(input=fn, argspec=[{'value': arg} for arg in args])
+    f = res['output']
+    f(*args)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        f(*args)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    """Print whether each program compiles to NNVM, and the call times."""
+    rng = numpy.random.RandomState(0)
+    x = rng.randn(64, 64)
+    W = rng.randn(64, 1)
+    for fn in programs:
+        args = (x, W)
+        debug = measure(debug_pipeline, fn, args)
+        try:
+            nnvm = f'{measure(nnvm_pipeline, fn, args):8.3f}ms'
+        except NotImplementedError as exc:
+            nnvm = f'missing {exc}'
+        print(f'{fn.__name__:14}: debug {debug:8.3f}ms    nnvm {nnvm}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark the parsing of Python functions into graphs.
+
+Run with `python -m tests.bench_parser`. Three costs are reported:
+
+* cold: parsing functions that were never seen before.
+* closures: parsing an inner function that is re-created by every call to
+  its enclosing function.
+* locations: resolving the source location of every node of a parsed graph,
+  which only happens when an error is reported.
+"""
+
+import time
+
+import numpy
+
+from myia import parser
+from myia.ir import manage
+
+
+def tanh(x):
+    e = numpy.exp(-2 * x)
+    return (1 - e) / (1 + e)
+
+
+def layer(x, W, b):
+    return tanh(x @ W + b)
+
+
+def fact(n):
+    if n <= 1:
+        return 1
+    else:
+        return n * fact(n - 1)
+
+
+def loop(xs):
+    total = 0
+    for x in xs:
+        while x > 1:
+            x = x / 2
+        total = total + x
+    return total
+
+
+functions = [tanh, layer, fact, loop]
+
+
+def make_scaled(factor):
+    def scaled(x):
+        return tanh(x * factor) * factor
+    return scaled
+
+
+def clear_caches():
+    parser._parse_cache.clear()
+    parser._template_cache.clear()
+    parser._source_cache.clear()
+
+
+def timed(fn, count):
+    """Return the average time taken by fn(), in microseconds."""
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / count
+
+
+def bench_cold():
+    clear_caches()
+    for fn in functions:
+        parser.parse(fn)
+
+
+def bench_closures():
+    parser.parse(make_scaled(numpy.random.rand()))
+
+
+def bench_locations():
+    clear_caches()
+    for fn in functions:
+        mng = manage(parser.parse(fn), weak=True)
+        for node in mng.all_nodes:
+            loc = node.debug.find('location')
+            if loc is not None:
+                loc.line
+
+
+def main():
+    """Print the average time taken by each benchmark."""
+    for name, fn in (('cold', bench_cold),
+                     ('closures', bench_closures),
+                     ('locations', bench_locations)):
+        print(f'{name:10}: {timed(fn, 200):10.1f}us')
+
+
+if __name__ == '__main__':
+    main()
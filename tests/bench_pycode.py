@@ -0,0 +1,101 @@
+"""Benchmark programs compiled to Python against FinalVM.
+
+Run with `python -m tests.bench_pycode`. Each program is compiled with the
+standard pipeline, which runs FinalVM instructions (with the numpy linear
+implementation, so that NNVM is not needed), and with
+`standard_python_pipeline`, which compiles the graphs to Python functions.
+The programs are mostly made of scalar operations and control flow, where
+the overhead of interpreting the instructions dominates.
+"""
+
+import time
+
+import numpy
+
+from myia.pipeline import standard_pipeline, standard_python_pipeline
+
+
+vm_pipeline = standard_pipeline.configure({
+    'compile.linear_impl': 'numpy'
+})
+
+
+def loop(n):
+    i = 0
+    r = 0
+    while i < n:
+        r = r + i * i
+        i = i + 1
+    return r
+
+
+def loop_if(n):
+    i = 0
+    r = 0
+    while i < n:
+        if i % 3 == 0:
+            r = r + i
+        else:
+            r = r - 1
+        i = i + 1
+    return r
+
+
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+
+
+def hof(n):
+    def inc(x):
+        return x + 1
+
+    def repeat(f, x, k):
+        if k == 0:
+            return x
+        return repeat(f, f(x), k - 1)
+
+    return repeat(inc, 0, n)
+
+
+def tanh(x):
+    e = numpy.exp(-2 * x)
+    return (1 - e) / (1 + e)
+
+
+def layers(x, W):
+    return tanh(tanh(x @ W) @ W)
+
+
+programs = [
+    (loop, (1000,)),
+    (loop_if, (1000,)),
+    (fib, (15,)),
+    (hof, (1000,)),
+    (layers, (numpy.ones((4, 16)), numpy.ones((16, 16)) / 16)),
+]
+
+
+def measure(pipeline, fn, args, repeat=10):
+    """Return the result of fn and the time of one call, in ms."""
+    res = pipeline.run(input=fn, argspec=[{'value': arg} for arg in args])
+    f = res['output']
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = f(*args)
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    """Print the time taken by both backends for each program."""
+    for fn, args in programs:
+        r1, t1 = measure(vm_pipeline, fn, args)
+        r2, t2 = measure(standard_python_pipeline, fn, args)
+        assert numpy.allclose(r1, r2)
+        print(f'{fn.__name__:10}: FinalVM {t1:9.3f}ms    '
+              f'python {t2:9.3f}ms    ({t1 / t2:5.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
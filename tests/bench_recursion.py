@@ -0,0 +1,86 @@
+"""Benchmark the value stack of FinalVM on deep recursion and small calls.
+
+Run with `python -m tests.bench_recursion`. FinalVM does not use the Python
+stack for the calls of the programs it runs, so recursion can go much deeper
+than in Python, at the cost of growing its own value stack. The programs are
+compiled with the numpy linear implementation, and are run with the default
+stack management, which clears popped slots once a large array was put on
+the stack, and with popped values kept until the end of the call.
+The time taken by many calls of a trivial program is also reported, since
+every call starts with an empty stack.
+"""
+
+import time
+
+import numpy
+
+from myia.pipeline import standard_pipeline
+
+
+pipelines = {
+    'default': standard_pipeline.configure({
+        'compile.linear_impl': 'numpy'}),
+    'keep': standard_pipeline.configure({
+        'compile.linear_impl': 'numpy',
+        'export.release_threshold': None}),
+}
+
+
+def rsum(n):
+    if n == 0:
+        return 0
+    return n + rsum(n - 1)
+
+
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+
+
+def arrays(x, n):
+    if n == 0:
+        return x
+    return arrays(x * 1.0001, n - 1) + x
+
+
+def inc(x):
+    return x + 1
+
+
+# name: (function, arguments, number of calls)
+programs = {
+    'rsum(1000)': (rsum, (1000,), 10),
+    'rsum(100000)': (rsum, (100000,), 1),
+    'fib(18)': (fib, (18,), 1),
+    'arrays(200)': (arrays, (numpy.ones((100, 100)), 200), 1),
+    'inc x 10000': (inc, (1,), 10000),
+}
+
+
+def measure(fn, args, calls, repeat=3):
+    """Return the best time of calls calls of fn(*args), in ms."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def main():
+    """Print the time taken by every program, per stack mode."""
+    print(f'{"program":16}' + ''.join(f'{mode:>14}' for mode in pipelines))
+    for name, (fn, args, calls) in programs.items():
+        line = f'{name:16}'
+        for pipeline in pipelines.values():
+            argspec = [{'value': arg} for arg in args]
+            f = pipeline.run(input=fn, argspec=argspec)['output']
+            line += f'{measure(f, args, calls):12.2f}ms'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
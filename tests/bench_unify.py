@@ -0,0 +1,81 @@
+"""Benchmark the unification engine on large terms.
+
+Run with `python -m tests.bench_unify`. The cases mirror the ones in
+`tests/utils/test_unify.py`, scaled up to wide and deep terms, long chains
+of variables, and union variables on top of many existing equivalences.
+"""
+
+import time
+
+from myia.utils.unify import Unification, svar, uvar, var
+
+
+U = Unification()
+
+
+def nested(leaves):
+    """Nest the leaves in pairs: (l0, (l1, (l2, ...)))."""
+    t = None
+    for leaf in reversed(leaves):
+        t = (leaf, t)
+    return t
+
+
+def bench_wide(n):
+    vs = [var() for _ in range(n)]
+    U.unify(tuple(vs), tuple(range(n)))
+
+
+def bench_deep(n):
+    vs = [var() for _ in range(n)]
+    U.unify(nested(vs), nested(list(range(n))))
+
+
+def bench_svar(n):
+    v = var()
+    sv = svar()
+    U.unify((v, sv), tuple(range(n)))
+
+
+def bench_chain(n):
+    vs = [var() for _ in range(n)]
+    equiv = {v1: v2 for v1, v2 in zip(vs, vs[1:])}
+    for v in vs:
+        U.unify_raw(v, 0, equiv)
+
+
+def bench_union(n):
+    equiv = {var(): i for i in range(n)}
+    v1 = var()
+    uv = uvar([(v1, 1), (v1, 2), (v1, 3)])
+    for _ in range(100):
+        U.unify_raw(uv, (3, 2), equiv)
+
+
+def bench_reify(n):
+    vs = [var() for _ in range(n)]
+    equiv = {v: i for i, v in enumerate(vs)}
+    U.reify(tuple((v, (v, (v,))) for v in vs), equiv)
+
+
+benchmarks = [
+    ('wide', bench_wide, 100000),
+    ('deep', bench_deep, 500),
+    ('svar', bench_svar, 100000),
+    ('chain', bench_chain, 2000),
+    ('union', bench_union, 10000),
+    ('reify', bench_reify, 20000),
+]
+
+
+def main():
+    """Print the time taken by each benchmark."""
+    for name, fn, n in benchmarks:
+        start = time.perf_counter()
+        fn(n)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f'{name:6} (n = {n:6}): {elapsed:8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
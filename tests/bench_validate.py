@@ -0,0 +1,67 @@
+"""Benchmark graph validation on large graphs.
+
+Run with `python -m tests.bench_validate`. A graph with a long chain of
+scalar operations is built directly, inferred and specialized, and then
+validated:
+
+* directly, with the pipeline's manager;
+* through the validate step, with and without renormalization.
+"""
+
+import time
+
+from myia.ir import Graph
+from myia.pipeline import standard_debug_pipeline
+from myia.prim import ops as P
+from myia.validate import validate
+
+
+specialize = standard_debug_pipeline.select('infer', 'specialize')
+
+validate_step = {
+    renormalize: standard_debug_pipeline
+    .select('infer', 'specialize', 'validate')
+    .configure({'validate.renormalize': renormalize})
+    for renormalize in (True, False)
+}
+
+
+def make_graph(size):
+    """Make a graph that alternates additions and multiplications."""
+    g = Graph()
+    x = g.add_parameter()
+    y = g.add_parameter()
+    for i in range(size):
+        prim = P.scalar_add if i % 2 else P.scalar_mul
+        x = g.apply(prim, x, y)
+    g.output = x
+    return g
+
+
+def timed(fn, *args, **kwargs):
+    """Return the time taken by fn(*args, **kwargs), in milliseconds."""
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    """Print the time taken to validate graphs of increasing sizes."""
+    argspec = [{'value': 1.0}, {'value': 2.0}]
+    for size in (1000, 2000, 4000):
+        g = specialize.run(graph=make_graph(size), argspec=argspec)['graph']
+        t_validate = timed(validate, g, manager=g.manager)
+
+        steps = {}
+        for renormalize, pip in validate_step.items():
+            start = time.perf_counter()
+            pip.run(graph=make_graph(size), argspec=argspec)
+            end = time.perf_counter()
+            steps[renormalize] = (end - start) * 1000
+        print(f'{size:5} nodes: validate {t_validate:7.1f}ms    '
+              f'pipeline {steps[True]:8.1f}ms, '
+              f'without renormalize {steps[False]:8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
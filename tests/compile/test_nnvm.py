@@ -4,10 +4,12 @@ import math
 import numpy as np
 
 from myia.prim.py_implementations import distribute, scalar_to_array, dot, \
-    scalar_add, array_reduce, transpose
+    scalar_add, array_reduce, transpose, reshape, scalar_mul, scalar_trunc, \
+    scalar_cast, bool_and, bool_or, array_map, switch, scalar_gt, \
+    array_to_scalar
 
 from ..test_compile import parse_compare
-from ..common import MA, MB
+from ..common import MA, MB, f32
 
 
 @parse_compare((2, 3))
@@ -66,12 +68,34 @@ def test_log(x):
     return math.log(x)
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="requires an NNVM version with sin and cos")
+@parse_compare((2.0,))
+def test_sin(x):
+    return math.sin(x)
+
+
+@pytest.mark.xfail(reason="requires an NNVM version with sin and cos")
+@parse_compare((2.0,))
+def test_cos(x):
+    return math.cos(x)
+
+
+@pytest.mark.xfail(reason="requires an NNVM version with sin and cos")
 @parse_compare((2.0,))
 def test_tan(x):
     return math.tan(x)
 
 
+@parse_compare((2.7,), (-2.7,))
+def test_trunc(x):
+    return scalar_trunc(x)
+
+
+@parse_compare((2,), (-3,))
+def test_cast(x):
+    return scalar_cast(x, f32)
+
+
 @parse_compare((2, 3))
 def test_eq(x, y):
     return x == y
@@ -107,6 +131,16 @@ def test_bool_eq(x, y):
     return x == y
 
 
+@parse_compare((True, False), (True, True), (False, False))
+def test_bool_and(x, y):
+    return bool_and(x, y)
+
+
+@parse_compare((True, False), (False, True), (False, False))
+def test_bool_or(x, y):
+    return bool_or(x, y)
+
+
 @parse_compare((2,))
 def test_to_array(x):
     return scalar_to_array(x)
@@ -160,3 +194,33 @@ def test_array_reduce2(x):
 @parse_compare((MA(2, 3),), array=True)
 def test_transpose(x):
     return transpose(x, (1, 0))
+
+
+@parse_compare((MA(2, 3),), array=True)
+def test_array_reduce_mul(x):
+    return array_reduce(scalar_mul, x, (1, 3))
+
+
+@parse_compare((MA(2, 3),), array=True)
+def test_array_reduce_all(x):
+    return array_reduce(scalar_add, x, ())
+
+
+@parse_compare((MA(2, 3), MB(2, 3)), array=True)
+def test_array_reduce_bool(x, y):
+    return array_reduce(bool_or, array_map(scalar_gt, x, y), (2, 1))
+
+
+@parse_compare((MA(2, 3), MB(2, 3)), array=True)
+def test_array_switch(x, y):
+    return array_map(switch, array_map(scalar_gt, x, y), x, y)
+
+
+@parse_compare((MA(2, 3),), array=True)
+def test_reshape(x):
+    return reshape(x, (3, 2))
+
+
+@parse_compare((MA(1, 1),))
+def test_array_to_scalar(x):
+    return array_to_scalar(reshape(x, ()))
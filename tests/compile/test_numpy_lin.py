@@ -0,0 +1,128 @@
+from copy import copy
+import math
+import pickle
+
+import numpy as np
+from pytest import mark
+
+from myia.pipeline import standard_pipeline
+from myia.prim.py_implementations import array_map, array_reduce, \
+    array_to_scalar, bool_or, scalar_add, scalar_div, scalar_gt, \
+    scalar_mul, switch
+
+from ..common import MA, MB
+
+
+numpy_lin_pipeline = standard_pipeline.configure({
+    'compile.linear_impl': 'numpy'})
+
+
+def run(fn, *args):
+    argspec = tuple({'value': a} for a in args)
+    res = numpy_lin_pipeline.run(input=fn, argspec=argspec)
+    return res['output']
+
+
+def parse_compare(*tests, array=False):
+    def decorate(fn):
+        def test(args):
+            if not isinstance(args, tuple):
+                args = (args,)
+            py_result = fn(*map(copy, args))
+            myia_fn = run(fn, *args)
+            myia_result = myia_fn(*map(copy, args))
+            if array:
+                np.testing.assert_allclose(py_result, myia_result)
+                assert py_result.dtype == myia_result.dtype
+            else:
+                assert py_result == myia_result
+
+        m = mark.parametrize('args', list(tests))(test)
+        m.__orig__ = fn
+        return m
+    return decorate
+
+
+@parse_compare((1,))
+def test_numpy_add(a):
+    return a + 2
+
+
+@parse_compare((2, 3), (-7, 2))
+def test_numpy_floordiv(x, y):
+    return x // y
+
+
+@parse_compare((2.0, 3.0))
+def test_numpy_scalars(x, y):
+    return math.sin(x) * math.exp(y) - x / y
+
+
+@parse_compare((True, False), (False, False), (True, True))
+def test_numpy_bool_args(x, y):
+    # FinalVM passes bools as ints
+    return (not x, x and y, x or y, x == y)
+
+
+@parse_compare((True, 42, 33), (False, 42, 33))
+def test_numpy_call_hof(c, x, y):
+    def f1(x, y):
+        return x + y
+
+    def f2(x, y):
+        return x * y
+
+    def choose(c):
+        if c:
+            return f1
+        else:
+            return f2
+
+    return choose(c)(x, y) + choose(not c)(x, y)
+
+
+@parse_compare((MA(2, 3), MB(2, 3)), array=True)
+def test_numpy_array_map(x, y):
+    return x * y + x
+
+
+@parse_compare((MA(2, 3, dtype='int64'), MB(2, 3, dtype='int64') ** 2 + 1),
+               array=True)
+def test_numpy_array_map_int_div(x, y):
+    return array_map(scalar_div, x, y)
+
+
+@parse_compare((MA(2, 3), MB(2, 3)), array=True)
+def test_numpy_array_switch(x, y):
+    return array_map(switch, array_map(scalar_gt, x, y), x, y)
+
+
+@parse_compare((MA(2, 3),), array=True)
+def test_numpy_array_reduce(x):
+    return array_reduce(scalar_mul, x, (1, 3))
+
+
+@parse_compare((MA(2, 3),), array=True)
+def test_numpy_array_reduce_all(x):
+    return array_reduce(scalar_add, x, ())
+
+
+@parse_compare((MA(2, 3), MB(2, 3)), array=True)
+def test_numpy_array_reduce_bool(x, y):
+    return array_reduce(bool_or, array_map(scalar_gt, x, y), (2, 1))
+
+
+@parse_compare((MA(2, 3),))
+def test_numpy_array_0d(x):
+    s = array_reduce(scalar_add, x, ())
+    return array_to_scalar(array_map(scalar_mul, s, s))
+
+
+def test_numpy_pickle():
+    def f(x, y):
+        return x * y + 2.0
+
+    myia_fn = run(f, MA(2, 3), MB(2, 3))
+    myia_fn2 = pickle.loads(pickle.dumps(myia_fn))
+    np.testing.assert_allclose(myia_fn2(MA(2, 3), MB(2, 3)),
+                               f(MA(2, 3), MB(2, 3)))
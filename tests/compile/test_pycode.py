@@ -0,0 +1,130 @@
+from copy import copy
+import pickle
+
+import numpy as np
+from pytest import mark
+
+from myia.pipeline import standard_python_pipeline
+from myia.prim.py_implementations import array_reduce, scalar_add
+
+from ..common import MA, MB
+
+
+def run(fn, *args):
+    argspec = tuple({'value': a} for a in args)
+    res = standard_python_pipeline.run(input=fn, argspec=argspec)
+    return res['output']
+
+
+def parse_compare(*tests, array=False):
+    def decorate(fn):
+        def test(args):
+            if not isinstance(args, tuple):
+                args = (args,)
+            py_result = fn(*map(copy, args))
+            myia_fn = run(fn, *args)
+            myia_result = myia_fn(*map(copy, args))
+            if array:
+                np.testing.assert_allclose(py_result, myia_result)
+            else:
+                assert py_result == myia_result
+
+        m = mark.parametrize('args', list(tests))(test)
+        m.__orig__ = fn
+        return m
+    return decorate
+
+
+@parse_compare((2, 3), (-2.5, 1.5))
+def test_python_arith(x, y):
+    return -x * y + x ** 2 - y % 2
+
+
+@parse_compare((2, 3), (3, 2))
+def test_python_if(x, y):
+    if x > y:
+        return x - y
+    else:
+        return y - x
+
+
+@parse_compare((2, 3), (3, 2))
+def test_python_if_nottail(x, y):
+    if x > y:
+        z = x - y
+    else:
+        z = y - x
+    return z * 2
+
+
+@parse_compare((10,), (100000,))
+def test_python_while(n):
+    i = 0
+    r = 0
+    while i < n:
+        if i % 3 == 0:
+            r = r + i
+        i = i + 1
+    return r
+
+
+@parse_compare((100000,))
+def test_python_while_long(n):
+    i = 0
+    while i < n:
+        i = i + 1
+    return i
+
+
+@parse_compare((1,), (10,))
+def test_python_recursion(n):
+    def fib(n):
+        if n <= 1:
+            return n
+        return fib(n - 1) + fib(n - 2)
+    return fib(n)
+
+
+@parse_compare((2, 5))
+def test_python_closure(x, y):
+    def add(z):
+        return x + z
+
+    def twice(f, z):
+        return f(f(z))
+    return twice(add, y)
+
+
+@parse_compare((2, 5))
+def test_python_tuples(x, y):
+    t = (x, y, x + y)
+    a, b, c = t
+    return (c, a * b)
+
+
+@parse_compare((MA(2, 3), MB(2, 3)), array=True)
+def test_python_arrays(x, y):
+    return array_reduce(scalar_add, x * y + x, (1, 3))
+
+
+def test_python_loop_source():
+    def f(n):
+        i = 0
+        while i < n:
+            i = i + 1
+        return i
+
+    myia_fn = run(f, 3)
+    assert 'while True:' in myia_fn.fn.source
+
+
+def test_python_pickle():
+    def f(x, y):
+        if x < y:
+            return x * y
+        return x + y
+
+    myia_fn = run(f, 2, 3)
+    myia_fn2 = pickle.loads(pickle.dumps(myia_fn))
+    assert myia_fn2(2, 3) == 6
+    assert myia_fn2(4, 3) == 7
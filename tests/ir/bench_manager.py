@@ -0,0 +1,104 @@
+"""Benchmark the construction of a GraphManager on large graphs.
+
+Run with `python -m tests.ir.bench_manager`.
+"""
+
+import linecache
+import time
+
+from myia.graph_utils import dfs, FOLLOW, EXCLUDE
+from myia.ir import GraphManager, clone
+from myia.ir.utils import succ_deeper
+from myia.parser import parse
+from myia.utils import OrderedSet
+
+
+class ReplayGraphManager(GraphManager):
+    """GraphManager that fires one event per new node and edge."""
+
+    def _acquire_nodes(self, nodes):
+        def limit(x):
+            if x in self.all_nodes:
+                return EXCLUDE
+            else:
+                return FOLLOW
+
+        acq = OrderedSet()
+        for node in nodes:
+            new_nodes = OrderedSet(dfs(node, succ_deeper, limit))
+            self.all_nodes.update(new_nodes)
+            acq.update(new_nodes)
+
+        for node in acq:
+            g = node.graph
+            if g is not None:
+                self.add_graph(g)
+            self.events.add_node(node)
+            self._process_inputs(node, 1)
+
+
+def make_function(nfuncs, nstmts):
+    """Generate a function with many statements and nested closures."""
+    lines = ['def f(x, y):']
+    for i in range(nfuncs):
+        lines.append(f'    def g{i}(z):')
+        lines.append('        a = z * x + y')
+        for j in range(nstmts):
+            lines.append(f'        a = a * z + {j} - x')
+        lines.append('        return a')
+    calls = ' + '.join(f'g{i}(y)' for i in range(nfuncs))
+    lines.append(f'    return {calls}')
+    src = '\n'.join(lines) + '\n'
+    filename = f'<bench_manager_{nfuncs}_{nstmts}>'
+    # The parser needs to be able to retrieve the source code.
+    linecache.cache[filename] = (len(src), None, src.splitlines(True),
+                                 filename)
+    glob = {'__name__': __name__}
+    exec(compile(src, filename, 'exec'), glob)
+    return glob['f']
+
+
+STATISTICS = ['nodes', 'constants', 'free_variables_direct',
+              'graph_constants', 'graphs_used', 'graph_users',
+              'graph_dependencies_direct', 'graph_dependencies_prox']
+
+
+def bench(manager_class, graph, repeat, statistics=STATISTICS):
+    """Return the best time to manage a fresh clone of the graph.
+
+    The given statistics are requested before the graph is added, so that
+    they are maintained while it is acquired.
+    """
+    best = None
+    for _ in range(repeat):
+        g = clone(graph)
+        start = time.perf_counter()
+        mng = manager_class()
+        for stat in statistics:
+            getattr(mng, stat)
+        mng.add_graph(g, root=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(repeat=5):
+    """Compare bulk construction to replaying events for each edge.
+
+    The lazy column shows the time to build the manager when no statistic
+    is requested.
+    """
+    for nfuncs, nstmts in [(10, 10), (50, 20), (100, 20)]:
+        graph = parse(make_function(nfuncs, nstmts))
+        nnodes = len(GraphManager(clone(graph)).all_nodes)
+        t_replay = bench(ReplayGraphManager, graph, repeat)
+        t_bulk = bench(GraphManager, graph, repeat)
+        t_lazy = bench(GraphManager, graph, repeat, statistics=[])
+        print(f'{nnodes:7} nodes: replay {t_replay * 1000:8.2f}ms, '
+              f'bulk {t_bulk * 1000:8.2f}ms, '
+              f'speedup {t_replay / t_bulk:.2f}x, '
+              f'lazy {t_lazy * 1000:8.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,8 @@ from collections import Counter
 
 from myia.pipeline import scalar_parse as parse
 from myia.debug.label import short_labeler
-from myia.ir import manage, GraphManager, GraphCloner, ManagerError
+from myia.ir import manage, Constant, GraphManager, GraphCloner, \
+    ManagerError
 from myia.prim import Primitive
 from myia.utils import OrderedSet
 
@@ -812,3 +813,89 @@ def test_graph_properties():
         assert g.children is mng.children[g]
         assert g.scope is mng.scopes[g]
         assert g.recursive is mng.recursive[g]
+
+
+def test_bulk_events():
+
+    @clone
+    @parse
+    def f(x, y):
+        def g(z):
+            return z * x
+        return g(y) + x
+
+    mng = GraphManager()
+    fired = Counter()
+
+    def count(event, *args):
+        fired[event.name] += 1
+
+    for name in ('add_node', 'add_nodes', 'add_edge', 'add_edges'):
+        getattr(mng.events, name).register(count)
+
+    mng.add_graph(f)
+    assert fired['add_node'] == 0
+    assert fired['add_edge'] == 0
+    assert fired['add_nodes'] == fired['add_edges'] >= 1
+    _check_uses(mng)
+
+    fired.clear()
+    f.output = f.apply(f.parameters[0], f.parameters[1])
+    assert fired['add_edge'] == 1
+    _check_uses(mng)
+
+
+def test_calls_statistic():
+
+    @clone
+    @parse
+    def f(x, y):
+        def g(z):
+            return z * x
+        return g(y) + g(x)
+
+    mng = GraphManager(f)
+    g, = mng.graphs_used[f]
+    assert len(mng.calls[g]) == 2
+    calls = mng.calls
+    assert all(node.graph is f for node in calls[g])
+
+    f.output = f.apply(swap, f.parameters[0])
+    assert g not in calls
+    assert list(calls[swap]) == [f.output]
+    assert swap2 not in calls
+
+    # Another constant with the same value, as left by CSE
+    out = f.output
+    mng.set_edge(out, 0, Constant(swap))
+    assert list(calls[swap]) == [out]
+    f.output = f.parameters[0]
+    assert swap not in calls
+    _check_uses(mng)
+
+
+def test_lazy_statistics():
+
+    @clone
+    @parse
+    def f(x, y):
+        def g(z):
+            return z * x
+        return g(y) + 1
+
+    mng = GraphManager(f)
+    assert 'constants' not in mng._statistics
+    assert 'free_variables_total' not in mng._statistics
+
+    g, = mng.graphs_used[f]
+    assert set(mng.free_variables_total[g]) == {f.parameters[0]}
+    assert 'free_variables_direct' in mng._statistics
+    assert 'constants' not in mng._statistics
+
+    # A statistic requested late must match the current state, and must
+    # be updated afterwards.
+    assert {ct.value for ct in mng.constants[f]} >= {1}
+    f.output = f.apply(g, f.parameters[1])
+    assert 1 not in {ct.value for ct in mng.constants[f]}
+    assert set(mng.free_variables_total[g]) == {f.parameters[0]}
+    _check_uses(mng)
@@ -0,0 +1,154 @@
+
+import pytest
+
+from myia.dtype import Bool, Float, Int, Number, Tuple
+from myia.ir import Graph, MetaGraph, MultitypeGraph, SpecializationCache
+from myia.ir.metagraph import GraphGenerationError
+
+i64 = Int[64]
+
+
+class Thing:
+    pass
+
+
+def test_MultitypeGraph_dispatch():
+    mt = MultitypeGraph('mt')
+
+    @mt.register(i64, i64)
+    def _ii(x, y):
+        return 'ii'
+
+    @mt.register(Number, Number)
+    def _nn(x, y):
+        return 'nn'
+
+    @mt.register(Tuple[i64, Bool])
+    def _tup(x):
+        return 'tup'
+
+    @mt.register(Thing)
+    def _thing(x):
+        return 'thing'
+
+    for _ in range(2):
+        assert mt(1, 2) == 'ii'
+        assert mt(1.0, 2) == 'nn'
+        assert mt(1.0, 2.0) == 'nn'
+        assert mt((1, True)) == 'tup'
+        # Non-Myia types, like inferrers, are matched with isinstance
+        assert mt._getfn((Thing(),)) is _thing
+
+        with pytest.raises(GraphGenerationError):
+            mt((1, 2))
+
+        with pytest.raises(GraphGenerationError):
+            mt(True, True)
+
+        with pytest.raises(GraphGenerationError):
+            mt(1, 2, 3)
+
+
+def test_MultitypeGraph_memo():
+    mt = MultitypeGraph('mt')
+
+    @mt.register(Number)
+    def _n(x):
+        return 'n'
+
+    @mt.register(Thing)
+    def _thing(x):
+        return 'thing'
+
+    assert mt(1) == 'n'
+    assert list(mt._memo) == [(i64,)]
+    # Instances of other types are resolved every time, so that they are
+    # not kept alive by the memo
+    for _ in range(3):
+        assert mt._getfn((Thing(),)) is _thing
+    assert list(mt._memo) == [(i64,)]
+
+
+def test_MultitypeGraph_memo_bound():
+    mt = MultitypeGraph('mt', cache=SpecializationCache(maxsize=2))
+
+    @mt.register(Number)
+    def _n(x):
+        return 'n'
+
+    for t in (i64, Float[64], i64, Int[32]):
+        assert mt._getfn((t,)) is _n
+    assert list(mt._memo) == [(i64,), (Int[32],)]
+    assert mt._memo.info() == dict(size=2, maxsize=2, hits=1,
+                                   misses=3, evictions=1)
+
+
+def test_MultitypeGraph_register():
+    def _n(x):
+        return 'n'
+
+    mt = MultitypeGraph('mt', {(Number,): _n})
+    assert mt(1) == 'n'
+    with pytest.raises(GraphGenerationError):
+        mt(True)
+
+    @mt.register(Bool)
+    def _b(x):
+        return 'b'
+
+    assert mt(True) == 'b'
+
+    # Earlier entries take precedence over later ones
+    @mt.register(i64)
+    def _i(x):
+        return 'i'
+
+    assert mt(1) == 'n'
+
+
+class Counter(MetaGraph):
+    def __init__(self, name, cache=None):
+        super().__init__(name, cache)
+        self.count = 0
+
+    def specialize_from_types(self, types):
+        self.count += 1
+        g = Graph()
+        g.debug.name = f'{self.name}{types}'
+        return g
+
+
+def test_MetaGraph_cache():
+    mg = Counter('mg', SpecializationCache(maxsize=2))
+    g1 = mg.generate_graph((i64,))
+    assert mg.generate_graph((i64,)) is g1
+    g2 = mg.generate_graph((Bool,))
+    assert mg.count == 2
+    assert mg.cache.info() == dict(size=2, maxsize=2, hits=1,
+                                   misses=2, evictions=0)
+
+    # Looking (i64,) up again makes (Bool,) the least recently used
+    # entry, so adding (Number,) evicts (Bool,) and keeps (i64,)
+    mg.generate_graph((i64,))
+    mg.generate_graph((Number,))
+    assert mg.count == 3
+    assert (mg, (i64,)) in mg.cache
+    assert (mg, (Bool,)) not in mg.cache
+    assert mg.generate_graph((Bool,)) is not g2
+    assert mg.count == 4
+    assert mg.cache.evictions == 2
+    assert len(mg.cache) == 2
+
+    mg.cache.clear()
+    assert len(mg.cache) == 0
+
+
+def test_MetaGraph_shared_cache():
+    cache = SpecializationCache(maxsize=None)
+    mg1 = Counter('mg1', cache)
+    mg2 = Counter('mg2', cache)
+    g1 = mg1.generate_graph((i64,))
+    g2 = mg2.generate_graph((i64,))
+    assert g1 is not g2
+    assert mg1.generate_graph((i64,)) is g1
+    assert set(cache) == {(mg1, (i64,)), (mg2, (i64,))}
@@ -1,7 +1,7 @@
 
 from .test_opt import _check_opt
 from myia import dtype
-from myia.composite import hyper_add
+from myia.composite import hyper_add, zeros_like
 from myia.opt import lib
 from myia.prim.py_implementations import \
     scalar_add, scalar_mul, tuple_setitem, identity, partial, switch, \
@@ -223,6 +223,26 @@ def test_add_zero():
                lib.add_zero_r)
 
 
+def test_add_zeros_like():
+
+    def before1(x, y):
+        return hyper_add(x, zeros_like(y))
+
+    def before2(x, y):
+        return hyper_add(zeros_like(y), x)
+
+    def after(x, y):
+        return x
+
+    _check_opt(before1, after,
+               lib.add_zeros_like_l,
+               lib.add_zeros_like_r)
+
+    _check_opt(before2, after,
+               lib.add_zeros_like_l,
+               lib.add_zeros_like_r)
+
+
 def test_elim_identity():
 
     def before(x, y):
@@ -258,6 +278,27 @@ def test_elim_distribute():
                          'shape': (3, 1)}])
 
 
+def test_add_zero_array():
+
+    def before1(x):
+        return array_map(scalar_add, x,
+                         distribute(scalar_to_array(0.0), (3, 5)))
+
+    def before2(x):
+        return array_map(scalar_add,
+                         distribute(scalar_to_array(0.0), (3, 5)), x)
+
+    def after(x):
+        return x
+
+    for before in (before1, before2):
+        _check_opt(before, after,
+                   lib.add_zero_array_l,
+                   lib.add_zero_array_r,
+                   argspec=[{'type': dtype.Array[dtype.Float[64]],
+                             'shape': (3, 5)}])
+
+
 def test_elim_transpose():
 
     def before1(x):
@@ -340,6 +340,36 @@ def test_cse():
 
     helper(f2, 12, 8)
 
+    def f3(x):
+        return (x, 1, True)
+
+    g = parse(f3)
+    cse(g, g.manager)
+    assert [i.value for i in g.output.inputs[2:]] == [1, True]
+    assert g.output.inputs[2] is not g.output.inputs[3]
+
+
+def test_cse_incremental():
+    def f(x, y):
+        a = x + y
+        b = x * y
+        return a * b
+
+    g = parse(f)
+    mng = g.manager
+    # This merges the two scalar_mul constants
+    assert cse(g, mng)
+    assert not mng.value_numbers.dirty
+    assert not cse(g, mng)
+
+    a, b = g.output.inputs[1:]
+    assert a.inputs[0] is not b.inputs[0]
+    mng.set_edge(b, 0, a.inputs[0])
+    assert list(mng.value_numbers.dirty) == [b]
+    assert cse(g, mng)
+    assert g.output.inputs[1] is g.output.inputs[2]
+    assert len(g.nodes) == 5
+
 
 opt_ok1 = psub(
     (prim.scalar_add, X, Y),
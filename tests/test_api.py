@@ -1,7 +1,8 @@
 import numpy as np
+import pickle
 import pytest
 
-from myia.api import myia
+from myia.api import myia, _function_reference, _resolve_function
 from myia.cconv import closure_convert
 from myia.dtype import List, Array, Tuple, Bool
 from myia.infer import InferenceError
@@ -50,6 +51,63 @@ def test_myia_specialize_values():
     assert ft is not ff
 
 
+def test_myia_lean():
+    @myia(lean=True)
+    def f(x, y):
+        return x + y
+
+    assert f(10, 20) == 30
+    assert f(1.5, 2.0) == 3.5
+    assert list(f.specialize((10, 20)).keys()) == ['output']
+    assert f.compile((10, 20)) is f.compile((100, 200))
+
+
+def test_myia_precompile():
+    @myia
+    def f(x, y):
+        return x + y
+
+    f.precompile([(1, 2), (1.0, 2.0), (3, 4)])
+    assert len(f._cache) == 2
+    fi = f.compile((10, 20))
+    f.precompile([(5, 6)])
+    assert f.compile((10, 20)) is fi
+    assert fi(10, 20) == 30
+
+
+def _add(x, y):
+    return x + y
+
+
+def test_myia_precompile_workers():
+    f = myia(_add)
+    f.precompile([(1, 2), (1.0, 2.0), (3, 4)], workers=2)
+    assert len(f._cache) == 2
+    assert list(f.specialize((10, 20)).keys()) == ['output']
+    assert f(10, 20) == 30
+    assert f(1.5, 2.0) == 3.5
+
+
+@myia
+def _decorated_mul(x, y):
+    return x * y
+
+
+def test_myia_precompile_workers_decorated():
+    f = _decorated_mul
+    f.precompile([(2, 3), (2.0, 3.0)], workers=2)
+    assert len(f._cache) == 2
+    assert f(4, 5) == 20
+    assert f(1.5, 2.0) == 3.0
+
+
+def test_function_reference():
+    ref = _function_reference(_decorated_mul.fn)
+    assert pickle.loads(pickle.dumps(ref)) == ref
+    assert _resolve_function(*ref) is _decorated_mul.fn
+    assert _resolve_function(*_function_reference(_add)) is _add
+
+
 def test_myia_struct_arg():
     @myia
     def f(pt):
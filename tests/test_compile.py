@@ -1,18 +1,32 @@
-from pytest import mark
+from pytest import mark, raises
 from copy import copy
+import io
+import json
 import numpy as np
+import os
+import pickle
 
 
+from myia.compile import save_program, load_program
+from myia.compile.aot import parse_signature, compile_ahead_of_time
+from myia.compile.serialize import FORMAT_VERSION
+from myia.compile.vm import DEFAULT_RELEASE_THRESHOLD, MAX_KEPT_STACK_SIZE
+from myia.dshape import NOSHAPE, TupleShape
+from myia.dtype import Array, Bool, Float, Int, Tuple, UInt
 from myia.pipeline import standard_pipeline, standard_debug_pipeline
 from myia.prim import ops as P
 from myia.prim.py_implementations import \
-    typeof, scalar_add, partial
+    typeof, scalar_add, partial, array_reduce
 
 compile_pipeline = standard_pipeline
 
 debug_fn = standard_debug_pipeline \
     .select('parse', 'resolve', 'infer', 'specialize', 'export')
 
+# Runs FinalVM without requiring NNVM.
+debug_lin_pipeline = standard_pipeline.configure({
+    'compile.linear_impl': 'debug'})
+
 
 def parse_compare(*tests, optimize=True, array=False, python=True):
     """Decorate a function to parse and run it against pure Python.
@@ -97,6 +111,108 @@ def test_tailcall(x):
     return fsum(x, 1)
 
 
+@parse_compare((0,), (1,), (1000,))
+def test_while(n):
+    i = 0
+    while i < n:
+        i = i + 1
+    return i
+
+
+@parse_compare((0,), (1,), (1000,))
+def test_while_if(n):
+    i = 0
+    s = 0
+    while i < n:
+        if i % 3 == 0:
+            s = s + i
+        else:
+            s = s - 1
+        i = i + 1
+    return s
+
+
+@parse_compare((7, 3), (3, 7))
+def test_tailcall_partial(x, y):
+    def f(a, b):
+        return a - b
+
+    def g(a, b):
+        return b - a
+
+    if x > y:
+        h = partial(f, x)
+    else:
+        h = partial(g, x)
+    return h(y)
+
+
+def test_tailcall_jump():
+    def loop(n):
+        i = 0
+        while i < n:
+            i = i + 1
+        return i
+
+    res = debug_lin_pipeline.run(input=loop, argspec=({'value': 1},))
+    ops = [instr[0] for instr in res['instrs']]
+    assert 'tailcall' not in ops
+    assert 'call' not in ops
+    assert 'switch_jump' in ops
+    assert res['output'](1000) == 1000
+
+
+def _rsum(n):
+    if n == 0:
+        return 0
+    return n + _rsum(n - 1)
+
+
+def test_deep_recursion():
+    res = debug_lin_pipeline.run(input=_rsum, argspec=({'value': 1},))
+    vm = res['output'].fn
+    assert vm.release_threshold == DEFAULT_RELEASE_THRESHOLD
+    stack = vm.stack
+    size = len(stack)
+    assert res['output'](1000) == 1000 * 1001 // 2
+    assert res['output'](3) == 6
+    # The stack grew for the recursion, and is reused and cleared
+    assert vm.stack is stack
+    assert size < 1000 < len(stack) <= MAX_KEPT_STACK_SIZE
+    assert vm.top == 0
+    assert all(v is None for v in stack)
+
+    # A stack that grew too large is shrunk back after the call
+    assert res['output'](10000) == 10000 * 10001 // 2
+    assert len(vm.stack) == vm.stack_size == size
+    assert vm.top == 0
+    assert all(v is None for v in vm.stack)
+
+
+def _array_sum(x, n):
+    while n > 0:
+        x = x + x
+        n = n - 1
+    return array_reduce(scalar_add, x, ())
+
+
+def test_release_threshold():
+    pipeline = standard_pipeline.configure({
+        'compile.linear_impl': 'numpy',
+        'export.release_threshold': 0})
+    x = np.ones((4, 4))
+    res = pipeline.run(input=_array_sum,
+                       argspec=({'value': x}, {'value': 3}))
+    vm = res['output'].fn
+    assert vm.release_threshold == 0
+    assert res['output'](x, 3) == 128
+    assert not vm.releasing
+    assert all(v is None for v in vm.stack)
+    vm2 = pickle.loads(pickle.dumps(vm))
+    assert vm2.release_threshold == 0
+    assert vm2(x, 3) == 128
+
+
 @parse_compare((-1,), (1,))
 def test_callp(x):
     def fn(f, x):
@@ -149,3 +265,92 @@ def test_switch_nontail():
     for test in [(6, 23, 23**2), (67, 23, 67**2)]:
         *args, expected = test
         assert myia_fn(*args) == expected
+
+
+def _serialize_fn(x, y):
+    def f(z):
+        return z * y
+    if x > y:
+        return f(x) + 1
+    else:
+        return f(y) - x
+
+
+def test_pickle_program():
+    argspec = ({'value': 3}, {'value': 4})
+    myia_fn = compile_pipeline.run(input=_serialize_fn,
+                                   argspec=argspec)['output']
+    myia_fn2 = pickle.loads(pickle.dumps(myia_fn))
+    for args in [(3, 4), (10, 2)]:
+        assert myia_fn2(*args) == _serialize_fn(*args)
+
+
+def test_save_program(tmpdir):
+    argspec = ({'value': 3}, {'value': 4})
+    myia_fn = compile_pipeline.run(input=_serialize_fn,
+                                   argspec=argspec)['output']
+    path = str(tmpdir.join('prog'))
+    save_program(myia_fn, path)
+    assert os.path.exists(os.path.join(path, 'program.pkl'))
+    assert os.path.exists(os.path.join(path, 'segment0.so'))
+    myia_fn2 = load_program(path)
+    for args in [(3, 4), (10, 2)]:
+        assert myia_fn2(*args) == _serialize_fn(*args)
+
+
+class _Unloadable:
+    def __reduce__(self):
+        return (_fail_loading, ())
+
+
+def _fail_loading():
+    raise AssertionError('the program should not be loaded')
+
+
+def test_load_program_version(tmpdir):
+    path = str(tmpdir.join('prog'))
+    save_program(_Unloadable(), path)
+    with open(os.path.join(path, 'program.pkl'), 'rb') as f:
+        assert pickle.load(f) == FORMAT_VERSION
+        data = f.read()
+    with open(os.path.join(path, 'program.pkl'), 'wb') as f:
+        pickle.dump(FORMAT_VERSION + 1, f)
+        f.write(data)
+    with raises(ValueError, match='Unsupported program format version'):
+        load_program(path)
+
+
+def test_parse_signature():
+    assert parse_signature('f64, i32') == (
+        {'type': Float[64], 'shape': NOSHAPE},
+        {'type': Int[32], 'shape': NOSHAPE},
+    )
+    assert parse_signature('float32[2, 3], (bool, u8[4])') == (
+        {'type': Array[Float[32]], 'shape': (2, 3)},
+        {'type': Tuple[Bool, Array[UInt[8]]],
+         'shape': TupleShape((NOSHAPE, (4,)))},
+    )
+    assert parse_signature('') == ()
+    for sig in ['f65', 'f64[x]', 'f64 f64', '(f64', 'f64)', 'f64[3 4]',
+                'f64,', 'f64, ,f64', '(f64,)', 'f64[3,]', 'f64[3', ',']:
+        with raises(ValueError):
+            parse_signature(sig)
+
+
+def test_compile_ahead_of_time(tmpdir):
+    out = io.StringIO()
+    path = str(tmpdir.join('out'))
+    compile_ahead_of_time(_serialize_fn, ['i64, i64', 'f64, f64'], path,
+                          out=out)
+    report = out.getvalue()
+    assert '_serialize_fn(i64, i64)' in report
+    assert 'infer' in report
+
+    with open(os.path.join(path, 'signatures.json')) as f:
+        index = json.load(f)
+    sigs = [entry['signature'] for entry in index]
+    assert sigs == ['i64, i64', 'f64, f64']
+    fi = load_program(os.path.join(path, index[0]['path']))
+    ff = load_program(os.path.join(path, index[1]['path']))
+    assert fi(10, 2) == _serialize_fn(10, 2)
+    assert ff(1.5, 2.0) == _serialize_fn(1.5, 2.0)
@@ -1,4 +1,5 @@
 import asyncio
+import pickle
 import pytest
 import numpy
 from dataclasses import dataclass
@@ -62,6 +63,21 @@ def test_Function():
     assert c.retval is Float[32]
     c2 = Function[[], Float[32]]
     assert c is c2
+    f = Function[[Int[64], Bool], Float[32]]
+    assert f is Function[(Int[64], Bool), Float[32]]
+    assert f.arguments == (Int[64], Bool)
+    assert f is not Function[(Bool, Int[64]), Float[32]]
+
+
+def test_interning():
+    c1 = Class[Point, {'x': Int[64], 'y': Int[64]}, {}]
+    c2 = Class[Point, {'y': Int[64], 'x': Int[64]}, {}]
+    assert c1 is c2
+    assert c1 is not Class[Point, {'x': Int[64], 'y': Float[64]}, {}]
+    f1 = Function[[c1, Tuple[[Bool]]], List[c1]]
+    f2 = Function[(c2, Tuple[Bool]), List[c2]]
+    assert f1 is f2
+    assert hash(f1) == hash(f2)
 
 
 def test_make_subtype():
@@ -172,6 +188,15 @@ def test_pytype_to_myiatype():
     assert ptm(object) is External[object]
 
 
+def test_pickle():
+    for t in [Int, Int[64], Tuple[Bool, Array[Float[32]]],
+              List[UInt[8]], External[str]]:
+        assert pickle.loads(pickle.dumps(t)) is t
+
+    pcls = ptm(Point, Point(1, 2))
+    assert pickle.loads(pickle.dumps(pcls)) is pcls
+
+
 def test_type_cloner():
 
     t1 = Function[
@@ -4,18 +4,23 @@ import numpy as np
 from types import FunctionType
 from dataclasses import dataclass
 
-from myia.pipeline import standard_resources, standard_pipeline
-from myia.composite import grad
+from myia.pipeline import standard_resources, standard_pipeline, \
+    standard_debug_pipeline
+from myia.composite import grad, checkpoint, zeros_like
 from myia.debug.finite_diff import GradTester, NoTestGrad, clean_args
 from myia.dtype import JTagged
 from myia.grad import J as realJ
 from myia.pipeline import pipeline_function, PipelineDefinition, steps
 from myia.pipeline.steps import Validator
+from myia.ir import Graph, manage
 from myia.prim import ops as P, Primitive
+from myia.prim.grad_implementations import AugmentedGraphRegistry, \
+    bprop_to_augm
 from myia.prim.py_implementations import J, scalar_add, scalar_mul, \
     array_to_scalar, scalar_to_array, array_map, array_reduce, scalar_div, \
     distribute, dot, reshape, transpose, scalar_cast
 from myia.prim.py_implementations import py_implementations as pyi
+from myia.utils import Override
 from myia.validate import whitelist, validate_type
 
 from .common import f64, u64, MA, MB
@@ -71,6 +76,9 @@ grad_pipeline = PipelineDefinition(
 )
 
 
+grad_opt_pipeline = grad_pipeline.configure(opt=Override(steps.step_opt))
+
+
 def test_GradTester():
 
     def f(x, y):
@@ -156,6 +164,60 @@ def _grad_test(fn, obj, args,
     gtest.assert_match()
 
 
+def test_augmented_graphs_lazy():
+    built = []
+
+    def builder(prim, fn):
+        built.append(prim)
+        return bprop_to_augm(prim, fn)
+
+    def bprop_scalar_add(x, y, out, dout):
+        return (dout, dout)
+
+    reg = AugmentedGraphRegistry()
+    reg.register_builder(P.scalar_add, builder, bprop_scalar_add)
+    assert P.scalar_add in reg
+    assert P.scalar_mul not in reg
+    assert built == []
+
+    g = reg[P.scalar_add]
+    assert isinstance(g, Graph)
+    assert g.transforms['primal'] is P.scalar_add
+    assert reg[P.scalar_add] is g
+    assert built == [P.scalar_add]
+
+    with pytest.raises(KeyError):
+        reg[P.scalar_mul]
+
+
+def test_augmented_graphs_registry():
+    def bprop_scalar_add(x, y, out, dout):
+        return (dout, dout)
+
+    def bad_builder(prim, fn):
+        raise ValueError(prim)
+
+    reg = AugmentedGraphRegistry()
+    reg.register_builder(P.scalar_add, bprop_to_augm, bprop_scalar_add)
+    reg.register_builder(P.scalar_mul, bad_builder, None)
+
+    # Primitives that are not built yet are listed like the others
+    assert len(reg) == 2
+    assert set(reg.keys()) == {P.scalar_add, P.scalar_mul}
+    assert reg.get(P.scalar_sub) is None
+
+    # A failed build keeps its builder, and fails the same way again
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            reg[P.scalar_mul]
+    assert P.scalar_mul in reg
+
+    g = reg.get(P.scalar_add)
+    assert isinstance(g, Graph)
+    assert reg[P.scalar_add] is g
+    assert len(reg) == 2
+
+
 @pytest.mark.parametrize('prim,cases', prim_tests.items())
 def test_prim_grads(prim, cases):
     for case in cases:
@@ -369,6 +431,55 @@ def test_functions_in_tuples(x, y):
     return f(x, y) + g(x, y)
 
 
+@checkpoint
+def _checkpointed(x, y):
+    a = x * y
+    return a * a + x
+
+
+@grad_test((2.0, 3.0), (-1.5, 0.5))
+def test_checkpoint(x, y):
+    return _checkpointed(_checkpointed(x, y), y)
+
+
+@grad_test((2.0, 3.0), (-1.5, 0.5), pipeline=grad_opt_pipeline)
+def test_checkpoint_opt(x, y):
+    return _checkpointed(_checkpointed(x, y), y)
+
+
+def test_checkpoint_recomputes():
+    def f(x, y):
+        return _checkpointed(x, y)
+
+    def gf(x, y):
+        return grad(f)(x, y)
+
+    pip = grad_opt_pipeline.select('parse', 'resolve', 'infer',
+                                   'specialize', 'opt')
+    res = pip.run(input=gf, argspec=[{'value': 2.0}, {'value': 3.0}])
+    g = res['graph']
+    ckpt = [g2 for g2 in g.manager.graphs
+            if g2.flags.get('checkpoint_bprop')]
+    # The output is not used, so only the backpropagator remains. It is not
+    # inlined, and only keeps the inputs alive.
+    bprop, = ckpt
+    assert bprop.parent is g
+    assert len(bprop.free_variables_total) == 2
+    # Once J is expanded, the primal function can be inlined again
+    assert not any(g2.flags.get('checkpoint') for g2 in g.manager.graphs)
+
+
+def test_checkpoint_inlined_without_grad():
+    def f(x, y):
+        return _checkpointed(x, y) * 2.0
+
+    pip = grad_opt_pipeline.select('parse', 'resolve', 'infer',
+                                   'specialize', 'opt')
+    res = pip.run(input=f, argspec=[{'value': 2.0}, {'value': 3.0}])
+    g = res['graph']
+    assert list(g.manager.graphs) == [g]
+
+
 @grad_test((4.5, 6.7),)
 def test_closures_in_tuples(x, y):
     def f():
@@ -472,3 +583,32 @@ def test_freegraph_outside_grad():
         return bprop(1)[1]
 
     assert _runwith(f, 5.0, 8.0) == 25.0
+
+
+def test_sparse_tuple_sensitivities():
+
+    def f(x, y):
+        t = (x * y, x + y, x - y, y)
+        return t[0] * t[1] * t[2]
+
+    def df(x, y):
+        return grad(f)(x, y)
+
+    pip = standard_debug_pipeline.select('parse', 'resolve', 'infer',
+                                         'specialize', 'erase_class', 'opt')
+    argspec = [{'value': 2.0}, {'value': 3.0}]
+    res = pip.run(input=f, argspec=argspec)
+    jg = realJ(res['graph'], res['graph'].manager)
+    mng = manage(jg, weak=True)
+    # The sensitivity of t is built element by element, with a zero for
+    # t[3], rather than by adding up tuples of zeros with one element set
+    sens_t, = [node for node in mng.all_nodes
+               if node.is_apply(P.make_tuple)
+               and any(i.is_apply(zeros_like) for i in node.inputs)]
+    assert [i.is_apply(zeros_like) for i in sens_t.inputs[1:]] == \
+        [False, False, False, True]
+
+    pip = standard_debug_pipeline.configure(opt=Override(steps.step_opt))
+    res = pip.run(input=df, argspec=argspec)
+    # d/dx (xy * (x + y) * (x - y)) = d/dx (x^3 y - x y^3) = 3x^2 y - y^3
+    assert res['output'](2.0, 3.0) == 9.0
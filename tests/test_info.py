@@ -1,5 +1,6 @@
 from threading import Thread
-from myia.info import DebugInfo, DebugInherit, NamedDebugInfo, About
+from myia.info import DebugInfo, DebugInherit, NamedDebugInfo, About, \
+    StripDebugInfo, stripping_debug_info, strip_debug_info
 
 
 def test_nested_info():
@@ -69,3 +70,25 @@ def test_info_thread():
     t.join()
     if exc:
         raise exc
+
+
+def test_strip_debug_info():
+    a = NamedDebugInfo()
+    assert not stripping_debug_info()
+    with StripDebugInfo():
+        assert stripping_debug_info()
+        with StripDebugInfo():
+            with About(a, 'thing'):
+                b = NamedDebugInfo()
+        assert stripping_debug_info()
+    assert not stripping_debug_info()
+    assert b.about is None
+    assert b.find('field1') is None
+
+    with About(a, 'thing'):
+        with DebugInherit(ast='ast'):
+            c = NamedDebugInfo()
+    assert c.about.debug is a
+    strip_debug_info(c)
+    assert c.about is None
+    assert not hasattr(c, 'ast')
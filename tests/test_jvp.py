@@ -0,0 +1,210 @@
+
+import pytest
+import numpy as np
+from dataclasses import dataclass, fields, is_dataclass
+
+from myia.composite import grad, jvp
+from myia.jvp import JVP
+from myia.ir import Graph, GraphManager
+from myia.pipeline import standard_debug_pipeline
+from myia.prim import ops as P
+from myia.prim.py_implementations import array_reduce, scalar_add, dot, \
+    reshape, transpose
+
+from .common import f64, MA, MB
+from .test_grad import grad_pipeline, grad_opt_pipeline
+
+
+@dataclass
+class Point:
+    x: f64
+    y: f64
+
+    def norm2(self):
+        return self.x * self.x + self.y * self.y
+
+
+def _axpy(a, x, y):
+    if isinstance(x, tuple):
+        return tuple(_axpy(a, x2, y2) for x2, y2 in zip(x, y))
+    if is_dataclass(x):
+        return type(x)(*[_axpy(a, getattr(x, f.name), getattr(y, f.name))
+                         for f in fields(x)])
+    return a * x + y
+
+
+def finite_diff(fn, args, tangents, eps=1e-6):
+    """Estimate the derivative of fn at args in the direction of tangents."""
+    args1 = [_axpy(eps, d, x) for x, d in zip(args, tangents)]
+    args0 = [_axpy(-eps, d, x) for x, d in zip(args, tangents)]
+    return (np.asarray(fn(*args1)) - np.asarray(fn(*args0))) / (2 * eps)
+
+
+def _jvp_test(fn, args, tangents, pipeline, rel_error=1e-4):
+    nargs = len(args)
+
+    if nargs == 1:
+        def jfn(x, dx):
+            return jvp(fn)(x, dx)
+    else:
+        def jfn(x, y, dx, dy):
+            return jvp(fn)(x, y, dx, dy)
+
+    argspec = [{'value': arg} for arg in (*args, *tangents)]
+    res = pipeline.run(input=jfn, argspec=argspec)
+    out, dout = res['output'](*args, *tangents)
+    assert np.allclose(out, fn(*args))
+    expected = finite_diff(fn, args, tangents)
+    assert np.allclose(dout, expected, rtol=rel_error), \
+        f'Tangent mismatch for {nargs} arguments: {dout} != {expected}'
+
+
+def jvp_test(*tests, pipelines=(grad_pipeline, grad_opt_pipeline)):
+    """Decorate a function to check its JVP against finite differences.
+
+    Arguments:
+        tests: One or more (args, tangents) tuples.
+        pipelines: The pipelines to compile the JVP with.
+
+    """
+
+    def decorate(fn):
+        def test(args, tangents, pipeline):
+            _jvp_test(fn, args, tangents, pipeline)
+
+        m = pytest.mark.parametrize('pipeline', pipelines)(test)
+        m = pytest.mark.parametrize('args,tangents', list(tests))(m)
+        m.__orig__ = fn
+        return m
+    return decorate
+
+
+@jvp_test(((13.0, 14.0), (1.0, 2.0)))
+def test_jvp_null(x, y):
+    return 0.0
+
+
+@jvp_test(((3.0, 4.0), (1.0, 0.0)), ((3.0, 4.0), (-0.5, 2.0)))
+def test_jvp_expr(x, y):
+    return x ** 3.0 * y + x / y - 2.0 ** y
+
+
+@jvp_test(((-1.5, 2.0), (1.0, 0.0)))
+def test_jvp_pow_negative(x, y):
+    return x ** y
+
+
+@jvp_test(((0.5, 0.2), (1.0, 2.0)))
+def test_jvp_trig(x, y):
+    return np.sin(x) * np.cos(y) + np.tan(x) + np.exp(y) + np.log(x)
+
+
+@jvp_test(((4.0, 5.0), (1.0, 0.5)), ((6.4, -7.8), (1.0, 0.5)))
+def test_jvp_if(a, b):
+    if a > b:
+        return a * b
+    else:
+        return a + b * b
+
+
+@jvp_test(((1.5,), (1.0,)))
+def test_jvp_while(x):
+    r = x
+    i = 0
+    while i < 3:
+        r = r * x
+        i = i + 1
+    return r
+
+
+@jvp_test(((4.1,), (1.0,)))
+def test_jvp_fact(x):
+    def fact(n):
+        if n <= 1:
+            return n
+        return n * fact(n - 1)
+    return fact(x)
+
+
+@jvp_test(((1.5, 2.0), (1.0, -1.0)))
+def test_jvp_closure(x, y):
+    def g(z):
+        return x * z + y
+    return g(x) * g(y)
+
+
+@jvp_test(((1.5, 2.0), (1.0, -1.0)))
+def test_jvp_hof(x, y):
+    def h(f, z):
+        return f(z) * z
+
+    def sq(z):
+        return z * z
+    return h(sq, x) + h(sq, y)
+
+
+@jvp_test(((1.5, 2.0), (1.0, -1.0)))
+def test_jvp_tuples(x, y):
+    a, b = (x * y, x + y)
+    return a * b
+
+
+@jvp_test(((MA(2, 3), MB(2, 3)), (MB(2, 3), MA(2, 3))))
+def test_jvp_array_operations(xs, ys):
+    return array_reduce(scalar_add, xs * ys + xs, ())
+
+
+@jvp_test(((MA(2, 3), MB(2, 3)), (MB(2, 3), MA(2, 3))))
+def test_jvp_array_reshape_transpose(xs, ys):
+    zs = reshape(transpose(xs, (1, 0)), (2, 3))
+    return array_reduce(scalar_add, zs * ys, ())
+
+
+@jvp_test(((MA(2, 3), MB(3, 4)), (MB(2, 3), MA(3, 4))))
+def test_jvp_dot(x, y):
+    return dot(x, y) * 2.0
+
+
+@jvp_test(((Point(1.0, 2.0),), (Point(1.0, -0.5),)),
+          pipelines=(standard_debug_pipeline,))
+def test_jvp_dataclass(pt):
+    return pt.norm2() * pt.x
+
+
+def test_hessian_vector_product():
+    def f(x, y):
+        return x * x * y + y * y * x
+
+    def df(x, y):
+        return grad(f)(x, y)
+
+    def hvp(x, y, dx, dy):
+        return jvp(df)(x, y, dx, dy)
+
+    args = (2.0, 3.0, 1.0, -1.0)
+    res = grad_opt_pipeline.run(input=hvp,
+                                argspec=[{'value': arg} for arg in args])
+    # df/dx = 2xy + y ** 2, so its derivative along (1, -1) is
+    # 2y - (2x + 2y) = -2x
+    assert res['output'](*args) == (21.0, -4.0)
+
+
+def test_JVP_errors():
+    mng = GraphManager()
+    with pytest.raises(NotImplementedError):
+        JVP(P.scalar_mod, mng)
+    with pytest.raises(NotImplementedError):
+        JVP(1234, mng)
+
+
+def test_JVP_graph_is_cached():
+    g = Graph()
+    p = g.add_parameter()
+    g.output = g.apply(P.scalar_mul, p, p)
+    mng = GraphManager()
+    jg1 = JVP(g, mng)
+    jvp_g = g.transforms['jvp']
+    jg2 = JVP(g, mng)
+    assert jvp_g.transforms['primal'] is g
+    assert g.transforms['jvp'] is jvp_g
+    assert jg1 is not jg2
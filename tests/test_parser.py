@@ -1,7 +1,8 @@
 import pytest
 
-from myia.pipeline import scalar_parse as parse, scalar_pipeline
-from myia.parser import MyiaSyntaxError
+from myia.pipeline import scalar_parse as parse, scalar_pipeline, \
+    scalar_debug_compile as compile
+from myia.parser import MyiaSyntaxError, parse as raw_parse
 
 
 def test_undefined():
@@ -77,3 +78,53 @@ def test_forward_reference():
 
     def h():
         return 2 + 2
+
+
+def _make_closure(x):
+    def f(y):
+        return x + y
+    return f
+
+
+def _make_settable(x):
+    def f(y):
+        return x + y
+
+    def set_x(value):
+        nonlocal x
+        x = value
+    return f, set_x
+
+
+def test_parse_cache_closures():
+    f1 = _make_closure(1)
+    f2 = _make_closure(1)
+    assert f1 is not f2
+    g1 = raw_parse(f1)
+    g2 = raw_parse(f2)
+    assert g1 is raw_parse(f1)
+    assert g1 is not g2
+    assert str(g1.output) == str(g2.output)
+
+
+def test_parse_cache_closure_cells():
+    f1, set_x = _make_settable(1)
+    assert compile(f1)(10) == 11
+    set_x(100)
+    f2, _ = _make_settable(1)
+    assert compile(f2)(10) == 11
+    assert compile(f1)(10) == 110
+
+
+def test_lazy_location():
+    def f(x):
+        return x * 2
+
+    g = raw_parse(f)
+    loc = g.output.debug.find('location')
+    assert loc._location is None
+    line = f.__code__.co_firstlineno + 1
+    assert (loc.line, loc.column, loc.line_end, loc.column_end) \
+        == (line, 15, line, 20)
+    assert loc.filename == __file__
+    assert loc.node.lineno == 2
@@ -1,6 +1,9 @@
 
 import pytest
-from myia.pipeline import PipelineStep, PipelineDefinition, pipeline_function
+import subprocess
+import sys
+from myia.pipeline import PipelineStep, PipelineDefinition, \
+    pipeline_function, scalar_debug_pipeline
 from myia.utils import Merge, Reset
 
 
@@ -173,3 +176,46 @@ def test_Pipeline_select(op_pipeline):
 
     pip = pdef.select('square', 'mulp').make()
     assert pip(value=3) == {'value': 18}
+
+
+def test_Pipeline_strip_debug_info():
+    def f(x, y):
+        return x * y + x
+
+    def run(strip):
+        pip = scalar_debug_pipeline \
+            .configure({'debug_info.strip': strip}) \
+            .make()
+        res = pip(input=f, argspec=({'value': 2}, {'value': 3}))
+        assert res['output'](2, 3) == 8
+        return [node.debug.about
+                for node in pip.resources.manager.all_nodes]
+
+    assert any(about is not None for about in run(False))
+    assert all(about is None for about in run(True))
+
+
+def test_Pipeline_strip_debug_info_by_step():
+    def f(x, y):
+        return x * y + x
+
+    def has_ast(pip):
+        return any('ast' in node.debug.__dict__
+                   for node in pip.resources.manager.all_nodes)
+
+    pdef = scalar_debug_pipeline.configure({'debug_info.strip': True})
+    pip = pdef.make()
+    args = dict(input=f, argspec=({'value': 2}, {'value': 3}))
+    # Debug information is only released after the last step
+    args = pip['parse':'parse'](**args)
+    assert has_ast(pip)
+    args = pip['resolve':](**args)
+    assert not has_ast(pip)
+    assert args['output'](2, 3) == 8
+
+
+def test_lazy_backend_import():
+    # The NNVM backend should only be imported when a pipeline needs it.
+    code = ('import sys, myia.pipeline, myia.api;'
+            'assert "myia.compile.nnvm" not in sys.modules')
+    subprocess.run([sys.executable, '-c', code], check=True)
@@ -1,9 +1,10 @@
 
 import pytest
 
-from myia.pipeline import scalar_pipeline, scalar_parse
+from myia.pipeline import scalar_pipeline, scalar_parse, standard_pipeline
 from myia.composite import list_map
 from myia.dtype import Array, Tuple, List, Int
+from myia.ir import Graph
 from myia.dshape import NOSHAPE, TupleShape, ListShape
 from myia.prim import ops as P
 from myia.prim.py_implementations import make_record, partial
@@ -42,6 +43,9 @@ pip = scalar_pipeline \
     .configure({'validate.whitelist': test_whitelist})
 
 
+pip_norenorm = pip.configure({'validate.renormalize': False})
+
+
 pip_ec = scalar_pipeline \
     .select('parse', 'infer', 'specialize',
             'erase_class', 'erase_tuple', 'validate') \
@@ -122,6 +126,53 @@ def test_validate():
         validate(f9)
 
 
+def test_validate_no_renormalize():
+    def f1(x, y):
+        return x + y
+
+    def f2(x, y):
+        return x ** y
+
+    run(pip_norenorm, f1, (i64, i64))
+    with pytest.raises(ValidationError):
+        run(pip_norenorm, f2, (i64, i64))
+
+
+def test_validate_no_renormalize_opt():
+    def f(x, y):
+        def g(z):
+            return z * x
+        return g(y) + 1 if x > y else g(x) * 2
+
+    # opt and erase_tuple create nodes that were never inferred, so these
+    # graphs must be inferred again to validate
+    pdef = standard_pipeline.configure({
+        'compile.linear_impl': 'numpy',
+        'validate.renormalize': False,
+    })
+    res = pdef.run(input=f, argspec=[{'type': i64}, {'type': i64}])
+    assert res['output'](3, 2) == 7
+    assert res['output'](2, 3) == 8
+
+
+def test_validate_manager():
+    def f(x, y):
+        return x + y
+
+    g = run(pip, f, (i64, i64))
+    mng = g.manager
+
+    # Not specialized, and scalar_pow is not in the whitelist
+    h = Graph()
+    p = h.add_parameter()
+    h.output = h.apply(P.scalar_pow, p, p)
+    mng.add_graph(h)
+
+    _validate(g, whitelist=test_whitelist, manager=mng)
+    with pytest.raises(ValidationError):
+        _validate(h, whitelist=test_whitelist, manager=mng)
+
+
 def test_clean():
 
     @valid_after_ec(i64, i64)
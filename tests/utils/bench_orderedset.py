@@ -0,0 +1,98 @@
+"""Benchmark OrderedSet and the GraphManager operations that rely on it.
+
+Run with `python -m tests.utils.bench_orderedset`.
+"""
+
+import time
+
+from myia.ir import GraphManager, clone
+from myia.parser import parse
+from myia.utils import OrderedSet
+
+from ..ir.bench_manager import make_function
+
+
+def timed(fn, *args):
+    """Return the time taken by fn(*args), in milliseconds."""
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_orderedset(n):
+    """Time basic OrderedSet operations on n elements."""
+    elems = list(range(n))
+    half = OrderedSet(elems[::2])
+    results = {}
+    results['init'] = timed(OrderedSet, elems)
+    s = OrderedSet(elems)
+    results['contains'] = timed(lambda: [e in s for e in elems])
+    results['update'] = timed(OrderedSet().update, s)
+
+    def ior():
+        res = OrderedSet(half)
+        res |= s
+
+    results['ior'] = timed(ior)
+    results['difference'] = timed(s.difference, half)
+    results['difference_update'] = timed(s.copy().difference_update, half)
+    results['intersection'] = timed(s.intersection, half)
+    return results
+
+
+def _replacements(mng):
+    """Pick nodes to replace by their first argument."""
+    return [(node, node.inputs[1])
+            for node in mng.all_nodes
+            if node.is_apply() and len(node.inputs) == 3
+            and node.graph is node.inputs[1].graph
+            and node is not node.graph.output]
+
+
+def bench_manager(graph):
+    """Time replace, transact and keep_roots on a clone of graph."""
+    results = {}
+
+    mng = GraphManager(clone(graph))
+    repls = _replacements(mng)
+
+    def replace():
+        for old, new in repls:
+            mng.replace(old, new)
+
+    results['replace'] = timed(replace)
+
+    mng = GraphManager(clone(graph))
+    repls = _replacements(mng)
+
+    def transact():
+        with mng.transact() as tr:
+            for old, new in repls:
+                tr.replace(old, new)
+
+    results['transact'] = timed(transact)
+
+    g1 = clone(graph)
+    mng = GraphManager(g1, clone(graph))
+    results['keep_roots'] = timed(mng.keep_roots, g1)
+    return results
+
+
+def main():
+    """Run all benchmarks."""
+    for n in (10_000, 100_000):
+        results = bench_orderedset(n)
+        print(f'OrderedSet, {n} elements:')
+        for name, t in results.items():
+            print(f'    {name:20}{t:10.2f}ms')
+
+    for nfuncs, nstmts in [(10, 10), (50, 20)]:
+        graph = parse(make_function(nfuncs, nstmts))
+        nnodes = len(GraphManager(clone(graph)).all_nodes)
+        print(f'GraphManager, {nnodes} nodes:')
+        for name, t in bench_manager(graph).items():
+            print(f'    {name:20}{t:10.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
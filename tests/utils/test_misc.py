@@ -1,4 +1,6 @@
 import pytest
+import sys
+import threading
 import numpy as np
 
 from myia.utils import Named, TypeMap, smap, Event, Events, NS, Overload, \
@@ -264,3 +266,56 @@ def test_env():
     assert len(e) == 2
     assert e.get(sk1, 0) == 200
     assert e.get(sk2, 0) == 300
+
+
+def test_env_persistent():
+    keys = [SymbolicKeyInstance(name, {}) for name in 'abcd']
+    versions = [newenv]
+    for i, k in enumerate(keys):
+        versions.append(versions[-1].set(k, i))
+    branch = versions[2].set(keys[0], 100)
+
+    # Older versions are unaffected by the updates
+    for i, e in enumerate(versions):
+        assert len(e) == i
+        assert [e.get(k, None) for k in keys] == \
+            [j if j < i else None for j in range(4)]
+    assert branch.get(keys[0], 0) == 100
+    assert branch.get(keys[2], 0) == 0
+    assert versions[4].get(keys[0], 0) == 0
+
+    # Adding an empty env returns the other env
+    assert versions[3].add(newenv) is versions[3]
+    assert newenv.add(versions[3]) is versions[3]
+    e = branch.add(versions[4])
+    assert [e.get(k, None) for k in keys] == [100, 2, 2, 3]
+    assert branch.get(keys[0], 0) == 100
+
+
+def test_env_threads():
+    keys = [SymbolicKeyInstance(i, {}) for i in range(20)]
+    versions = [newenv]
+    for i, k in enumerate(keys):
+        versions.append(versions[-1].set(k, i))
+    errors = []
+
+    def read(i):
+        # Reading a version reroots the dictionary shared by all of them
+        e = versions[i]
+        for _ in range(200):
+            if len(e) != i or e.get(keys[0], None) != (0 if i else None):
+                errors.append(i)
+
+    threads = [threading.Thread(target=read, args=(i,))
+               for i in range(len(versions))]
+    # Switch threads often, so that they interleave in the middle of reroots
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
@@ -284,6 +284,16 @@ class TestOrderedset(unittest.TestCase):
         oset = OrderedSet(self.lst)
         self.assertTrue(1 in oset)
 
+    def test_inplace_operators(self):
+        oset = OrderedSet([1, 2, 3])
+        orig = oset
+        oset |= [4]
+        oset -= OrderedSet([1])
+        oset &= {2, 3, 4}
+        oset ^= [5, 2]
+        self.assertIs(oset, orig)
+        self.assertEqual(list(oset), [3, 4, 5])
+
     def test_iter_mutated(self):
         oset = OrderedSet(self.lst)
         it = iter(oset)
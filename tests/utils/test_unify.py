@@ -1,3 +1,5 @@
+import sys
+
 import pytest
 
 from myia.utils.unify import FilterVar, RestrictedVar, Seq, SVar, \
@@ -292,6 +294,17 @@ def test_unify_union():
         TU.unify_union(uv3, (v2,), {})
 
 
+def test_unify_union_undo():
+    v1 = var()
+    v2 = var()
+
+    # The first alternative binds v1 before failing
+    uv = uvar([(v1, 1), (v1, 2)])
+    dd = {v2: 3}
+    d = TU.unify_union(uv, (v2, 2), dd)
+    assert d == {v1: 3, v2: 3}
+
+
 def test_unify_raw():
     v1 = var()
     v2 = var()
@@ -392,6 +405,18 @@ def test_unify2():
     assert TU.unify((v1, v1), (v2, v2)) is not None
 
 
+def test_unify_deep():
+    depth = sys.getrecursionlimit() * 2
+    vs = [var() for _ in range(depth)]
+    t1 = None
+    t2 = None
+    for i, v in enumerate(vs):
+        t1 = (v, t1)
+        t2 = (i, t2)
+    d = TU.unify(t1, t2)
+    assert all(d[v] == i for i, v in enumerate(vs))
+
+
 def test_unify():
     v1 = var()
     v2 = var()